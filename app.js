@@ -40,6 +40,7 @@ async function syncToDataJs(standardsData, actionMessage) {
         });
         const syncResult = await syncResponse.json();
         if (syncResult.status === 'success') {
+            window.standardsRevision = syncResult.revision;
             console.log(`[SYNC] data.js 已同步: ${actionMessage}`);
         } else {
             console.warn('[SYNC] 同步失敗:', syncResult.message);
@@ -56,6 +57,95 @@ async function syncToDataJs(standardsData, actionMessage) {
     }
 }
 
+// 以差異同步到 data.js：只送出這次的變更 (upsert / delete / reorder)，
+// 並附上瀏覽器所知的版本號 window.standardsRevision（由 data.js 載入）。
+// 版本過期 (409) 表示 data.js 已被其他使用者修改：重新載入 data.js 與版本號，
+// 以新版本重送一次；仍無法套用時改用伺服器上的資料並提示衝突，不以完整同步覆蓋。
+// 只有 data.js 沒有版本號或伺服器沒有差異同步 API 時，才改用完整同步。
+// 同步依序執行，避免連續編輯的請求以相同版本號互相衝突。
+let syncChain = Promise.resolve();
+
+async function postPatch(ops) {
+    const patchResponse = await fetch('/api/sync-data/patch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ base_revision: window.standardsRevision, ops })
+    });
+    if (patchResponse.status === 404 || patchResponse.status === 405) {
+        return { status: 'unavailable' };
+    }
+    try {
+        return await patchResponse.json();
+    } catch (parseError) {
+        return { status: 'unavailable' };
+    }
+}
+
+// 重新載入伺服器上的 data.js，更新 initialStandards 與版本號
+async function reloadDataJs() {
+    const response = await fetch('/data.js', { cache: 'no-store' });
+    const content = await response.text();
+    const standardsMatch = content.match(/window\.initialStandards\s*=\s*(\[[\s\S]*\])\s*;/);
+    if (!response.ok || !standardsMatch) {
+        throw new Error('無法重新載入 data.js');
+    }
+    const revisionMatch = content.match(/window\.standardsRevision\s*=\s*(\d+)\s*;/);
+    window.initialStandards = JSON.parse(standardsMatch[1]);
+    window.standardsRevision = revisionMatch ? Number(revisionMatch[1]) : undefined;
+    return window.initialStandards;
+}
+
+// 以伺服器上的資料取代目前的清單
+function adoptServerStandards(serverStandards) {
+    standards = [...serverStandards];
+    localStorage.setItem('dqa_standards', JSON.stringify(standards));
+    if (typeof renderStandards === 'function') renderStandards();
+}
+
+function syncPatch(ops, actionMessage) {
+    syncChain = syncChain.then(async () => {
+        if (typeof window.standardsRevision !== 'number') {
+            return syncToDataJs(standards, actionMessage);
+        }
+        try {
+            let patchResult = await postPatch(ops);
+            if (patchResult.status === 'conflict') {
+                console.warn('[SYNC] data.js 版本已變更，重新載入後重送:', patchResult.message);
+                const serverStandards = await reloadDataJs();
+                patchResult = typeof window.standardsRevision === 'number'
+                    ? await postPatch(ops)
+                    : { status: 'conflict', message: 'data.js 沒有版本號' };
+                if (patchResult.status !== 'success') {
+                    console.warn('[SYNC] 差異同步衝突:', patchResult.message);
+                    adoptServerStandards(serverStandards);
+                    alert(`${actionMessage}，但 data.js 已被其他使用者修改，無法套用這次的變更: ${patchResult.message}\n已重新載入 data.js 的最新資料，請確認後再試一次。`);
+                    return;
+                }
+                window.standardsRevision = patchResult.revision;
+                adoptServerStandards(await reloadDataJs());
+                console.log(`[SYNC] data.js 已重新載入並差異同步 (rev ${patchResult.revision}): ${actionMessage}`);
+                return;
+            }
+            if (patchResult.status === 'success') {
+                window.standardsRevision = patchResult.revision;
+                console.log(`[SYNC] data.js 已差異同步 (rev ${patchResult.revision}): ${actionMessage}`);
+                return;
+            }
+            if (patchResult.status !== 'unavailable') {
+                console.warn('[SYNC] 差異同步失敗:', patchResult.message);
+                alert(`${actionMessage}，但同步到 data.js 失敗: ${patchResult.message}`);
+                return;
+            }
+            console.warn('[SYNC] 伺服器不支援差異同步，改用完整同步');
+        } catch (syncError) {
+            console.warn('[SYNC] 無法同步到 data.js:', syncError);
+            return;
+        }
+        return syncToDataJs(standards, actionMessage);
+    });
+    return syncChain;
+}
+
 // Apply Updates Function - used by Update All button
 function applyUpdates(updates) {
     updates.forEach(update => {
@@ -757,7 +847,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 renderStandards(searchInput.value);
 
                 // 即時同步到 data.js
-                syncToDataJs(standards, '法規已刪除');
+                syncPatch([{ op: 'delete', id: pendingDeleteId }], '法規已刪除');
             }
             closeDeleteModal();
         });
@@ -821,8 +911,10 @@ document.addEventListener('DOMContentLoaded', () => {
         localStorage.setItem('dqa_standards', JSON.stringify(standards));
         renderStandards(searchInput.value);
 
-        // 同步到 data.js
-        syncToDataJs(standards, '法規順序已調整');
+        // 同步到 data.js（兩筆法規互換位置）
+        const firstIdx = Math.min(mainIdx, swapMainIdx);
+        const secondIdx = Math.max(mainIdx, swapMainIdx);
+        syncPatch([{ op: 'reorder', ids: [standards[firstIdx].id, standards[secondIdx].id] }], '法規順序已調整');
     };
 
     // Move Category Function - 調整類別順序
@@ -943,7 +1035,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 closeModal();
 
                 // 即時同步到 data.js，確保一鍵更新能正確讀取
-                syncToDataJs(standards, '法規已更新');
+                syncPatch([{ op: 'upsert', standard: standards[stdIndex] }], '法規已更新');
             }
         } else {
             // ADD MODE
@@ -973,7 +1065,7 @@ document.addEventListener('DOMContentLoaded', () => {
             closeModal();
 
             // 即時同步到 data.js，確保一鍵更新能正確讀取
-            syncToDataJs(standards, '法規已新增');
+            syncPatch([{ op: 'upsert', standard: newStandard, index: 0 }], '法規已新增');
         }
     });
 
@@ -1144,6 +1236,7 @@ document.addEventListener('DOMContentLoaded', () => {
     async function applyUpdates(updates) {
         let newCount = 0;
         let updateCount = 0;
+        const ops = [];
 
         updates.forEach(update => {
             if (update.type === 'NEW') {
@@ -1160,6 +1253,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     revisionSummary: update.newSummary
                 };
                 standards.push(newStandard);
+                ops.push({ op: 'upsert', standard: newStandard });
                 newCount++;
             } else {
                 // Update existing standard
@@ -1204,6 +1298,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     standards[stdIndex].description = update.newDescription;
                     standards[stdIndex].category = update.newCategory;
                     standards[stdIndex].sourceUrl = update.newSourceUrl;
+                    ops.push({ op: 'upsert', standard: standards[stdIndex] });
                     updateCount++;
                 }
             }
@@ -1211,21 +1306,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
         localStorage.setItem('dqa_standards', JSON.stringify(standards));
 
-        // Sync to data.js via API (so Python scraper uses updated data)
-        try {
-            const syncResponse = await fetch('/api/sync-data', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(standards)
-            });
-            const syncResult = await syncResponse.json();
-            if (syncResult.status === 'success') {
-                console.log('[SYNC] data.js updated successfully');
-            } else {
-                console.warn('[SYNC] Failed to sync data.js:', syncResult.message);
-            }
-        } catch (syncError) {
-            console.warn('[SYNC] Could not sync to data.js:', syncError);
+        // Sync the changed standards to data.js via API (so Python scraper uses updated data)
+        if (ops.length > 0) {
+            await syncPatch(ops, `Applied ${ops.length} update(s)`);
         }
 
         renderStandards(searchInput.value);
@@ -1251,6 +1334,189 @@ document.addEventListener('DOMContentLoaded', () => {
     closeUpdatesModalBtn.addEventListener('click', closeUpdatesModal);
     closeUpdatesBtn.addEventListener('click', closeUpdatesModal);
 
+    // Poll a background verification job until it finishes
+    const JOB_POLL_INTERVAL_MS = 2000;
+
+    async function waitForJob(jobId, onProgress) {
+        while (true) {
+            const response = await fetch(`/api/jobs/${jobId}`);
+            if (!response.ok) throw new Error(`Job ${jobId} not found`);
+            const job = await response.json();
+            if (job.state === 'done' || job.state === 'failed') return job;
+            if (onProgress) onProgress(job);
+            await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+        }
+    }
+
+    // Follow a verification job over Server-Sent Events ('plan', one 'result' per
+    // standard, then 'end'). Falls back to polling when streaming is unavailable.
+    function streamJob(jobId, handlers) {
+        if (typeof EventSource === 'undefined') return waitForJob(jobId);
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`/api/jobs/${jobId}/events`);
+            source.addEventListener('plan', e => handlers.onPlan && handlers.onPlan(JSON.parse(e.data)));
+            source.addEventListener('result', e => handlers.onResult && handlers.onResult(JSON.parse(e.data)));
+            source.addEventListener('end', e => {
+                source.close();
+                resolve(JSON.parse(e.data));
+            });
+            source.onerror = () => {
+                // CLOSED means the stream cannot be (re)opened; otherwise the browser reconnects
+                if (source.readyState === EventSource.CLOSED) {
+                    waitForJob(jobId).then(resolve, reject);
+                }
+            };
+        });
+    }
+
+    // Turn a MISMATCH result into an update entry (null if nothing actually changed)
+    function updateFromResult(res) {
+        // Find existing standard to get old values
+        const existingStd = standards.find(s => s.id === res.id);
+        if (!existingStd) return null;
+        // Parse issues to determine what changed
+        // Formats: "Date: Local='...' vs Live='...'"
+        //          "Stability: Local='...' vs Live='...'"
+        //          "Edition: Local='...' vs Live='...'"
+        //          "Cost: Local='...' vs Live='...'"
+        let newVersion = existingStd.version;
+        let newEffective = existingStd.effectiveDate;
+        let newCost = existingStd.cost;
+        let newExpiry = existingStd.expiryDate;
+
+        res.issues.forEach(issue => {
+            if (issue.includes('Date:')) {
+                const match = issue.match(/Live='(.*?)'/);
+                if (match) newEffective = match[1];
+            }
+            if (issue.includes('Cost:')) {
+                const match = issue.match(/Live='(.*?)'/);
+                if (match) newCost = match[1];
+            }
+            if (issue.includes('Stability:')) {
+                const match = issue.match(/Live='(.*?)'/);
+                if (match) {
+                    // Convert to Stability format: "2026" -> "2026 (Stability)"
+                    const year = match[1];
+                    newExpiry = year.includes('Stability') ? year : `${year}(Stability)`;
+                }
+            }
+            if (issue.includes('Edition:')) {
+                const match = issue.match(/Live='(.*?)'/);
+                if (match) newVersion = match[1];
+            }
+            // 智能爬蟲產生的 Version 格式 (e.g., "Version: Local='issue 3' vs Live='Issue 4'")
+            if (issue.includes('Version:')) {
+                const match = issue.match(/Live='(.*?)'/);
+                if (match) newVersion = match[1];
+            }
+        });
+
+        // Check if there are actual changes compared to localStorage
+        const hasChanges =
+            newVersion !== existingStd.version ||
+            newEffective !== existingStd.effectiveDate ||
+            newCost !== existingStd.cost ||
+            newExpiry !== existingStd.expiryDate;
+
+        if (!hasChanges) return null;
+        return {
+            id: res.id,
+            name: res.name,
+            type: 'UPDATE',
+            changeType: 'DATA',
+            oldVersion: existingStd.version,
+            newVersion: newVersion,
+            oldEffective: existingStd.effectiveDate,
+            newEffective: newEffective,
+            oldCost: existingStd.cost,
+            newCost: newCost,
+            oldExpiry: existingStd.expiryDate,
+            newExpiry: newExpiry,
+            newSummary: existingStd.revisionSummary,
+            newDescription: existingStd.description,
+            newCategory: existingStd.category,
+            newSourceUrl: res.url,
+            oldSourceUrl: existingStd.sourceUrl,
+            issues: res.issues // 保存原始 issues 用於顯示
+        };
+    }
+
+    function renderUpdateItem(update) {
+        const item = document.createElement('div');
+        item.className = 'update-item';
+
+        // 直接使用 issues 來顯示差異
+        const issuesList = update.issues && update.issues.length > 0
+            ? update.issues.map(issue => {
+                // 解析 issue 格式: "Stability: Local='2026 (Stability)' vs Live='2029'"
+                const parts = issue.match(/^(\w+): Local='(.*)' vs Live='(.*)'$/);
+                if (parts) {
+                    const [, field, localVal, liveVal] = parts;
+                    const fieldName = {
+                        'Stability': '穩定性',
+                        'Date': '日期',
+                        'Edition': '版本',
+                        'Version': '版本',
+                        'Cost': '成本'
+                    }[field] || field;
+                    return `<span>${fieldName}: ${localVal} → <b style="color:var(--accent-color);">${liveVal}</b></span>`;
+                }
+                return `<span>${issue}</span>`;
+            }).join('')
+            : '<span style="color:var(--text-muted);">無詳細資訊</span>';
+
+        item.innerHTML = `
+        <div style="flex:1;">
+                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:0.2rem;">
+                    <h4 style="color:var(--text-primary); margin:0;">${update.name}</h4>
+                    <a href="${update.newSourceUrl}" target="_blank" style="font-size:0.8rem; color:var(--accent-color); text-decoration:none; display:flex; align-items:center; gap:4px;">
+                        <i data-lucide="external-link" style="width:12px; height:12px;"></i> Verify
+                    </a>
+                </div>
+                <div style="display:flex; gap:1rem; font-size:0.85rem; color:var(--text-secondary); flex-wrap: wrap;">
+                    ${issuesList}
+                </div>
+                <div class="badge-new">UPDATE</div>
+            </div>
+        `;
+        return item;
+    }
+
+    function openUpdatesModal() {
+        updatesModal.classList.remove('hidden');
+        setTimeout(() => updatesModal.classList.add('active'), 10);
+        lucide.createIcons();
+    }
+
+    // Live view while a verification job runs: mismatches are listed as soon as
+    // their standard finishes. The final report replaces this list at the end.
+    function streamVerification(jobId) {
+        updatesList.innerHTML = '';
+        const progress = document.createElement('div');
+        progress.style.cssText = 'padding: 0.5rem 0; color: var(--text-secondary); font-size: 0.9rem;';
+        progress.textContent = 'Verifying...';
+        updatesList.appendChild(progress);
+        document.getElementById('update-confirm-btn').style.display = 'none';
+        openUpdatesModal();
+
+        return streamJob(jobId, {
+            onPlan: plan => {
+                progress.textContent = `Verifying 0 / ${plan.due} standards...`;
+            },
+            onResult: res => {
+                progress.textContent = `Verifying ${res.done} / ${res.due} standards... (${res.name}: ${res.status}, ${res.elapsed || 0}s)`;
+                if (res.status === 'MISMATCH') {
+                    const update = updateFromResult(res);
+                    if (update) {
+                        updatesList.appendChild(renderUpdateItem(update));
+                        lucide.createIcons();
+                    }
+                }
+            }
+        });
+    }
+
     // Manual Update (Load Python Report)
     const manualUpdateBtn = document.getElementById('manual-update-btn');
     if (manualUpdateBtn) {
@@ -1270,6 +1536,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     });
                     const syncResult = await syncResponse.json();
                     if (syncResult.status === 'success') {
+                        window.standardsRevision = syncResult.revision;
                         console.log('[SYNC] data.js synced before verification');
                     } else {
                         console.warn('[SYNC] Failed to sync data.js:', syncResult.message);
@@ -1281,10 +1548,21 @@ document.addEventListener('DOMContentLoaded', () => {
                 // 1. Trigger Python Script via Server (本地模式)
                 let serverAvailable = false;
                 try {
-                    const runResponse = await fetch('/api/run-verify', { method: 'POST' });
+                    const runResponse = await fetch('/api/run-verify', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ workers: (typeof config !== 'undefined' && config.verifyWorkers) || 1 })
+                    });
                     if (runResponse.ok) {
-                        const runResult = await runResponse.json();
+                        let runResult = await runResponse.json();
                         serverAvailable = true;
+                        // Verification runs as a background job (a click during a run joins it).
+                        // Results stream into the updates modal as each standard finishes.
+                        if (runResult.job_id) {
+                            if (runResult.joined) console.log(`[JOB] Joined running verification ${runResult.job_id}`);
+                            const job = await streamVerification(runResult.job_id);
+                            runResult = job.result || { status: 'error', message: job.error };
+                        }
                         if (runResult.status !== 'success') {
                             console.warn('Script warning:', runResult.message);
                         }
@@ -1293,8 +1571,8 @@ document.addEventListener('DOMContentLoaded', () => {
                     console.log('[MODE] 本地伺服器不可用，使用 GitHub Pages 靜態模式');
                 }
 
-                // 2. Load the generated JSON report
-                const response = await fetch('verification_results.json?t=' + Date.now()); // Add timestamp to prevent caching
+                // 2. Load the generated JSON report (authoritative: also covers carried-over results)
+                const response = await fetch('verification_results.json', { cache: 'no-cache' }); // Revalidate (ETag), 304 when unchanged
                 if (!response.ok) throw new Error('Report not found');
 
                 const reportData = await response.json();
@@ -1302,77 +1580,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
                 reportData.results.forEach(res => {
                     if (res.status === 'MISMATCH') {
-                        // Find existing standard to get old values
-                        const existingStd = standards.find(s => s.id === res.id);
-                        if (existingStd) {
-                            // Parse issues to determine what changed
-                            // Formats: "Date: Local='...' vs Live='...'"
-                            //          "Stability: Local='...' vs Live='...'"
-                            //          "Edition: Local='...' vs Live='...'"
-                            //          "Cost: Local='...' vs Live='...'"
-                            let newVersion = existingStd.version;
-                            let newEffective = existingStd.effectiveDate;
-                            let newCost = existingStd.cost;
-                            let newExpiry = existingStd.expiryDate;
-
-                            res.issues.forEach(issue => {
-                                if (issue.includes('Date:')) {
-                                    const match = issue.match(/Live='(.*?)'/);
-                                    if (match) newEffective = match[1];
-                                }
-                                if (issue.includes('Cost:')) {
-                                    const match = issue.match(/Live='(.*?)'/);
-                                    if (match) newCost = match[1];
-                                }
-                                if (issue.includes('Stability:')) {
-                                    const match = issue.match(/Live='(.*?)'/);
-                                    if (match) {
-                                        // Convert to Stability format: "2026" -> "2026 (Stability)"
-                                        const year = match[1];
-                                        newExpiry = year.includes('Stability') ? year : `${year}(Stability)`;
-                                    }
-                                }
-                                if (issue.includes('Edition:')) {
-                                    const match = issue.match(/Live='(.*?)'/);
-                                    if (match) newVersion = match[1];
-                                }
-                                // 智能爬蟲產生的 Version 格式 (e.g., "Version: Local='issue 3' vs Live='Issue 4'")
-                                if (issue.includes('Version:')) {
-                                    const match = issue.match(/Live='(.*?)'/);
-                                    if (match) newVersion = match[1];
-                                }
-                            });
-
-                            // Check if there are actual changes compared to localStorage
-                            const hasChanges =
-                                newVersion !== existingStd.version ||
-                                newEffective !== existingStd.effectiveDate ||
-                                newCost !== existingStd.cost ||
-                                newExpiry !== existingStd.expiryDate;
-
-                            if (hasChanges) {
-                                updatesFound.push({
-                                    id: res.id,
-                                    name: res.name,
-                                    type: 'UPDATE',
-                                    changeType: 'DATA',
-                                    oldVersion: existingStd.version,
-                                    newVersion: newVersion,
-                                    oldEffective: existingStd.effectiveDate,
-                                    newEffective: newEffective,
-                                    oldCost: existingStd.cost,
-                                    newCost: newCost,
-                                    oldExpiry: existingStd.expiryDate,
-                                    newExpiry: newExpiry,
-                                    newSummary: existingStd.revisionSummary,
-                                    newDescription: existingStd.description,
-                                    newCategory: existingStd.category,
-                                    newSourceUrl: res.url,
-                                    oldSourceUrl: existingStd.sourceUrl,
-                                    issues: res.issues // 保存原始 issues 用於顯示
-                                });
-                            }
-                        }
+                        const update = updateFromResult(res);
+                        if (update) updatesFound.push(update);
                     }
                 });
 
@@ -1382,55 +1591,14 @@ document.addEventListener('DOMContentLoaded', () => {
                     updatesList.innerHTML = '<div style="text-align:center; padding: 2rem;"><i data-lucide="check-circle" style="width:48px; height:48px; color:var(--success); margin-bottom:1rem;"></i><p style="font-size:1.1rem; color:var(--text-primary);">Report says all valid</p><p style="color:var(--text-secondary);">No mismatches found in the last report.</p></div>';
                     document.getElementById('update-confirm-btn').style.display = 'none';
                 } else {
-                    updatesFound.forEach(update => {
-                        const item = document.createElement('div');
-                        item.className = 'update-item';
-
-                        // 直接使用 issues 來顯示差異
-                        const issuesList = update.issues && update.issues.length > 0
-                            ? update.issues.map(issue => {
-                                // 解析 issue 格式: "Stability: Local='2026 (Stability)' vs Live='2029'"
-                                const parts = issue.match(/^(\w+): Local='(.*)' vs Live='(.*)'$/);
-                                if (parts) {
-                                    const [, field, localVal, liveVal] = parts;
-                                    const fieldName = {
-                                        'Stability': '穩定性',
-                                        'Date': '日期',
-                                        'Edition': '版本',
-                                        'Version': '版本',
-                                        'Cost': '成本'
-                                    }[field] || field;
-                                    return `<span>${fieldName}: ${localVal} → <b style="color:var(--accent-color);">${liveVal}</b></span>`;
-                                }
-                                return `<span>${issue}</span>`;
-                            }).join('')
-                            : '<span style="color:var(--text-muted);">無詳細資訊</span>';
-
-                        item.innerHTML = `
-                    <div style="flex:1;">
-                                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:0.2rem;">
-                                    <h4 style="color:var(--text-primary); margin:0;">${update.name}</h4>
-                                    <a href="${update.newSourceUrl}" target="_blank" style="font-size:0.8rem; color:var(--accent-color); text-decoration:none; display:flex; align-items:center; gap:4px;">
-                                        <i data-lucide="external-link" style="width:12px; height:12px;"></i> Verify
-                                    </a>
-                                </div>
-                                <div style="display:flex; gap:1rem; font-size:0.85rem; color:var(--text-secondary); flex-wrap: wrap;">
-                                    ${issuesList}
-                                </div>
-                                <div class="badge-new">UPDATE</div>
-                            </div>
-                        `;
-                        updatesList.appendChild(item);
-                    });
+                    updatesFound.forEach(update => updatesList.appendChild(renderUpdateItem(update)));
 
                     const confirmBtn = document.getElementById('update-confirm-btn');
                     confirmBtn.style.display = 'block';
                     confirmBtn.onclick = () => applyUpdates(updatesFound);
                 }
 
-                updatesModal.classList.remove('hidden');
-                setTimeout(() => updatesModal.classList.add('active'), 10);
-                lucide.createIcons();
+                openUpdatesModal();
 
             } catch (e) {
                 console.error(e);
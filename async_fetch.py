@@ -0,0 +1,120 @@
+"""
+Connection-pooled HTTP fetching for the static (non-Selenium) scrapers.
+
+get_session() returns a process-wide requests.Session whose urllib3 pool
+keeps keep-alive connections per host, so repeated IEEE / generic pages do
+not pay a fresh TCP+TLS handshake each time.
+
+AsyncFetcher drives that session from asyncio: requests run on a small
+thread pool while coroutines wait, with a per-host and a global concurrency
+bound, optional per-host rate limiting (rate_limit.HostRateLimiter) and the
+same retry/backoff semantics as requests_with_retry.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import profiling
+from profiling import stage
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+# Hosts kept in the connection pool, and connections kept per host
+POOL_HOSTS = 32
+POOL_CONNECTIONS_PER_HOST = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the shared keep-alive Session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_CONNECTIONS_PER_HOST)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+def host_of(url):
+    """Host part of a URL, used as the per-host concurrency key."""
+    return urlsplit(url).netloc.lower()
+
+
+class AsyncFetcher:
+    """
+    asyncio front-end for the shared Session.
+
+    concurrency: maximum requests in flight overall
+    per_host: maximum requests in flight against a single host
+    limiter / limiter_key: optional HostRateLimiter and url -> bucket key function
+    """
+
+    def __init__(self, concurrency=4, per_host=2, max_retries=2, timeout=15,
+                 limiter=None, limiter_key=host_of):
+        self.concurrency = max(1, int(concurrency))
+        self.per_host = max(1, int(per_host))
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limiter = limiter
+        self.limiter_key = limiter_key
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='fetch')
+        self._global = None
+        self._hosts = {}
+
+    def _host_semaphore(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def run(self, func, *args):
+        """Runs a blocking callable (e.g. HTML extraction) off the event loop, in the caller's context."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, lambda: context.run(func, *args))
+
+    async def get(self, url, headers=None):
+        """
+        GET with exponential backoff (1s, 2s) on connection errors and timeouts.
+        With a limiter, each attempt waits for the host's token and 429/503
+        responses back the host off and are retried.
+        """
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.concurrency)
+        session = get_session()
+        key = self.limiter_key(url) if self.limiter else None
+        for attempt in range(self.max_retries + 1):
+            if self.limiter:
+                with stage('rate_wait'):
+                    await self.limiter.acquire_async(key)
+            try:
+                async with self._global, self._host_semaphore(host_of(url)):
+                    with stage('http'):
+                        response = await self.run(
+                            lambda: session.get(url, headers=headers, timeout=self.timeout))
+                profiling.add('ttfb', response.elapsed.total_seconds())
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt < self.max_retries:
+                    wait_time = 2 ** attempt
+                    print(f"  [Retry {attempt+1}/{self.max_retries}] {e.__class__.__name__}, waiting {wait_time}s...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                raise
+            pause = self.limiter.observe(key, response) if self.limiter else None
+            if pause is not None and attempt < self.max_retries:
+                print(f"  [Throttled {attempt+1}/{self.max_retries}] HTTP {response.status_code}, backing off {pause:.0f}s...")
+                continue
+            return response
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,132 @@
+"""
+Crash-safe file writes shared by the server, the launcher and the scraper.
+
+write_atomic() writes to a temp file in the target's directory and renames
+it over the target, so a reader (the browser loading data.js, the scraper
+loading standards.json) sees either the old or the new file, never a
+truncated one, even if the process is killed mid-write.
+
+file_lock() serializes writers across threads and processes (fcntl.flock on
+POSIX, msvcrt.locking on Windows) for read-modify-write sequences such as a
+delta sync.
+
+How hard a write is pushed to disk is set by the fsync policy, per call or
+for the whole process via the DQA_FSYNC environment variable:
+
+    none  rename only (caches that can be rebuilt)
+    file  fsync the temp file before the rename (default): after a power
+          loss the target holds the old or the new content, not zeros
+    full  also fsync the directory (POSIX), so the rename itself survives
+"""
+import contextlib
+import json
+import os
+import stat
+import tempfile
+import time
+
+FSYNC_POLICIES = ('none', 'file', 'full')
+FSYNC_POLICY = os.environ.get('DQA_FSYNC', 'file')
+if FSYNC_POLICY not in FSYNC_POLICIES:
+    FSYNC_POLICY = 'file'
+
+# mkstemp creates the temp file as 0600; the file written gets the mode the target
+# had, or the umask's default for new files (the process umask can only be read by
+# setting it, so it is read once here, before any threads start writing)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Windows refuses to replace a file another process has open; retry briefly
+REPLACE_RETRIES = 10
+REPLACE_RETRY_DELAY = 0.05
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def write_atomic(path, data, fsync=None, encoding='utf-8'):
+    """Replaces path with data (bytes, or str encoded with encoding) via temp file + rename."""
+    policy = fsync or FSYNC_POLICY
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if policy != 'none':
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, _target_mode(path))
+        _replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    if policy == 'full':
+        _fsync_directory(directory)
+
+
+def write_json_atomic(path, obj, indent=2, fsync=None):
+    """write_atomic() for a JSON document (UTF-8, non-ASCII kept as is)."""
+    write_atomic(path, json.dumps(obj, indent=indent, ensure_ascii=False), fsync=fsync)
+
+
+@contextlib.contextmanager
+def file_lock(lock_path):
+    """Exclusive lock held for the with-block, shared by all threads and processes using lock_path."""
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            _lock_windows(f)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _lock_windows(f):
+    f.seek(0)
+    while True:
+        try:
+            # LK_LOCK itself retries for ~10 s before raising
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            time.sleep(REPLACE_RETRY_DELAY)
+
+
+def _target_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def _replace(src, dst):
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY)
+
+
+def _fsync_directory(directory):
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
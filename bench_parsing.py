@@ -0,0 +1,75 @@
+"""
+Parsing benchmark: per-page cost of the static extractors with the
+BeautifulSoup (html.parser) backend vs the lxml backend.
+
+Usage:
+    python bench_parsing.py [page.html ...] [--repeat N]
+
+Without page files a synthetic product page (~150 KB, scripts, navigation,
+nested tables) is used. Also checks that both backends extract the same data.
+"""
+import argparse
+import time
+
+import html_parsing
+import verify_standards as vs
+
+EXTRACTORS = {
+    'ieee': vs._extract_ieee,
+    'nema': vs._extract_nema,
+    'generic': vs._extract_generic,
+}
+
+
+def synthetic_page():
+    nav = ''.join(f'<li><a href="/std/{i}">Standard {i}</a></li>' for i in range(400))
+    rows = ''.join(f'<tr><td>Clause {i}</td><td>Requirement text {i} ' + 'lorem ipsum ' * 8 + '</td></tr>'
+                   for i in range(600))
+    script = '<script>var cfg = {' + ', '.join(f'"k{i}": {i}' for i in range(500)) + '};</script>'
+    return (
+        '<html><head><title>IEEE 1613-2009 - IEEE Standard</title>' + script + '</head><body>'
+        f'<nav><ul>{nav}</ul></nav>'
+        '<h1 class="product-title">IEC 61850-3:2013 Communication networks</h1>'
+        '<div class="product-price"><span>$ 1,234.00</span></div>'
+        '<p>Edition 2.0</p><p>Published: 15 March 2013</p>'
+        f'<table>{rows}</table></body></html>'
+    ).encode('utf-8')
+
+
+def bench(extract, body, backend, repeat):
+    html_parsing.DEFAULT_BACKEND = backend
+    result = extract(body)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        extract(body)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HTML parsing backends.')
+    parser.add_argument('pages', nargs='*', help='HTML files to parse (default: synthetic page)')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.pages:
+        with open(path, 'rb') as f:
+            pages.append((path, f.read()))
+    if not pages:
+        pages.append(('synthetic', synthetic_page()))
+
+    default_backend = html_parsing.DEFAULT_BACKEND
+    print(f"{'page':<24}{'scraper':<10}{'bs4 ms':>10}{'lxml ms':>10}{'speedup':>9}  same")
+    try:
+        for name, body in pages:
+            for scraper, extract in EXTRACTORS.items():
+                bs4_ms, bs4_result = bench(extract, body, 'bs4', args.repeat)
+                lxml_ms, lxml_result = bench(extract, body, 'lxml', args.repeat)
+                print(f"{name[-23:]:<24}{scraper:<10}{bs4_ms:>10.2f}{lxml_ms:>10.2f}"
+                      f"{bs4_ms / lxml_ms:>8.1f}x  {'yes' if bs4_result == lxml_result else 'NO'}")
+    finally:
+        html_parsing.DEFAULT_BACKEND = default_backend
+
+
+if __name__ == '__main__':
+    main()
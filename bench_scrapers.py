@@ -0,0 +1,276 @@
+"""
+Scraper throughput benchmark against the replay fixtures (see replay_fixtures).
+
+Suites:
+    scrape_<name>      each scrape_* function on every fixture page of its host group
+    run_verification   a full verification run of the fixture catalogue
+
+Every suite reports pages/sec, p50/p95 per-page latency and the peak RSS of
+this process (Chrome's own memory is watched by driver_pool). Caches are off
+and rate limits lifted, so the numbers measure fetching, rendering and
+parsing only.
+
+Usage:
+    python bench_scrapers.py [--fixtures DIR] [--synthetic] [--repeat N] [--workers N]
+                             [--latency-ms MS] [--no-selenium] [--output FILE]
+                             [--baseline FILE] [--save-baseline FILE] [--tolerance 0.25]
+
+Without recorded fixtures (replay_fixtures.py record) synthetic pages are
+used. With --baseline the run fails (exit code 1) if a suite got slower or
+bigger than the baseline by more than --tolerance; baselines are only
+compared when they were measured on the same fixture pages.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+
+import verify_standards as vs
+from atomic_io import write_json_atomic
+from profiling import percentile
+from replay_fixtures import FIXTURE_DIR_NAME, FixtureStore, replaying, synthesize
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil  # optional: peak RSS on Windows
+except ImportError:
+    psutil = None
+
+# Suite name and call per host group
+SCRAPER_SUITES = {
+    'iec': ('scrape_iec_page', lambda url, name, driver: vs.scrape_iec_page(url, driver)),
+    'ieee': ('scrape_ieee_page', lambda url, name, driver: vs.scrape_ieee_page(url)),
+    'accuristech': ('scrape_nema_store', lambda url, name, driver: vs.scrape_nema_store(url, driver)),
+    'bsi': ('scrape_bsi_knowledge', lambda url, name, driver: vs.scrape_bsi_knowledge(url, driver)),
+    'generic': ('scrape_smart_generic', lambda url, name, driver: vs.scrape_smart_generic(url, name)),
+}
+
+DEFAULT_TOLERANCE = 0.25
+# Latency differences below this are timer and scheduler noise, not regressions
+MIN_LATENCY_DELTA_MS = 5.0
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unknown)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+    if psutil is not None:
+        return round(psutil.Process().memory_info().peak_wset / 2 ** 20, 1)
+    return None
+
+
+def _stats(latencies_ms, seconds, errors):
+    return {
+        'pages': len(latencies_ms),
+        'errors': errors,
+        'seconds': round(seconds, 3),
+        'pages_per_sec': round(len(latencies_ms) / seconds, 2) if seconds else None,
+        'p50_ms': round(percentile(latencies_ms, 50), 2) if latencies_ms else None,
+        'p95_ms': round(percentile(latencies_ms, 95), 2) if latencies_ms else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def bench_scraper(call, pages, driver, repeat):
+    """Calls a scraper on every (local url, name) page, repeat times, after one untimed warm-up."""
+    call(*pages[0], driver)
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for url, name in pages:
+            t0 = time.perf_counter()
+            data = call(url, name, driver)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            errors += 'error' in data
+    return _stats(latencies, time.perf_counter() - started, errors)
+
+
+@contextmanager
+def timed_checks(latencies):
+    """
+    Appends the duration (ms) of every check run_verification makes to
+    latencies. The report's 'elapsed' is rounded to 10 ms, too coarse for p50/p95.
+    """
+    check, check_async = vs.check_standard, vs.check_standard_async
+
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return check(*args, **kwargs)
+        finally:
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async def timed_async(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await check_async(*args, **kwargs)
+        finally:
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    vs.check_standard, vs.check_standard_async = timed, timed_async
+    try:
+        yield
+    finally:
+        vs.check_standard, vs.check_standard_async = check, check_async
+
+
+def bench_run_verification(standards, workers, driver_pool):
+    """One full run_verification over standards in a scratch directory (console output discarded)."""
+    latencies = []
+    errors = [0]
+
+    def on_event(event, data):
+        if event == 'result':
+            errors[0] += data['status'] == 'ERROR'
+
+    with tempfile.TemporaryDirectory() as base_path:
+        write_json_atomic(os.path.join(base_path, 'standards.json'), standards)
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()), timed_checks(latencies):
+            vs.run_verification(base_path, workers=workers, driver_pool=driver_pool,
+                                use_cache=False, full=True, on_event=on_event)
+        seconds = time.perf_counter() - started
+    return _stats(latencies, seconds, errors[0])
+
+
+def run_benchmarks(store, repeat=3, workers=4, latency=0.0, selenium=True):
+    """Runs every suite against store; returns the results document."""
+    groups = {entry['group'] for entry in store.index.values()}
+    if not selenium:
+        groups -= vs.SELENIUM_GROUPS
+    catalogue = [std for std in store.catalogue() if vs.host_group(std['sourceUrl']) in groups]
+    pool = vs.create_driver_pool(size=1) if groups & vs.SELENIUM_GROUPS else None
+    suites = {}
+    try:
+        with replaying(store, latency) as server:
+            if pool is not None:
+                # Start Chrome up front, so its startup is not timed and a missing browser is noticed
+                with pool.lease() as driver:
+                    started = driver is not None
+                if not started:
+                    print('[BENCH] Selenium driver not available, skipping Selenium sites')
+                    groups -= vs.SELENIUM_GROUPS
+                    catalogue = [std for std in catalogue if vs.host_group(std['sourceUrl']) in groups]
+            names = {std['sourceUrl']: std.get('name') for std in catalogue}
+            for group, (suite, call) in SCRAPER_SUITES.items():
+                urls = store.urls({group})
+                if group not in groups or not urls:
+                    continue
+                print(f'[BENCH] {suite}: {len(urls)} pages x {repeat}')
+                pages = [(server.replay_url(url), names.get(url, url)) for url in urls]
+                if group in vs.SELENIUM_GROUPS:
+                    with pool.lease() as driver:
+                        suites[suite] = bench_scraper(call, pages, driver, repeat)
+                else:
+                    suites[suite] = bench_scraper(call, pages, None, repeat)
+            if catalogue:
+                print(f'[BENCH] run_verification: {len(catalogue)} standards, {workers} workers')
+                suites['run_verification'] = bench_run_verification(
+                    server.replay_catalogue(catalogue), workers, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+    return {
+        'fixtures': store.signature(),
+        'pages': len(store),
+        'repeat': repeat,
+        'workers': workers,
+        'latency_ms': latency * 1000,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'suites': suites,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regression messages of current against baseline ([] if none or not comparable)."""
+    if baseline.get('fixtures') != current['fixtures']:
+        print('[BENCH] Baseline was measured on other fixture pages, not comparing')
+        return []
+    regressions = []
+    for suite, base in baseline.get('suites', {}).items():
+        now = current['suites'].get(suite)
+        if now is None or now['pages'] != base['pages']:
+            continue
+        if base['pages_per_sec'] and now['pages_per_sec'] < base['pages_per_sec'] * (1 - tolerance):
+            regressions.append(f"{suite}: {now['pages_per_sec']} pages/sec (baseline {base['pages_per_sec']})")
+        if (base['p95_ms'] is not None and now['p95_ms'] > base['p95_ms'] * (1 + tolerance)
+                and now['p95_ms'] - base['p95_ms'] >= MIN_LATENCY_DELTA_MS):
+            regressions.append(f"{suite}: p95 {now['p95_ms']} ms (baseline {base['p95_ms']} ms)")
+        if now['errors'] > base['errors']:
+            regressions.append(f"{suite}: {now['errors']} errors (baseline {base['errors']})")
+    if (baseline.get('peak_rss_mb') and current['peak_rss_mb']
+            and current['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance)):
+        regressions.append(f"peak RSS {current['peak_rss_mb']} MB (baseline {baseline['peak_rss_mb']} MB)")
+    return regressions
+
+
+def print_table(results):
+    print(f"\n{'suite':<24}{'pages':>7}{'errors':>8}{'pages/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'RSS MB':>9}")
+    for suite, s in results['suites'].items():
+        print(f"{suite:<24}{s['pages']:>7}{s['errors']:>8}{s['pages_per_sec'] or 0:>10.1f}"
+              f"{s['p50_ms'] or 0:>10.2f}{s['p95_ms'] or 0:>10.2f}{s['peak_rss_mb'] or 0:>9.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the scrapers against replay fixtures.')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR_NAME,
+                        help=f'Fixture directory (default: {FIXTURE_DIR_NAME})')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Use synthetic pages even if recorded fixtures exist')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the pages per scraper suite')
+    parser.add_argument('--workers', type=int, default=4, help='Workers for the run_verification suite')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Delay added to every replayed response')
+    parser.add_argument('--no-selenium', action='store_true', help='Skip the Selenium sites')
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--baseline', help='Compare against this results file (exit 1 on regression)')
+    parser.add_argument('--save-baseline', metavar='FILE', help='Write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed slowdown before a suite counts as regressed (default: {DEFAULT_TOLERANCE})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as scratch:
+        store = FixtureStore(args.fixtures)
+        if args.synthetic or not len(store):
+            print('[BENCH] Using synthetic fixture pages')
+            store = FixtureStore(scratch)
+            synthesize(store)
+        results = run_benchmarks(store, args.repeat, args.workers, args.latency_ms / 1000,
+                                 selenium=not args.no_selenium)
+    print_table(results)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        write_json_atomic(path, results)
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            print(f'[BENCH] No baseline at {args.baseline}, nothing to compare')
+            return
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f'[REGRESSION] {message}')
+        if regressions:
+            sys.exit(1)
+        print(f'[BENCH] Within {args.tolerance:.0%} of the baseline')
+
+
+if __name__ == '__main__':
+    main()
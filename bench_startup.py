@@ -0,0 +1,138 @@
+"""
+Startup benchmark: time from launching the server to the first byte of index.html.
+
+Each run starts a fresh process (python launcher.py, or the packaged exe
+with --exe), polls http://127.0.0.1:<port>/index.html until the response
+starts, then stops the process. Reports min / median / max time-to-first-byte
+over --runs runs.
+
+Usage:
+    python bench_startup.py [--runs N] [--exe dist\\DQA_Standard_Checker.exe]
+                            [--output FILE] [--baseline FILE] [--save-baseline FILE]
+                            [--tolerance 0.25]
+
+With --baseline the run fails (exit code 1) if the median got slower than the
+baseline by more than --tolerance (and by at least MIN_DELTA_MS).
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from atomic_io import write_json_atomic
+
+DEFAULT_RUNS = 5
+DEFAULT_TOLERANCE = 0.25
+# Startup differences below this are process scheduling noise, not regressions
+MIN_DELTA_MS = 50.0
+STARTUP_TIMEOUT = 60
+POLL_INTERVAL = 0.005
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def first_byte(port):
+    """HTTP status of index.html once its first byte arrived, or None if the server is not up yet."""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=STARTUP_TIMEOUT)
+    try:
+        conn.request('GET', '/index.html')
+        response = conn.getresponse()
+        response.read(1)
+        return response.status
+    except (ConnectionRefusedError, ConnectionResetError):
+        return None
+    finally:
+        conn.close()
+
+
+def measure(command, cwd):
+    """Launches command and returns its time-to-first-byte in milliseconds."""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(command + ['--no-browser', '--port', str(port)], cwd=cwd,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            status = first_byte(port)
+            if status is not None:
+                if status != 200:
+                    raise RuntimeError(f'index.html answered HTTP {status}')
+                return (time.perf_counter() - started) * 1000
+            if process.poll() is not None:
+                raise RuntimeError(f'{command[0]} exited with code {process.returncode} before serving')
+            if time.perf_counter() - started > STARTUP_TIMEOUT:
+                raise RuntimeError(f'no response within {STARTUP_TIMEOUT}s')
+            time.sleep(POLL_INTERVAL)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Measure time-to-first-byte of index.html from a cold start.')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--exe', help='Packaged executable to start (default: python launcher.py)')
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--baseline', help='Compare against this results file (exit 1 on regression)')
+    parser.add_argument('--save-baseline', metavar='FILE', help='Write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed slowdown of the median (default: {DEFAULT_TOLERANCE})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    here = os.path.dirname(os.path.abspath(__file__))
+    if args.exe:
+        exe = os.path.abspath(args.exe)
+        command, cwd, target = [exe], os.path.dirname(exe), 'exe'
+    else:
+        command, cwd, target = [sys.executable, os.path.join(here, 'launcher.py')], here, 'launcher.py'
+
+    timings = []
+    for run in range(1, args.runs + 1):
+        timings.append(measure(command, cwd))
+        print(f'[STARTUP] run {run}/{args.runs}: {timings[-1]:.0f} ms')
+    results = {
+        'target': target,
+        'runs': len(timings),
+        'min_ms': round(min(timings), 1),
+        'median_ms': round(statistics.median(timings), 1),
+        'max_ms': round(max(timings), 1),
+    }
+    print(f"[STARTUP] {target}: time to first byte of index.html "
+          f"min {results['min_ms']:.0f} / median {results['median_ms']:.0f} / max {results['max_ms']:.0f} ms")
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        write_json_atomic(path, results)
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            print(f'[STARTUP] No baseline at {args.baseline}, nothing to compare')
+            return
+        if baseline.get('target') != target:
+            print('[STARTUP] Baseline was measured on another target, not comparing')
+            return
+        limit = baseline['median_ms'] * (1 + args.tolerance)
+        if results['median_ms'] > limit and results['median_ms'] - baseline['median_ms'] >= MIN_DELTA_MS:
+            print(f"[REGRESSION] startup median {results['median_ms']} ms (baseline {baseline['median_ms']} ms)")
+            sys.exit(1)
+        print(f'[STARTUP] Within {args.tolerance:.0%} of the baseline')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 const config = {
     // Replace this with your published Google Sheet CSV URL
     // File > Share > Publish to web > Select Sheet > Comma-separated values (.csv)
-    googleSheetCsvUrl: ''
+    googleSheetCsvUrl: '',
+
+    // Number of parallel workers for "一鍵更新" verification (1 = sequential)
+    verifyWorkers: 4
 };
@@ -0,0 +1,420 @@
+"""
+Shared HTTP server core for server.py and launcher.py.
+
+PooledHTTPServer handles connections on a bounded thread pool, so a slow
+/api/sync-data write, a progress stream or a verification request never
+stalls asset requests from index.html. DQAHandler speaks HTTP/1.1 with
+keep-alive (idle connections are closed after KEEPALIVE_TIMEOUT seconds so
+they do not pin pool threads) and implements every route once:
+
+    GET  /api/jobs                 recent background jobs
+    GET  /api/jobs/<id>            job status / result
+    GET  /api/jobs/<id>/events     job progress (Server-Sent Events)
+    POST /api/run-verify           queue (or join) a verification job
+    POST /api/sync-data            write data.js + standards.json
+    POST /api/sync-data/patch      apply an edit (operation list) to them
+    GET  /metrics                  Prometheus metrics (see metrics)
+    GET  <anything else>           static files (dynamic files from data_dir)
+
+Text files (static assets and the dynamic files) are served from an
+in-memory ServedFileCache with strong ETags (304 on revalidation) and
+brotli/gzip copies chosen by Accept-Encoding. Entries are invalidated when
+the file changes on disk and after every sync or verification run.
+
+The two entry points differ only in DQAApp settings: where static assets
+and data files live, and how a verification job is run.
+"""
+import http.server
+import json
+import os
+import queue
+import threading
+import time
+
+import metrics
+from jobs import JobManager, format_sse
+from served_cache import ServedFileCache, etag_matches, is_compressible
+from standards_store import RevisionConflict, StandardsStore
+
+MAX_WORKERS = 16
+KEEPALIVE_TIMEOUT = 5
+
+# Files served from (and written to) data_dir rather than the static directory
+DYNAMIC_FILES = ('data.js', 'verification_results.json')
+
+# Paths reported as themselves in the request metrics, whatever the status
+API_PATHS = ('/api/jobs', '/api/run-verify', '/api/sync-data', '/api/sync-data/patch', '/metrics')
+
+
+class DQAApp:
+    """
+    Settings and shared state for one server instance.
+
+    static_dir: directory with index.html / app.js / style.css ...
+    data_dir: directory holding standards.db, data.js, standards.json and verification_results.json
+    verify_job: callable(emit, workers=1, full=False) run by the job worker
+    debug: log every request (otherwise only errors are logged)
+    """
+
+    def __init__(self, static_dir, data_dir, verify_job, debug=False):
+        self.static_dir = static_dir
+        self.data_dir = data_dir
+        self.verify_job = verify_job
+        self.debug = debug
+        self.jobs = JobManager()
+        self.files = ServedFileCache()
+        self.store = StandardsStore(data_dir)
+
+    def data_path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def run_verify(self, emit, **options):
+        """Job entry point: runs verify_job (counting its results), then drops the cached data files."""
+        def observed_emit(event, data):
+            if event == 'result':
+                metrics.record_check(data)
+            emit(event, data)
+
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = self.verify_job(observed_emit, **options)
+            outcome = result.get('status', 'success') if isinstance(result, dict) else 'success'
+            return result
+        finally:
+            metrics.VERIFY_RUNS.inc(outcome)
+            metrics.VERIFY_DURATION.observe(time.perf_counter() - started)
+            for name in DYNAMIC_FILES:
+                self.files.invalidate(self.data_path(name))
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """
+    HTTPServer that handles each connection on a bounded pool of daemon threads.
+
+    The workers are daemon threads (ThreadPoolExecutor workers are joined at
+    interpreter exit), so a kept-alive connection or an open progress stream
+    cannot keep the process alive after Ctrl+C. server_close() sets closing,
+    which ends open event streams.
+    """
+
+    def __init__(self, server_address, handler_class, app, max_workers=MAX_WORKERS):
+        self.app = app
+        self.closing = threading.Event()
+        self._max_workers = max_workers
+        self._requests = queue.SimpleQueue()
+        self._workers = []
+        self._idle = threading.Semaphore(0)
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        self._requests.put((request, client_address))
+        # Start another worker only when none is idle (as ThreadPoolExecutor does)
+        if not self._idle.acquire(blocking=False) and len(self._workers) < self._max_workers:
+            worker = threading.Thread(target=self._work, name=f'http_{len(self._workers)}', daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+            self._idle.release()
+
+    def server_close(self):
+        self.closing.set()
+        self.app.jobs.wake()
+        super().server_close()
+        for _ in self._workers:
+            self._requests.put(None)
+
+
+class DQAHandler(http.server.SimpleHTTPRequestHandler):
+    """Request handler shared by server.py and launcher.py."""
+
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body are separate writes; on a kept-alive connection Nagle's
+    # algorithm would hold the body back until the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def __init__(self, request, client_address, server):
+        self.app = server.app
+        super().__init__(request, client_address, server, directory=self.app.static_dir)
+
+    # ── Helpers ──────────────────────────────────────────────────
+    def debug(self, message):
+        if self.app.debug:
+            print(f"[DEBUG] {message}")
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json_body(self, default=None):
+        """Parsed JSON request body (default when there is none)."""
+        content_length = int(self.headers.get('Content-Length') or 0)
+        if content_length <= 0:
+            return default
+        return json.loads(self.rfile.read(content_length).decode('utf-8'))
+
+    def log_request(self, code='-', size='-'):
+        if self.app.debug or (isinstance(code, int) and code >= 400):
+            super().log_request(code, size)
+
+    def log_error(self, format, *args):
+        # An idle keep-alive connection timing out is routine, not an error
+        if self.app.debug or not format.startswith('Request timed out'):
+            super().log_error(format, *args)
+
+    def log_message(self, format, *args):
+        print(f"[{self.log_date_time_string()}] {format % args}")
+
+    # ── Metrics ──────────────────────────────────────────────────
+    def handle_one_request(self):
+        self._started = time.perf_counter()
+        self._status = None
+        self._body_bytes = 0
+        self._served_file = None
+        super().handle_one_request()
+        if self._status is not None:
+            path = self.metrics_path()
+            metrics.HTTP_REQUESTS.inc(self.command or '-', path, str(self._status))
+            metrics.HTTP_DURATION.observe(time.perf_counter() - self._started, path)
+            if self._body_bytes and self.command != 'HEAD':
+                metrics.HTTP_BYTES.inc(path, amount=self._body_bytes)
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length':
+            self._body_bytes = int(value)
+        super().send_header(keyword, value)
+
+    def metrics_path(self):
+        """
+        Path label: a route template, or the name of the file served (resolved,
+        so /x/../app.js?v=2 counts as /app.js); 'other' otherwise. The label
+        set is bounded by the routes and the files on disk.
+        """
+        path = getattr(self, 'path', '').split('?')[0]  # unset if the request line was malformed
+        if path.startswith('/api/jobs/'):
+            return '/api/jobs/{id}/events' if path.endswith('/events') else '/api/jobs/{id}'
+        if path in API_PATHS:
+            return path
+        if self._status < 400:
+            file_path = self._served_file or self.translate_path(path)
+            if os.path.isfile(file_path):
+                return self._file_label(file_path)
+        return 'other'
+
+    def _file_label(self, file_path):
+        for root in (self.app.static_dir, self.app.data_dir):
+            try:
+                relative = os.path.relpath(file_path, root)
+            except ValueError:  # another drive (Windows)
+                continue
+            if not relative.startswith(os.pardir):
+                return '/' + relative.replace(os.sep, '/')
+        return 'other'
+
+    def send_metrics(self):
+        body = metrics.REGISTRY.render()
+        self.send_response(200)
+        self.send_header('Content-Type', metrics.CONTENT_TYPE)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # ── Routing ──────────────────────────────────────────────────
+    def do_GET(self):
+        path = self.path.split('?')[0].lstrip('/')
+        self.debug(f"GET {self.path}")
+
+        if path == 'api/jobs':
+            self.send_json({'jobs': self.app.jobs.recent()})
+        elif path == 'metrics':
+            self.send_metrics()
+        elif path.startswith('api/jobs/') and path.endswith('/events'):
+            self.stream_job_events(path[len('api/jobs/'):-len('/events')])
+        elif path.startswith('api/jobs/'):
+            self.handle_job_status(path[len('api/jobs/'):])
+        elif path in DYNAMIC_FILES and self.send_data_file(path):
+            return
+        elif not self.send_static_file():
+            super().do_GET()
+
+    def do_POST(self):
+        if self.path == '/api/run-verify':
+            self.handle_verify()
+        elif self.path == '/api/sync-data':
+            self.handle_sync_data()
+        elif self.path == '/api/sync-data/patch':
+            self.handle_sync_patch()
+        else:
+            self.send_error(404)
+
+    # ── Data files ───────────────────────────────────────────────
+    def send_data_file(self, name):
+        """Serves a dynamic file from data_dir; False if it does not exist there."""
+        if name == 'data.js':
+            # The scraper imports hand edits without exporting; the browser gets them here
+            self.app.store.refresh_exports()
+        if self.send_cached_file(self.app.data_path(name)):
+            return True
+        self.debug(f"{name} not in {self.app.data_dir}, serving bundled copy")
+        return False
+
+    def send_static_file(self):
+        """Serves a compressible static file through the cache; False to fall back to the base class."""
+        file_path = self.translate_path(self.path)
+        if os.path.isdir(file_path):
+            if not self.path.split('?')[0].endswith('/'):
+                return False  # let the base class redirect to the trailing slash
+            file_path = os.path.join(file_path, 'index.html')
+        return is_compressible(file_path) and self.send_cached_file(file_path)
+
+    def send_cached_file(self, file_path):
+        """Sends file_path from the ServedFileCache (304 / compressed as negotiated); False if missing."""
+        entry = self.app.files.get(file_path)
+        if entry is None:
+            return False
+        self._served_file = file_path
+        body, encoding, etag = entry.variant(self.headers.get('Accept-Encoding'))
+        not_modified = etag_matches(self.headers.get('If-None-Match'), etag)
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        # Always revalidate: the files change whenever the data is synced or verified
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if not_modified:
+            self.end_headers()
+            return True
+        self.send_header('Content-Type', entry.content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
+    def handle_sync_data(self):
+        """Full sync: writes the posted standards to data.js (frontend) and standards.json (scraper)."""
+        started = self.observe_sync_start('full')
+        outcome = 'ok'
+        try:
+            standards = self.read_json_body(default=[])
+            revision = self.app.store.replace(standards)
+            # Re-read and recompress now (also rewrites data.js.br / data.js.gz)
+            self.app.files.refresh(self.app.data_path('data.js'))
+
+            print(f"[SYNC] Updated data.js + standards.json with {len(standards)} standards (rev {revision})")
+            response = {'status': 'success', 'revision': revision,
+                        'message': f'已同步 {len(standards)} 筆法規到 data.js'}
+        except Exception as e:
+            print(f"[SYNC ERROR] {str(e)}")
+            response = {'status': 'error', 'message': str(e)}
+            outcome = 'error'
+        self.observe_sync_end('full', outcome, started)
+        self.send_json(response)
+
+    def handle_sync_patch(self):
+        """Delta sync: applies an operation list made against base_revision (409 if stale)."""
+        started = self.observe_sync_start('patch')
+        try:
+            patch = self.read_json_body(default={}) or {}
+            ops = patch.get('ops', [])
+            revision, count = self.app.store.apply(ops, patch.get('base_revision'))
+        except RevisionConflict as e:
+            print(f"[SYNC] Rejected patch: {e}")
+            self.observe_sync_end('patch', 'conflict', started)
+            self.send_json({'status': 'conflict', 'revision': e.revision, 'message': str(e)},
+                           status=409)
+            return
+        except Exception as e:
+            print(f"[SYNC ERROR] {str(e)}")
+            self.observe_sync_end('patch', 'error', started)
+            self.send_json({'status': 'error', 'message': str(e)}, status=400)
+            return
+        self.app.files.refresh(self.app.data_path('data.js'))
+        self.observe_sync_end('patch', 'ok', started)
+        print(f"[SYNC] Applied {len(ops)} op(s) to data.js + standards.json (rev {revision})")
+        self.send_json({'status': 'success', 'revision': revision,
+                        'message': f'已同步 {len(ops)} 項變更到 data.js（共 {count} 筆法規）'})
+
+    def observe_sync_start(self, kind):
+        metrics.SYNC_BYTES.observe(int(self.headers.get('Content-Length') or 0), kind)
+        return time.perf_counter()
+
+    def observe_sync_end(self, kind, outcome, started):
+        metrics.SYNC_REQUESTS.inc(kind, outcome)
+        metrics.SYNC_DURATION.observe(time.perf_counter() - started, kind)
+
+    # ── Verification jobs ────────────────────────────────────────
+    def handle_verify(self):
+        """Queues a verification job (or joins the running one) and returns its id at once."""
+        try:
+            options = self.read_json_body(default={}) or {}
+            workers = int(options.get('workers', 1))
+            full = bool(options.get('full', False))
+        except Exception as e:
+            self.send_json({'status': 'error', 'message': str(e)}, status=400)
+            return
+
+        job, joined = self.app.jobs.submit('verify', self.app.run_verify,
+                                           {'workers': workers, 'full': full})
+        print(f"[JOB] {'Joined' if joined else 'Queued'} verification job {job['id']}")
+        self.send_json({'status': 'accepted', 'job_id': job['id'], 'joined': joined, 'job': job},
+                       status=202)
+
+    def handle_job_status(self, job_id):
+        job = self.app.jobs.status(job_id)
+        if job is None:
+            self.send_json({'status': 'error', 'message': f'Unknown job: {job_id}'}, status=404)
+        else:
+            self.send_json(job)
+
+    def stream_job_events(self, job_id):
+        """Server-Sent Events: one event per finished standard, then 'end'."""
+        if self.app.jobs.status(job_id) is None:
+            self.send_json({'status': 'error', 'message': f'Unknown job: {job_id}'}, status=404)
+            return
+        try:
+            # Sent by the browser when it reconnects; resume after that event
+            last_id = int(self.headers.get('Last-Event-ID') or 0)
+        except ValueError:
+            last_id = 0
+
+        # The stream has no length, so this connection cannot be kept alive
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        try:
+            for event in self.app.jobs.events(job_id, after=last_id, stop=self.server.closing):
+                self.wfile.write(format_sse(event))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def make_server(port, app, max_workers=MAX_WORKERS):
+    """Creates (but does not start) the pooled server for app on port."""
+    return PooledHTTPServer(('', port), DQAHandler, app, max_workers=max_workers)
@@ -0,0 +1,227 @@
+"""
+Pool of reusable Selenium WebDriver sessions.
+
+Drivers are started lazily (or pre-warmed with warm()), leased to one scraper
+at a time, and recycled after a number of pages or when the browser's memory
+grows past a limit. A driver that stops responding is discarded and replaced
+on the next lease, so one crashed Chrome does not fail the whole run.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+
+try:
+    import psutil  # optional: more accurate memory readings
+except ImportError:
+    psutil = None
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_MEMORY_MB = 1024
+MAX_START_FAILURES = 3
+# After MAX_START_FAILURES the pool stops trying; a long-lived pool tries again after this
+START_RETRY_SECONDS = 300
+
+
+class _PooledDriver:
+    """Book-keeping for one driver owned by the pool."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """
+    Thread-safe pool of up to `size` WebDriver instances.
+
+    factory: callable returning a new driver (e.g. verify_standards._create_driver)
+    quit_fn: callable used to close a driver
+    """
+
+    def __init__(self, factory, quit_fn, size=1, max_pages=DEFAULT_MAX_PAGES,
+                 max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+        self.factory = factory
+        self.quit_fn = quit_fn
+        self.size = max(1, int(size))
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+
+        self._idle = []
+        self._created = 0
+        self._start_failures = 0
+        self._last_failure = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {'started': 0, 'recycled': 0, 'crashed': 0, 'start_failed': 0}
+
+    # ── Lifecycle ──────────────────────────────────────────────
+    def warm(self, count=None):
+        """
+        Starts drivers up front (in parallel) so the first leases do not pay
+        Chrome startup. Returns the number of drivers started.
+        """
+        count = self.size if count is None else min(count, self.size)
+        with self._cond:
+            if self._closed or not self.available:
+                return 0
+            missing = max(0, count - self._created)
+            self._created += missing
+        entries = [None] * missing
+
+        def start(i):
+            entries[i] = self._start()
+
+        threads = [threading.Thread(target=start, args=(i,), name=f'warm-driver-{i}', daemon=True)
+                   for i in range(missing)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        started = [entry for entry in entries if entry is not None]
+        with self._cond:
+            self._created -= missing - len(started)
+            if self._closed:
+                self._created -= len(started)
+                stale = started
+            else:
+                self._idle.extend(started)
+                stale = []
+            self._cond.notify_all()
+        for entry in stale:  # the pool was closed while they started
+            metrics.record_driver_retired(entry.created_at, entry.pages, 'closed')
+            self.quit_fn(entry.driver)
+        return len(started)
+
+    def resize(self, size):
+        """Raises (or lowers) the maximum number of drivers the pool may hold."""
+        with self._cond:
+            self.size = max(1, int(size))
+            self._cond.notify_all()
+
+    def close(self):
+        """Quits all idle drivers; leased drivers are quit when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            metrics.record_driver_retired(entry.created_at, entry.pages, 'closed')
+            self.quit_fn(entry.driver)
+
+    @property
+    def available(self):
+        """
+        False once the driver repeatedly failed to start (e.g. no Chrome
+        installed), until START_RETRY_SECONDS have passed; then one more start
+        is tried, and a successful one resets the count.
+        """
+        return (self._start_failures < MAX_START_FAILURES
+                or time.monotonic() - self._last_failure >= START_RETRY_SECONDS)
+
+    # ── Leasing ────────────────────────────────────────────────
+    @contextmanager
+    def lease(self):
+        """
+        Yields a driver for exclusive use, or None if no driver can be started.
+        Call mark_broken(driver) inside the block if the session crashed.
+        """
+        entry = self._acquire()
+        try:
+            yield entry.driver if entry else None
+        finally:
+            if entry is not None:
+                self._release(entry)
+
+    def mark_broken(self, driver):
+        """Flags a leased driver as crashed so it is replaced instead of reused."""
+        driver._dqa_pool_broken = True
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._closed or not self.available:
+                    return None
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self._cond.wait()
+
+        entry = self._start()
+        if entry is None:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+        return entry
+
+    def _release(self, entry):
+        entry.pages += 1
+        reason = None
+        if getattr(entry.driver, '_dqa_pool_broken', False) or not is_alive(entry.driver):
+            reason = 'crashed'
+        elif self.max_pages and entry.pages >= self.max_pages:
+            reason = 'recycled'
+        elif self.max_memory_mb and _memory_mb(entry.driver) > self.max_memory_mb:
+            reason = 'recycled'
+
+        with self._cond:
+            over_size = self._created > self.size
+            if reason is None and not self._closed and not over_size:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+            self._created -= 1
+            if reason:
+                self.stats[reason] += 1
+            self._cond.notify()
+
+        if reason == 'crashed':
+            print(f"[POOL] Driver crashed after {entry.pages} pages, replacing")
+        metrics.record_driver_retired(entry.created_at, entry.pages, reason or 'closed')
+        self.quit_fn(entry.driver)
+
+    def _start(self):
+        try:
+            driver = self.factory()
+        except Exception as e:
+            with self._cond:
+                self._start_failures += 1
+                self._last_failure = time.monotonic()
+                self.stats['start_failed'] += 1
+            metrics.DRIVER_EVENTS.inc('start_failed')
+            print(f"Selenium driver error: {e}")
+            return None
+        with self._cond:
+            self._start_failures = 0
+            self.stats['started'] += 1
+        metrics.DRIVER_EVENTS.inc('started')
+        return _PooledDriver(driver)
+
+
+def is_alive(driver):
+    """Cheap health check: a dead session raises on any command."""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def _memory_mb(driver):
+    """Browser memory in MB (process tree RSS with psutil, else the page's JS heap)."""
+    try:
+        if psutil is not None:
+            proc = psutil.Process(driver.service.process.pid)
+            procs = [proc] + proc.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+        used = driver.execute_script(
+            "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0")
+        return (used or 0) / (1024 * 1024)
+    except Exception:
+        return 0
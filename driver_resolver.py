@@ -0,0 +1,260 @@
+"""
+ChromeDriver resolution with an on-disk cache, so starting Selenium needs no network.
+
+ChromeDriverManager().install() checks the latest driver version online
+every time it is called, and fails outright offline or behind a proxy.
+resolve() instead remembers the driver it found, with the Chrome version it
+matched, in a small JSON file and trusts it for CHECK_INTERVAL:
+
+    within the interval   cached driver, if the file still exists (no subprocess, no network)
+    after the interval    compare the installed Chrome's major version with the
+                          cached one; unchanged -> keep the driver, re-stamp the cache
+    no / stale cache      webdriver_manager, then Selenium Manager, then a
+                          chromedriver on PATH (first that works)
+
+If the cached driver no longer matches Chrome (it was updated within the
+interval), the caller invalidates the cache and resolves again (see
+verify_standards._create_driver).
+
+Configuration (environment):
+
+    DQA_CHROMEDRIVER            use this chromedriver, skip resolution
+    DQA_DRIVER_CACHE            cache file (default ~/.dqa/chromedriver.json)
+    DQA_DRIVER_CHECK_HOURS      hours between version checks (default 24, 0 = every run)
+
+Usage:
+    python driver_resolver.py [--refresh]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import metrics
+from atomic_io import write_json_atomic
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.dqa', 'chromedriver.json')
+DEFAULT_CHECK_HOURS = 24.0
+VERSION_TIMEOUT = 10
+
+# Where Chrome usually lives when it is not on PATH
+_CHROME_COMMANDS = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+_CHROME_PATHS = (
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    '/opt/google/chrome/chrome',
+)
+_CHROME_REGISTRY_KEYS = (r'Software\Google\Chrome\BLBeacon', r'Software\Chromium\BLBeacon')
+
+_VERSION_RE = re.compile(r'(\d+)\.\d+\.\d+(?:\.\d+)?')
+
+_lock = threading.Lock()
+_resolved = None
+_resolved_at = 0.0  # time.monotonic() of _resolved
+
+
+class Resolution:
+    """A resolved chromedriver: path (None if none was found), how and how fast."""
+
+    __slots__ = ('path', 'chrome_version', 'source', 'seconds', 'error')
+
+    def __init__(self, path, chrome_version, source, seconds=0.0, error=None):
+        self.path = path
+        self.chrome_version = chrome_version
+        self.source = source
+        self.seconds = seconds
+        self.error = error
+
+    def describe(self):
+        if self.path is None:
+            return f"no chromedriver found ({self.error}) in {self.seconds * 1000:.0f} ms"
+        return (f"chromedriver from {self.source} for Chrome {self.chrome_version or 'unknown'} "
+                f"in {self.seconds * 1000:.0f} ms ({self.path})")
+
+
+def cache_path():
+    return os.environ.get('DQA_DRIVER_CACHE') or DEFAULT_CACHE_PATH
+
+
+def check_interval():
+    """Seconds a cached driver is trusted without looking at the installed Chrome."""
+    try:
+        hours = float(os.environ.get('DQA_DRIVER_CHECK_HOURS', DEFAULT_CHECK_HOURS))
+    except ValueError:
+        hours = DEFAULT_CHECK_HOURS
+    return max(hours, 0.0) * 3600
+
+
+def major(version):
+    """'120.0.6099.109' -> '120' (None if not a version)."""
+    match = _VERSION_RE.search(version or '')
+    return match.group(1) if match else None
+
+
+def _run_version(command):
+    try:
+        output = subprocess.run([command, '--version'], capture_output=True, text=True,
+                                timeout=VERSION_TIMEOUT).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_RE.search(output)
+    return match.group(0) if match else None
+
+
+def chrome_version():
+    """Version of the installed Chrome (None if not found), without going online."""
+    if sys.platform == 'win32':
+        import winreg
+        for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            for key in _CHROME_REGISTRY_KEYS:
+                try:
+                    with winreg.OpenKey(root, key) as handle:
+                        return winreg.QueryValueEx(handle, 'version')[0]
+                except OSError:
+                    continue
+        return None
+    candidates = [shutil.which(name) for name in _CHROME_COMMANDS] + list(_CHROME_PATHS)
+    for command in candidates:
+        if command and os.path.exists(command):
+            version = _run_version(command)
+            if version:
+                return version
+    return None
+
+
+def driver_version(path):
+    """Version reported by a chromedriver binary (None if it does not run)."""
+    return _run_version(path)
+
+
+def load_cache():
+    try:
+        with open(cache_path(), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached if isinstance(cached, dict) and cached.get('driver_path') else None
+
+
+def save_cache(resolution, checked_at=None):
+    try:
+        os.makedirs(os.path.dirname(cache_path()), exist_ok=True)
+        write_json_atomic(cache_path(), {
+            'driver_path': resolution.path,
+            'chrome_version': resolution.chrome_version,
+            'source': resolution.source,
+            'checked_at': time.time() if checked_at is None else checked_at,
+        }, fsync='none')
+    except OSError as e:
+        print(f"[DRIVER] Could not write {cache_path()}: {e}")
+
+
+def invalidate():
+    """Forgets the cached driver (e.g. it no longer starts against the installed Chrome)."""
+    global _resolved
+    with _lock:
+        _resolved = None
+        try:
+            os.remove(cache_path())
+        except OSError:
+            pass
+
+
+# ── Resolvers (slow path) ─────────────────────────────────────────
+def _from_webdriver_manager():
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def _from_selenium_manager():
+    from selenium.webdriver.common.selenium_manager import SeleniumManager
+    return SeleniumManager().binary_paths(['--browser', 'chrome']).get('driver_path')
+
+
+def _from_path():
+    return shutil.which('chromedriver')
+
+
+RESOLVERS = (
+    ('webdriver_manager', _from_webdriver_manager),
+    ('selenium_manager', _from_selenium_manager),
+    ('path', _from_path),
+)
+
+
+def _resolve_fresh(installed):
+    errors = []
+    for source, resolver in RESOLVERS:
+        try:
+            path = resolver()
+        except Exception as e:
+            errors.append(f"{source}: {e.__class__.__name__}")
+            continue
+        if path and os.path.exists(path):
+            return Resolution(path, installed, source)
+        errors.append(f"{source}: not found")
+    return Resolution(None, installed, 'none', error='; '.join(errors))
+
+
+def _resolve(refresh):
+    pinned = os.environ.get('DQA_CHROMEDRIVER')
+    if pinned and os.path.exists(pinned):
+        return Resolution(pinned, None, 'DQA_CHROMEDRIVER')
+
+    cached = None if refresh else load_cache()
+    if cached and os.path.exists(cached['driver_path']):
+        if time.time() - cached.get('checked_at', 0) < check_interval():
+            return Resolution(cached['driver_path'], cached.get('chrome_version'), 'cache')
+        installed = chrome_version()
+        if installed is None or major(installed) == major(cached.get('chrome_version')):
+            resolution = Resolution(cached['driver_path'], installed or cached.get('chrome_version'), 'cache')
+            save_cache(resolution)
+            return resolution
+    else:
+        installed = chrome_version()
+
+    resolution = _resolve_fresh(installed)
+    if resolution.path is not None:
+        if resolution.chrome_version is None:
+            resolution.chrome_version = driver_version(resolution.path)
+        save_cache(resolution)
+    return resolution
+
+
+def resolve(refresh=False):
+    """
+    The chromedriver to start Chrome with (Resolution; path is None if none
+    was found). A long-running process keeps its resolution for
+    check_interval() and then checks the installed Chrome again, like a new
+    process would; refresh=True ignores the caches.
+    """
+    global _resolved, _resolved_at
+    with _lock:
+        if (_resolved is not None and not refresh
+                and time.monotonic() - _resolved_at < check_interval()):
+            return _resolved
+        started = time.perf_counter()
+        resolution = _resolve(refresh)
+        resolution.seconds = time.perf_counter() - started
+        metrics.DRIVER_RESOLVE.observe(resolution.seconds, resolution.source)
+        print(f"[DRIVER] {resolution.describe()}")
+        if resolution.path is not None:
+            _resolved, _resolved_at = resolution, time.monotonic()
+        return resolution
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resolve (and cache) the chromedriver used for scraping.')
+    parser.add_argument('--refresh', action='store_true', help='Ignore the cache and resolve again')
+    args = parser.parse_args(argv)
+    print(f"[DRIVER] Cache: {cache_path()} (checked every {check_interval() / 3600:g} h)")
+    if resolve(args.refresh).path is None:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Pre-compiled field extraction for the scrapers.
+
+Each site declares its text fields once, at import time, as a PatternSet.
+scan() prepares the page text once and returns every field with its match
+position. Three things keep it fast on large pages:
+
+- Case folding: fields marked fold=True are written in lowercase and run
+  case-sensitively on one lowercased copy of the text, which lets the regex
+  engine use its literal-prefix fast search (re.IGNORECASE disables it).
+- Keyword prefilter: a field lists the literal(s) every match contains; a
+  field whose keywords are absent from the page is skipped without running
+  its pattern.
+- Line fields (line=True) replace a "check every line" loop: the keyword is
+  located with str.find/rfind and only lines containing it are matched.
+
+A single combined alternation (one pass, named groups) was measured 3-6x
+slower than this in CPython: the re engine cannot prefix-scan an
+alternation, so it tries every branch at every position.
+"""
+import re
+from collections import namedtuple
+
+from profiling import stage
+
+# One extracted field: the whole match, the value (group 1, or the whole
+# match if the pattern has no group) and the match span in the page text
+FieldMatch = namedtuple('FieldMatch', 'text value start end')
+
+
+class Field:
+    """
+    A named pattern.
+
+    keyword: literal (or tuple of literals) every match contains; lowercase for fold fields
+    fold: pattern is lowercase and is matched against the lowercased text
+    line: pattern is matched within single lines that contain keyword
+    keep: 'first' (leftmost match, like re.search) or 'last' (last match / last line)
+    """
+
+    def __init__(self, name, pattern, keyword=None, fold=False, line=False, keep='first'):
+        if keep not in ('first', 'last'):
+            raise ValueError(f"keep must be 'first' or 'last', not {keep!r}")
+        if line and not isinstance(keyword, str):
+            raise ValueError('line fields need a single keyword')
+        self.name = name
+        self.pattern = pattern
+        self.keywords = (keyword,) if isinstance(keyword, str) else tuple(keyword or ())
+        self.fold = fold
+        self.line = line
+        self.keep = keep
+        self.regex = re.compile(pattern)
+        if fold:
+            # Used when lowercasing changes the text length (a few non-ASCII
+            # characters), so offsets in the lowered copy would not line up
+            self.regex_ignorecase = re.compile(pattern, re.IGNORECASE)
+            self.keyword_ignorecase = re.compile('|'.join(map(re.escape, self.keywords)) or '(?!)',
+                                                 re.IGNORECASE)
+
+    def find(self, text, folded):
+        """
+        Returns the FieldMatch in text, or None. folded is text.lower() when
+        its length matches text, else None.
+        """
+        if self.fold and folded is None:
+            return self._find_ignorecase(text)
+        target = folded if self.fold else text
+        if self.keywords and not any(keyword in target for keyword in self.keywords):
+            return None
+        if self.line:
+            return self._find_in_lines(text, target, self.regex, self._keyword_offsets(target))
+        return self._find_in_text(text, target, self.regex)
+
+    def _find_ignorecase(self, text):
+        if self.keywords and not self.keyword_ignorecase.search(text):
+            return None
+        if self.line:
+            offsets = [m.start() for m in self.keyword_ignorecase.finditer(text)]
+            if self.keep == 'last':
+                offsets.reverse()
+            return self._find_in_lines(text, text, self.regex_ignorecase, offsets)
+        return self._find_in_text(text, text, self.regex_ignorecase)
+
+    def _keyword_offsets(self, target):
+        keyword = self.keywords[0]
+        if self.keep == 'first':
+            idx = target.find(keyword)
+            while idx != -1:
+                yield idx
+                idx = target.find(keyword, idx + 1)
+        else:
+            idx = target.rfind(keyword)
+            while idx != -1:
+                yield idx
+                idx = target.rfind(keyword, 0, idx)
+
+    def _find_in_text(self, text, target, regex):
+        if self.keep == 'first':
+            match = regex.search(target)
+        else:
+            match = None
+            for match in regex.finditer(target):
+                pass
+        return None if match is None else self._result(text, match, 0)
+
+    def _find_in_lines(self, text, target, regex, offsets):
+        checked = None
+        for idx in offsets:
+            line_start = text.rfind('\n', 0, idx) + 1
+            if line_start == checked:
+                continue
+            checked = line_start
+            line_end = text.find('\n', idx)
+            if line_end == -1:
+                line_end = len(text)
+            match = regex.search(target[line_start:line_end])
+            if match is not None:
+                return self._result(text, match, line_start)
+        return None
+
+    def _result(self, text, match, offset):
+        group = 1 if match.re.groups else 0
+        start, end = match.start() + offset, match.end() + offset
+        value = text[match.start(group) + offset:match.end(group) + offset]
+        return FieldMatch(text[start:end], value, start, end)
+
+
+class PatternSet:
+    """A site's fields, scanned over one prepared (case-folded) copy of the text."""
+
+    def __init__(self, fields):
+        self.fields = {}
+        for field in fields:
+            if field.name in self.fields:
+                raise ValueError(f"duplicate field {field.name!r}")
+            self.fields[field.name] = field
+        self._folds = any(field.fold for field in self.fields.values())
+
+    def _fold(self, text):
+        if not self._folds:
+            return None
+        folded = text.lower()
+        return folded if len(folded) == len(text) else None
+
+    def scan(self, text, names=None):
+        """Returns {field name: FieldMatch} for the fields (default: all) that matched."""
+        with stage('regex'):
+            folded = self._fold(text)
+            found = {}
+            for name in names or self.fields:
+                match = self.fields[name].find(text, folded)
+                if match is not None:
+                    found[name] = match
+            return found
+
+    def first(self, text, names):
+        """
+        The first of names (priority order) that matches, as (name, FieldMatch),
+        or (None, None). Lower-priority fields are not scanned once one matches.
+        """
+        with stage('regex'):
+            folded = self._fold(text)
+            for name in names:
+                match = self.fields[name].find(text, folded)
+                if match is not None:
+                    return name, match
+            return None, None
@@ -0,0 +1,102 @@
+"""
+HTML parsing backend for the scrapers.
+
+parse() builds a page with lxml (libxml2, C) when it is installed and falls
+back to BeautifulSoup otherwise. Scrapers declare the nodes they need as
+Selector objects created once at import time: the XPath is pre-compiled for
+lxml and the CSS form is kept for the BeautifulSoup fallback. Only selected
+nodes are turned into text; the whole-document text is built only when a
+scraper asks for it.
+"""
+from profiling import stage
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is in requirements.txt
+    lxml = None
+    etree = None
+
+BACKENDS = ('lxml', 'bs4')
+DEFAULT_BACKEND = 'lxml' if etree is not None else 'bs4'
+
+# Elements whose text is not page text (BeautifulSoup's get_text() skips them too)
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+class Selector:
+    """A node selector, pre-compiled for lxml with a CSS equivalent for BeautifulSoup."""
+
+    def __init__(self, xpath, css):
+        self.xpath = xpath
+        self.css = css
+        self.compiled = etree.XPath(xpath) if etree is not None else None
+
+
+class _LxmlPage:
+    def __init__(self, content):
+        self.root = lxml.html.document_fromstring(content)
+        etree.strip_elements(self.root, *_NON_TEXT_TAGS, with_tail=False)
+        self._text = None
+
+    def select_one(self, selector):
+        nodes = selector.compiled(self.root)
+        return nodes[0] if nodes else None
+
+    def node_text(self, node, strip=False):
+        if strip:
+            return ''.join(part.strip() for part in node.itertext())
+        return ''.join(node.itertext())
+
+    def text(self):
+        if self._text is None:
+            self._text = self.root.text_content()
+        return self._text
+
+
+class _SoupPage:
+    def __init__(self, content):
+        from bs4 import BeautifulSoup  # only loaded when lxml is missing or gives up
+
+        self.soup = BeautifulSoup(content, 'html.parser')
+        self._text = None
+
+    def select_one(self, selector):
+        return self.soup.select_one(selector.css)
+
+    def node_text(self, node, strip=False):
+        return node.get_text(strip=strip)
+
+    def text(self):
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
+
+
+class Page:
+    """Parsed document exposing only what the scrapers need."""
+
+    def __init__(self, impl):
+        self._impl = impl
+
+    def select_text(self, selector, strip=False):
+        """Text of the first node matching selector (document order), or None."""
+        node = self._impl.select_one(selector)
+        return None if node is None else self._impl.node_text(node, strip)
+
+    def text(self):
+        """Whole-document text (computed once, on demand)."""
+        with stage('parse'):
+            return self._impl.text()
+
+
+def parse(content, backend=None):
+    """Parses an HTML body (bytes or str) with the given or default backend."""
+    backend = backend or DEFAULT_BACKEND
+    with stage('parse'):
+        if backend == 'lxml' and etree is not None:
+            try:
+                return Page(_LxmlPage(content))
+            except (etree.ParserError, ValueError):
+                pass  # empty or undecodable document - let BeautifulSoup try
+        return Page(_SoupPage(content))
@@ -0,0 +1,200 @@
+"""
+Background job queue for long-running server actions (verification runs).
+
+The HTTP handlers submit work and return a job id immediately; a single
+worker thread runs jobs in order and the browser polls the job by id.
+Only one job of a given kind is queued or running at a time: submitting
+the same kind again returns the existing job (the caller "joins" it)
+instead of starting a duplicate run.
+
+Jobs can publish progress events while they run (e.g. one per verified
+standard). Events are kept on the job, so a client that connects late or
+reconnects replays them from any point; events() serves them to the
+Server-Sent Events endpoint, ending with an 'end' event.
+"""
+import json
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+# Finished jobs kept for status lookups
+MAX_FINISHED_JOBS = 20
+
+# Seconds between SSE keep-alive comments while a job is quiet
+HEARTBEAT_SECONDS = 15
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+def _now_iso():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class Job:
+    """One unit of background work and its status."""
+
+    def __init__(self, kind, func, options):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.func = func
+        self.options = options
+        self.state = QUEUED
+        self.submitted_at = _now_iso()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.events = []
+        self._started = None
+        self._elapsed = None
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED)
+
+    def to_dict(self):
+        if self._elapsed is not None:
+            elapsed = self._elapsed
+        elif self._started is not None:
+            elapsed = time.monotonic() - self._started
+        else:
+            elapsed = 0.0
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'state': self.state,
+            'options': self.options,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'elapsed': round(elapsed, 1),
+            'result': self.result,
+            'error': self.error,
+            'event_count': len(self.events),
+        }
+
+
+class JobManager:
+    """Thread-safe job registry with one worker thread."""
+
+    def __init__(self, max_finished=MAX_FINISHED_JOBS):
+        self.max_finished = max_finished
+        self._jobs = OrderedDict()
+        self._active = {}  # kind -> queued/running job
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._worker = None
+
+    def submit(self, kind, func, options=None):
+        """
+        Queues func(emit, **options) as a job of the given kind; func may call
+        emit(event, data) to publish progress. Returns (status, joined):
+        status is the job's to_dict() snapshot; joined is True when a job of this
+        kind was already queued or running and that job is returned instead.
+        """
+        with self._lock:
+            active = self._active.get(kind)
+            if active is not None:
+                return active.to_dict(), True
+            job = Job(kind, func, dict(options or {}))
+            self._jobs[job.id] = job
+            self._active[kind] = job
+            self._prune()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name='job-worker', daemon=True)
+                self._worker.start()
+            snapshot = job.to_dict()
+        self._queue.put(job)
+        return snapshot, False
+
+    def status(self, job_id):
+        """Returns the to_dict() snapshot of a job, or None for an unknown id."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def recent(self):
+        """Snapshots of all retained jobs, newest first."""
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def events(self, job_id, after=0, heartbeat=HEARTBEAT_SECONDS, stop=None):
+        """
+        Yields the job's events with id > after as {'id', 'event', 'data'} dicts,
+        waiting for new ones until the final 'end' event. Yields None after
+        heartbeat seconds without events. Yields nothing for an unknown job.
+        Stops early once the stop Event is set (call wake() after setting it).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return
+        position = max(0, int(after))
+        while True:
+            with self._changed:
+                if position >= len(job.events) and not (stop is not None and stop.is_set()):
+                    self._changed.wait(heartbeat)
+                pending = job.events[position:]
+            if stop is not None and stop.is_set():
+                return
+            if not pending:
+                yield None
+                continue
+            for event in pending:
+                position += 1
+                yield event
+                if event['event'] == 'end':
+                    return
+
+    def wake(self):
+        """Wakes every events() reader, e.g. to let it see its stop Event."""
+        with self._changed:
+            self._changed.notify_all()
+
+    def _emit(self, job, event, data):
+        with self._changed:
+            job.events.append({'id': len(job.events) + 1, 'event': event, 'data': data})
+            self._changed.notify_all()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def _run_worker(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                job.state = RUNNING
+                job.started_at = _now_iso()
+                job._started = time.monotonic()
+            try:
+                result = job.func(lambda event, data: self._emit(job, event, data), **job.options)
+                state, error = DONE, None
+            except Exception as e:
+                traceback.print_exc()
+                result, state, error = None, FAILED, str(e)
+            with self._lock:
+                job.result = result
+                job.error = error
+                job.state = state
+                job.finished_at = _now_iso()
+                job._elapsed = time.monotonic() - job._started
+                if self._active.get(job.kind) is job:
+                    del self._active[job.kind]
+                self._prune()
+            self._emit(job, 'end', self.status(job.id) or job.to_dict())
+            self._queue.task_done()
+
+
+def format_sse(event):
+    """Encodes an events() item as a Server-Sent Events frame (None -> keep-alive comment)."""
+    if event is None:
+        return b': keep-alive\n\n'
+    data = json.dumps(event['data'], ensure_ascii=False)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n".encode('utf-8')
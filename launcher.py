@@ -4,16 +4,18 @@ DQA Environmental Standard Checker - 啟動器
 此檔案用於 PyInstaller 打包，整合伺服器與瀏覽器啟動功能
 """
 
-import http.server
-import socketserver
+import argparse
 import webbrowser
 import os
 import sys
-import json
 import threading
 import time
 import io
-import verify_standards
+from atomic_io import write_atomic
+from dqa_server import DQAApp, make_server
+
+# verify_standards（requests / Selenium / lxml 整套爬蟲）在第一次驗證時才載入，
+# 讓伺服器（與打包後的 exe）啟動後能立即回應 index.html
 
 # 設定 PORT
 PORT = 8001
@@ -34,6 +36,38 @@ def get_resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
+# 在多次驗證之間保持 Chrome 暖機，避免每次點擊都重新啟動瀏覽器
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+# 伺服器啟動後延遲幾秒再暖機 Chrome，不拖慢第一個頁面回應
+WARM_DELAY = 3
+
+def get_driver_pool():
+    """取得（必要時建立）共用的 Selenium driver pool"""
+    global _driver_pool
+    import verify_standards
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = verify_standards.create_driver_pool()
+        return _driver_pool
+
+def warm_driver_pool_delayed():
+    """背景暖機：建立 driver pool 並預先啟動 Chrome，第一次驗證不必等瀏覽器啟動"""
+    time.sleep(WARM_DELAY)
+    get_driver_pool().warm()
+
+def run_verify_job(emit, workers=1, full=False):
+    """背景執行一次驗證（由 job worker 呼叫，每筆結果以 emit 推送進度）"""
+    import verify_standards
+    base_path = get_base_path()
+    print(f"開始驗證... (Base path: {base_path}, workers: {workers}, full: {full})")
+    # 使用 verify_standards 模組執行驗證
+    # ChromeDriver 由 driver_resolver 解析 (有快取，不必每次連網)
+    return verify_standards.run_verification(base_path, workers=workers,
+                                             driver_pool=get_driver_pool(), full=full,
+                                             on_event=emit)
+
 def get_base_path():
     """取得基礎路徑（exe 所在目錄或腳本目錄）"""
     if hasattr(sys, '_MEIPASS'):
@@ -41,125 +75,26 @@ def get_base_path():
         return os.path.dirname(sys.executable)
     return os.path.abspath(".")
 
-class DQAHandler(http.server.SimpleHTTPRequestHandler):
-    """自訂 HTTP 請求處理器"""
-    
-    def __init__(self, *args, **kwargs):
-        # 設定靜態檔案目錄
-        directory = get_resource_path(".")
-        super().__init__(*args, directory=directory, **kwargs)
-    
-    def do_GET(self):
-        """處理 GET 請求，優先從 exe 目錄讀取動態檔案"""
-        # 需要從 exe 目錄讀取的檔案清單
-        dynamic_files = ['data.js', 'verification_results.json']
-        
-        # 移除 query string
-        clean_path = self.path.split('?')[0].lstrip('/')
-        
-        print(f"[DEBUG] Request: {self.path}, Clean: {clean_path}")
-        
-        if clean_path in dynamic_files:
-            base_path = get_base_path()
-            file_path = os.path.join(base_path, clean_path)
-            print(f"[DEBUG] Looking for {clean_path} in {base_path} -> {file_path}")
-            print(f"[DEBUG] Exists: {os.path.exists(file_path)}")
-            
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                    
-                    self.send_response(200)
-                    if clean_path.endswith('.js'):
-                        self.send_header("Content-type", "application/javascript")
-                    elif clean_path.endswith('.json'):
-                        self.send_header("Content-type", "application/json")
-                    self.send_header("Content-Length", str(len(content)))
-                    self.end_headers()
-                    self.wfile.write(content)
-                    return
-                except Exception as e:
-                    print(f"Error serving {clean_path}: {e}")
-        
-        # 預設行為（從資源目錄服務靜態檔案）
-        super().do_GET()
-
-    def do_POST(self):
-        if self.path == '/api/run-verify':
-            self.handle_verify()
-        elif self.path == '/api/sync-data':
-            self.handle_sync_data()
-        else:
-            self.send_error(404)
-    
-    def handle_verify(self):
-        """處理驗證請求"""
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        
-        try:
-            base_path = get_base_path()
-            print(f"開始驗證... (Base path: {base_path})")
-            
-            # 使用 verify_standards 模組執行驗證
-            # 這會自動下載 ChromeDriver 並執行 Selenium
-            result = verify_standards.run_verification(base_path)
-            
-            response = result
-                    
-        except Exception as e:
-            print(f"驗證發生錯誤: {e}")
-            response = {'status': 'error', 'message': str(e)}
-            
-        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
-    
-    def handle_sync_data(self):
-        """處理資料同步請求"""
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        
-        try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            standards = json.loads(post_data.decode('utf-8'))
-            
-            # 寫入到 exe 目錄下的 data.js
-            base_path = get_base_path()
-            data_file = os.path.join(base_path, 'data.js')
-            
-            js_content = "console.log('Data.js loading...');\n"
-            js_content += "window.initialStandards = "
-            js_content += json.dumps(standards, indent=4, ensure_ascii=False)
-            js_content += ";\n"
-            
-            with open(data_file, 'w', encoding='utf-8') as f:
-                f.write(js_content)
-            
-            print(f"[SYNC] Updated data.js with {len(standards)} standards")
-            response = {'status': 'success', 'message': f'已同步 {len(standards)} 筆法規到 data.js'}
-            
-        except Exception as e:
-            print(f"[SYNC ERROR] {str(e)}")
-            response = {'status': 'error', 'message': str(e)}
-            
-        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
-    
-    def log_message(self, format, *args):
-        """自訂日誌格式"""
-        print(f"[{self.log_date_time_string()}] {format % args}")
-
-
-def open_browser_delayed():
+def open_browser_delayed(port=PORT):
     """延遲開啟瀏覽器"""
     time.sleep(1.5)
-    webbrowser.open(f'http://localhost:{PORT}')
+    webbrowser.open(f'http://localhost:{port}')
+
+
+def parse_args(argv=None):
+    """命令列參數"""
+    parser = argparse.ArgumentParser(description='DQA Environmental Standard Checker')
+    parser.add_argument('--debug', action='store_true',
+                        help='記錄每一個 HTTP 請求（預設只記錄錯誤；亦可設定環境變數 DQA_DEBUG=1）')
+    parser.add_argument('--port', type=int, default=PORT, help=f'HTTP 連接埠（預設 {PORT}）')
+    parser.add_argument('--no-browser', action='store_true',
+                        help='不自動開啟瀏覽器（以服務方式執行或 bench_startup.py 量測時使用）')
+    return parser.parse_args(argv)
 
 
 def main():
     """主程式入口"""
+    args = parse_args()
     print("=" * 60)
     print("  DQA Environmental Standard Checker")
     print("  [Law Standard Checker System]")
@@ -175,28 +110,37 @@ def main():
             if os.path.exists(resource_data):
                 with open(resource_data, 'r', encoding='utf-8') as src:
                     content = src.read()
-                with open(data_path, 'w', encoding='utf-8') as dst:
-                    dst.write(content)
+                write_atomic(data_path, content)
                 print(f"Initialized data.js in {base_path}")
         except Exception as e:
             print(f"Failed to initialize data.js: {e}")
 
     print()
-    print(f"  Server URL: http://localhost:{PORT}")
+    print(f"  Server URL: http://localhost:{args.port}")
     print("  Press Ctrl+C to stop the server")
     print()
     print("=" * 60)
     
+    # 在背景執行緒中暖機 Chrome
+    threading.Thread(target=warm_driver_pool_delayed, name='warm-drivers', daemon=True).start()
+
     # 在背景執行緒中開啟瀏覽器
-    browser_thread = threading.Thread(target=open_browser_delayed, daemon=True)
-    browser_thread.start()
+    if not args.no_browser:
+        browser_thread = threading.Thread(target=open_browser_delayed, args=(args.port,), daemon=True)
+        browser_thread.start()
     
-    # 啟動 HTTP 伺服器
-    with socketserver.TCPServer(("", PORT), DQAHandler) as httpd:
+    # 啟動 HTTP 伺服器（共用核心 dqa_server：執行緒池 + keep-alive，
+    # 靜態檔案從資源目錄讀取，data.js / 驗證結果從 exe 目錄讀寫）
+    app = DQAApp(static_dir=get_resource_path("."), data_dir=base_path, verify_job=run_verify_job,
+                 debug=args.debug or os.environ.get('DQA_DEBUG') == '1')
+    with make_server(args.port, app) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nServer stopped.")
+        finally:
+            if _driver_pool is not None:
+                _driver_pool.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+"""
+In-process Prometheus metrics for the DQA server (GET /metrics).
+
+The launcher runs as a long-lived service; these counters and histograms
+make it observable without an external agent:
+
+    dqa_http_requests_total{method,path,status}      requests handled
+    dqa_http_request_duration_seconds{path}          request latency
+    dqa_http_response_bytes_total{path}              response bytes sent
+    dqa_sync_requests_total{kind,outcome}            /api/sync-data calls (full / patch)
+    dqa_sync_request_bytes{kind}                     posted payload size
+    dqa_sync_duration_seconds{kind}                  time to store and export a sync
+    dqa_verification_runs_total{outcome}             verification jobs
+    dqa_verification_run_duration_seconds            verification job duration
+    dqa_scraper_checks_total{scraper,status}         checked standards (ok / mismatch / error ...)
+    dqa_host_fetch_duration_seconds{host}            time to fetch and check one page, by host
+    dqa_selenium_drivers_total{event}                drivers started / failed to start / retired
+    dqa_selenium_driver_lifetime_seconds{reason}     age of a driver when it was retired
+    dqa_selenium_driver_pages{reason}                pages a driver served before it was retired
+    dqa_chromedriver_resolve_seconds{source}         time to find the chromedriver (cache / download ...)
+
+Path labels are route templates (/api/jobs/{id}) or the resolved name of
+the file served (/app.js for /app.js?v=3 or /x/../app.js), so stray URLs
+cannot grow the label set; they are counted as 'other'. The
+Selenium metrics come from the launcher's in-process driver pool; server.py
+runs verification in a subprocess and only reports the per-check metrics.
+
+Recording a sample takes no lock: each metric keeps one shard per thread
+and a thread only ever writes its own shard (single dict/list updates,
+atomic under the GIL). A scrape copies and sums the shards; shards of
+finished threads are folded into one, so short-lived worker threads do not
+accumulate.
+"""
+import bisect
+import threading
+import time
+from urllib.parse import urlsplit
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+FETCH_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30, 60)
+RUN_BUCKETS = (10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+LIFETIME_BUCKETS = (10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400)
+PAGE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500)
+
+
+class _Metric:
+    """Per-thread sharded values: {label values: value}."""
+
+    kind = None
+
+    def __init__(self, name, help, labels=(), registry=None):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards = []  # (thread, values)
+        self._retired = {}
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def _shard(self):
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), values))
+            return values
+
+    def _merge(self, total, values):
+        raise NotImplementedError
+
+    def collect(self):
+        """{label values: value} summed over every thread's shard."""
+        with self._lock:
+            shards = []
+            for thread, values in self._shards:
+                if thread.is_alive():
+                    shards.append((thread, values))
+                else:
+                    self._merge(self._retired, values)
+            self._shards = shards
+            total = {}
+            self._merge(total, self._retired)
+            for _, values in shards:
+                self._merge(total, dict(values))
+        return total
+
+    def _label_text(self, values, extra=()):
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values)] + list(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        values = self._shard()
+        values[labels] = values.get(labels, 0) + amount
+
+    def _merge(self, total, values):
+        for key, value in values.items():
+            total[key] = total.get(key, 0) + value
+
+    def render(self):
+        return [f'{self.name}{self._label_text(key)} {_number(value)}'
+                for key, value in sorted(self.collect().items())]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labels, registry)
+
+    def observe(self, value, *labels):
+        values = self._shard()
+        counts = values.get(labels)
+        if counts is None:
+            # one slot per bucket, one for +Inf, then the sum
+            counts = values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _merge(self, total, values):
+        for key, counts in values.items():
+            merged = total.get(key)
+            if merged is None:
+                total[key] = list(counts)
+            else:
+                for i, count in enumerate(counts):
+                    merged[i] += count
+
+    def render(self):
+        lines = []
+        for key, counts in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="%s"' % ('+Inf' if bound == float('inf') else _number(bound))
+                lines.append(f'{self.name}_bucket{self._label_text(key, [le])} {cumulative}')
+            lines.append(f'{self.name}_sum{self._label_text(key)} {_number(counts[-1])}')
+            lines.append(f'{self.name}_count{self._label_text(key)} {cumulative}')
+        return lines
+
+
+class Gauge:
+    """A value read when scraped (fn() -> number)."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help, fn, registry=None):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        (REGISTRY if registry is None else registry).register(self)
+
+    def render(self):
+        return [f'{self.name} {_number(self.fn())}']
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+REGISTRY = Registry()
+_STARTED = time.time()
+
+START_TIME = Gauge('dqa_start_time_seconds', 'Unix time the server process started', lambda: _STARTED)
+
+HTTP_REQUESTS = Counter('dqa_http_requests_total', 'HTTP requests handled', ('method', 'path', 'status'))
+HTTP_DURATION = Histogram('dqa_http_request_duration_seconds', 'HTTP request latency', ('path',))
+HTTP_BYTES = Counter('dqa_http_response_bytes_total', 'HTTP response body bytes sent', ('path',))
+
+SYNC_REQUESTS = Counter('dqa_sync_requests_total', 'Catalogue syncs by kind and outcome', ('kind', 'outcome'))
+SYNC_BYTES = Histogram('dqa_sync_request_bytes', 'Posted sync payload size', ('kind',), SIZE_BUCKETS)
+SYNC_DURATION = Histogram('dqa_sync_duration_seconds', 'Time to store and export a sync', ('kind',))
+
+VERIFY_RUNS = Counter('dqa_verification_runs_total', 'Verification jobs by outcome', ('outcome',))
+VERIFY_DURATION = Histogram('dqa_verification_run_duration_seconds', 'Verification job duration',
+                            buckets=RUN_BUCKETS)
+SCRAPER_CHECKS = Counter('dqa_scraper_checks_total', 'Checked standards by scraper and status',
+                         ('scraper', 'status'))
+HOST_FETCH = Histogram('dqa_host_fetch_duration_seconds', 'Time to fetch and check one page, by host',
+                       ('host',), FETCH_BUCKETS)
+
+DRIVER_EVENTS = Counter('dqa_selenium_drivers_total', 'Selenium drivers by lifecycle event', ('event',))
+DRIVER_LIFETIME = Histogram('dqa_selenium_driver_lifetime_seconds', 'Age of a Selenium driver when retired',
+                            ('reason',), LIFETIME_BUCKETS)
+DRIVER_PAGES = Histogram('dqa_selenium_driver_pages', 'Pages a Selenium driver served before it was retired',
+                         ('reason',), PAGE_BUCKETS)
+DRIVER_RESOLVE = Histogram('dqa_chromedriver_resolve_seconds', 'Time to resolve the chromedriver, by source',
+                           ('source',))
+
+
+def record_check(result):
+    """Counts one verification result event (scraper / status, and fetch time by host)."""
+    scraper = (result.get('scraper') or 'none').split('@')[0]
+    SCRAPER_CHECKS.inc(scraper, str(result.get('status', 'unknown')).lower())
+    host = urlsplit(result.get('url') or '').netloc.lower()
+    if host and 'elapsed' in result:
+        HOST_FETCH.observe(result['elapsed'], host)
+
+
+def record_driver_retired(created_at, pages, reason):
+    """Lifetime and page count of a driver leaving the pool (crashed / recycled / closed)."""
+    DRIVER_EVENTS.inc(reason)
+    DRIVER_LIFETIME.observe(time.time() - created_at, reason)
+    DRIVER_PAGES.observe(pages, reason)
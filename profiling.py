@@ -0,0 +1,176 @@
+"""
+Per-stage timing of verification checks, and the run profile built from it.
+
+run_verification(profile=True) (verify_standards.py --profile) times every
+check in stages and stores them on the result as 'timings' (milliseconds):
+
+    rate_wait    waiting for the host's rate limiter
+    http         GET over the keep-alive session (connect, TLS, server, download)
+    ttfb         part of http until the response headers arrived
+    driver_get   Selenium driver.get()
+    ready_wait   waiting for the Selenium page to become ready
+    page_source  serializing the rendered DOM
+    extract      a scraper's extraction function (includes parse and regex)
+    parse        building the HTML tree and its text
+    regex        field patterns (extraction.PatternSet)
+    compare      verify_standard_logic
+    total        the whole check
+
+The code under test marks its stages with stage(name). stage() finds the
+check's StageTimes through a ContextVar; outside a profiled check it returns
+a shared no-op context manager, so with profiling off each stage costs one
+ContextVar lookup. build_profile() aggregates the timings of a run into the
+'profile' block written next to 'summary' in verification_results.json.
+
+--cprofile FILE additionally dumps a cProfile of the whole run (see
+run_cprofile) for pstats / snakeviz.
+"""
+import contextvars
+import cProfile
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+# Entries listed in the slowest standards / hosts sections of a profile
+PROFILE_TOP = 10
+
+_current = contextvars.ContextVar('stage_times', default=None)
+_NOOP = nullcontext()
+
+
+class StageTimes:
+    """Accumulated seconds per stage for one check."""
+
+    __slots__ = ('seconds',)
+
+    def __init__(self):
+        self.seconds = {}
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def as_ms(self):
+        return {name: round(value * 1000, 1) for name, value in self.seconds.items()}
+
+
+class _Stage:
+    __slots__ = ('times', 'name', 'start')
+
+    def __init__(self, times, name):
+        self.times = times
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.times.add(self.name, time.perf_counter() - self.start)
+
+
+def stage(name):
+    """Context manager timing a stage of the current check (no-op when not profiling)."""
+    times = _current.get()
+    if times is None:
+        return _NOOP
+    return _Stage(times, name)
+
+
+def add(name, seconds):
+    """Adds a duration measured elsewhere (e.g. response.elapsed) to the current check."""
+    times = _current.get()
+    if times is not None:
+        times.add(name, seconds)
+
+
+@contextmanager
+def standard(enabled=True):
+    """Scope of one check: yields its StageTimes (None when not enabled)."""
+    if not enabled:
+        yield None
+        return
+    times = StageTimes()
+    token = _current.set(times)
+    start = time.perf_counter()
+    try:
+        yield times
+    finally:
+        times.add('total', time.perf_counter() - start)
+        _current.reset(token)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of values (q in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def _distribution(values_ms):
+    return {
+        'count': len(values_ms),
+        'total_s': round(sum(values_ms) / 1000, 2),
+        'mean_ms': round(sum(values_ms) / len(values_ms), 1),
+        'p50_ms': round(percentile(values_ms, 50), 1),
+        'p95_ms': round(percentile(values_ms, 95), 1),
+    }
+
+
+def build_profile(entries, wall_seconds, top=PROFILE_TOP):
+    """
+    Run profile from the result entries checked with profiling on: totals
+    and percentiles per stage and per scraper, plus the slowest standards
+    and hosts by check time.
+    """
+    entries = [e for e in entries if e and 'timings' in e]
+    stages = {}
+    scrapers = {}
+    hosts = {}
+    for entry in entries:
+        elapsed_ms = entry['timings'].get('total', 0.0)
+        for name, ms in entry['timings'].items():
+            stages.setdefault(name, []).append(ms)
+        scraper = scrapers.setdefault(entry.get('scraper', 'unknown'), {'elapsed': [], 'stages': {}})
+        scraper['elapsed'].append(elapsed_ms)
+        for name, ms in entry['timings'].items():
+            scraper['stages'][name] = scraper['stages'].get(name, 0.0) + ms
+        hosts.setdefault(urlsplit(entry.get('url', '')).netloc.lower(), []).append(elapsed_ms)
+
+    slowest = sorted(entries, key=lambda e: e['timings'].get('total', 0.0), reverse=True)[:top]
+    return {
+        'checked': len(entries),
+        'wall_seconds': round(wall_seconds, 2),
+        'stages': {name: _distribution(values) for name, values in
+                   sorted(stages.items(), key=lambda item: -sum(item[1])) if name != 'total'},
+        'scrapers': {name: dict(_distribution(s['elapsed']),
+                                stages_s={k: round(v / 1000, 2) for k, v in s['stages'].items() if k != 'total'})
+                     for name, s in scrapers.items()},
+        'slowest_standards': [{'id': e.get('id'), 'name': e.get('name'), 'scraper': e.get('scraper'),
+                               'elapsed': e.get('elapsed'), 'timings': e['timings']} for e in slowest],
+        'slowest_hosts': sorted(({'host': host, **_distribution(values)} for host, values in hosts.items()),
+                                key=lambda h: h['mean_ms'], reverse=True)[:top],
+    }
+
+
+def format_profile(profile):
+    """One console line per stage: total seconds and p95."""
+    lines = [f"[PROFILE] {profile['checked']} checks in {profile['wall_seconds']}s"]
+    for name, s in profile['stages'].items():
+        lines.append(f"[PROFILE]   {name:<12} total {s['total_s']:>8.2f}s   p95 {s['p95_ms']:>8.1f} ms")
+    return '\n'.join(lines)
+
+
+def run_cprofile(path, func, *args, **kwargs):
+    """
+    Runs func under cProfile, dumps the stats to path and prints the top
+    functions by cumulative time. Only the calling thread is profiled.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(path)
+        print(f"\n[PROFILE] cProfile stats written to {path}")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
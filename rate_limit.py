@@ -0,0 +1,145 @@
+"""
+Per-host politeness: token-bucket rate limiting with adaptive backoff.
+
+Every host (standards body) gets its own TokenBucket. Callers reserve a
+token before each request and sleep for the returned delay, so bursts are
+smoothed to the configured rate while requests to other hosts proceed.
+A 429/503 response (or a Retry-After header) pauses the host and halves its
+rate; successful responses ramp it back up to the configured value.
+"""
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Codes that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+INITIAL_BACKOFF = 2.0
+MAX_BACKOFF = 120.0
+
+
+class TokenBucket:
+    """
+    rate: tokens per second; burst: bucket capacity.
+    The effective rate drops on throttling and recovers on success (AIMD).
+    """
+
+    def __init__(self, rate, burst):
+        self.configured_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now):
+        """Takes one token and returns how long the caller must wait before using it."""
+        self._refill(now)
+        self.tokens -= 1
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(delay, self.blocked_until - now)
+
+    def penalize(self, now, retry_after=None):
+        self.backoff = min(MAX_BACKOFF, max(INITIAL_BACKOFF, self.backoff * 2))
+        pause = max(self.backoff, retry_after or 0)
+        self.blocked_until = max(self.blocked_until, now + pause)
+        self.rate = max(self.configured_rate / 16, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        return pause
+
+    def reward(self):
+        self.backoff = 0.0
+        self.rate = min(self.configured_rate, self.rate + self.configured_rate / 10)
+
+
+class HostRateLimiter:
+    """
+    Thread-safe registry of per-host token buckets.
+
+    limits: {key: (requests_per_second, burst)}; 'default' applies to any
+    key without its own entry.
+    """
+
+    def __init__(self, limits):
+        self.limits = dict(limits)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, burst = self.limits.get(key, self.limits['default'])
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, key):
+        """Reserves a request slot for key; returns the delay in seconds."""
+        with self._lock:
+            return self._bucket(key).reserve(time.monotonic())
+
+    def acquire(self, key):
+        """Blocks until a request to key is allowed."""
+        delay = self.reserve(key)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, key):
+        """Coroutine version of acquire()."""
+        delay = self.reserve(key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, key, retry_after=None):
+        """Backs off key after a throttling response; returns the pause in seconds."""
+        with self._lock:
+            return self._bucket(key).penalize(time.monotonic(), retry_after)
+
+    def reward(self, key):
+        """Records a successful response for key."""
+        with self._lock:
+            self._bucket(key).reward()
+
+    def observe(self, key, response):
+        """
+        Feeds a response into the limiter. Returns the pause applied if the
+        response was a throttle (429/503), else None.
+        """
+        if response.status_code in THROTTLE_STATUSES:
+            return self.penalize(key, parse_retry_after(response.headers.get('Retry-After')))
+        self.reward(key)
+        return None
+
+
+def parse_retry_after(value):
+    """Retry-After header (seconds or HTTP date) -> seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def interleave(items, key):
+    """
+    Reorders items round-robin across key(item) so consecutive requests go
+    to different hosts, e.g. [a1, a2, a3, b1, c1] -> [a1, b1, c1, a2, a3].
+    """
+    queues = {}
+    for item in items:
+        queues.setdefault(key(item), []).append(item)
+    ordered = []
+    lanes = list(queues.values())
+    depth = max((len(lane) for lane in lanes), default=0)
+    for i in range(depth):
+        ordered.extend(lane[i] for lane in lanes if i < len(lane))
+    return ordered
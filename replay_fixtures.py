@@ -0,0 +1,380 @@
+"""
+Record/replay fixture store for the scrapers.
+
+test_all_scrapers.py talks to the live IEC / IEEE / NEMA / BSI sites, so its
+timings change with the network and the sites themselves. This module keeps
+a snapshot of the pages instead:
+
+    record      fetches every catalogue URL once and stores the raw HTML
+                (static sites) or the rendered DOM with scripts removed
+                (Selenium sites), plus the catalogue entries that use them
+    synthesize  writes deterministic stand-in pages for every host group,
+                shaped like the real ones, when no recording is at hand
+    serve       runs the local stand-in server by hand
+
+ReplayServer serves the stored pages on 127.0.0.1. A page is addressed as
+http://127.0.0.1:<port>/<host><path>, so the original host name stays in the
+URL and host_group() still routes it to the right scraper. replaying() starts
+the server and lifts the per-host rate limits for the duration, as nothing
+leaves the machine.
+
+Layout:
+    fixtures/index.json       {url: {"file", "group", "kind", "status", "content_type", "recorded_at"}}
+    fixtures/standards.json   catalogue entries of the recorded standards
+    fixtures/pages/<sha1 of url>.html
+
+Command line:
+    python replay_fixtures.py record [--base-path .] [--group iec ...] [--limit N]
+    python replay_fixtures.py synthesize [--per-group 5]
+    python replay_fixtures.py serve [--port 8765] [--latency-ms 0]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import verify_standards as vs
+from atomic_io import write_atomic, write_json_atomic
+from rate_limit import HostRateLimiter
+
+FIXTURE_DIR_NAME = 'fixtures'
+INDEX_NAME = 'index.json'
+CATALOGUE_NAME = 'standards.json'
+PAGES_DIR_NAME = 'pages'
+
+# Rendered DOMs are replayed without the tags that would make Chrome run the
+# site's scripts again or load assets from the live hosts
+_LIVE_TAGS = re.compile(r'<(script|noscript|iframe)\b.*?</\1\s*>|<(link|img|source)\b[^>]*>',
+                        re.IGNORECASE | re.DOTALL)
+
+# Replays are local, so no host needs protecting from us
+_UNLIMITED = HostRateLimiter({'default': (1e6, 1e6)})
+
+
+def site_key(url):
+    """host + path (+ query) of a URL: how the replay server addresses a page."""
+    parts = urlsplit(url)
+    key = parts.netloc.lower() + (parts.path or '/')
+    return key + '?' + parts.query if parts.query else key
+
+
+def strip_live_tags(html):
+    return _LIVE_TAGS.sub('', html)
+
+
+class FixtureStore:
+    """The recorded pages of one fixture directory."""
+
+    def __init__(self, root):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self.pages_dir = os.path.join(root, PAGES_DIR_NAME)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def urls(self, groups=None):
+        return [url for url, entry in self.index.items() if groups is None or entry['group'] in groups]
+
+    def put(self, url, body, kind, status=200, content_type='text/html; charset=utf-8'):
+        """Stores one page (bytes or str); call save() afterwards to write the index."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html'
+        os.makedirs(self.pages_dir, exist_ok=True)
+        write_atomic(os.path.join(self.pages_dir, name), body, fsync='none')
+        self.index[url] = {
+            'file': name,
+            'group': vs.host_group(url),
+            'kind': kind,
+            'status': status,
+            'content_type': content_type,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def body(self, url):
+        with open(os.path.join(self.pages_dir, self.index[url]['file']), 'rb') as f:
+            return f.read()
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        write_json_atomic(self.index_path, self.index)
+
+    def catalogue(self):
+        """Catalogue entries whose source page is in the store."""
+        try:
+            with open(os.path.join(self.root, CATALOGUE_NAME), 'r', encoding='utf-8') as f:
+                standards = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [std for std in standards if std.get('sourceUrl') in self.index]
+
+    def save_catalogue(self, standards):
+        write_json_atomic(os.path.join(self.root, CATALOGUE_NAME), standards)
+
+    def signature(self):
+        """Hash of every stored page, so benchmark results are only compared on the same pages."""
+        digest = hashlib.sha256()
+        for url in sorted(self.index):
+            digest.update(url.encode('utf-8'))
+            digest.update(self.body(url))
+        return digest.hexdigest()[:16]
+
+
+# ── Recording ─────────────────────────────────────────────────────
+def record(base_path, store, groups=None, limit=None):
+    """
+    Fetches the source page of every checkable standard in the catalogue under
+    base_path and stores it, honouring the usual per-host rate limits.
+    Returns the number of pages recorded.
+    """
+    standards = [std for std in vs.load_standards(base_path) if vs._needs_check(std)]
+    if groups:
+        standards = [std for std in standards if vs.host_group(std['sourceUrl']) in groups]
+    if limit:
+        standards = standards[:limit]
+
+    recorded = []
+    with vs.selenium_driver() as driver:
+        for idx, std in enumerate(standards, start=1):
+            url = std['sourceUrl']
+            group = vs.host_group(url)
+            print(f"[{idx}/{len(standards)}] Recording {std.get('name')}...", end=' ', flush=True)
+            try:
+                if group in vs.SELENIUM_GROUPS:
+                    if driver is None:
+                        print('skipped (no Selenium driver)')
+                        continue
+                    vs._rate_limiter.acquire(group)
+                    driver.get(url)
+                    vs.wait_until_ready(driver, group)
+                    store.put(url, strip_live_tags(driver.page_source), 'rendered')
+                else:
+                    response = vs.requests_with_retry(url)
+                    store.put(url, response.content, 'raw', response.status_code,
+                              response.headers.get('Content-Type', 'text/html'))
+            except Exception as e:
+                print(f'ERROR: {e}')
+                continue
+            recorded.append(std)
+            print(store.index[url]['kind'])
+
+    store.save()
+    recorded_urls = {std['sourceUrl'] for std in recorded}
+    store.save_catalogue([std for std in store.catalogue() if std['sourceUrl'] not in recorded_urls]
+                         + recorded)
+    return len(recorded)
+
+
+# ── Synthetic Pages ───────────────────────────────────────────────
+# URL template per host group; {n} is the page number
+SYNTHETIC_URLS = {
+    'iec': 'https://webstore.iec.ch/en/publication/{n}',
+    'ieee': 'https://standards.ieee.org/ieee/{n}/',
+    'accuristech': 'https://store.accuristech.com/nema/standards/nema-{n}',
+    'bsi': 'https://knowledge.bsigroup.com/products/bs-en-{n}',
+    'generic': 'https://www.example.org/standards/{n}',
+}
+
+
+def _filler(n):
+    """Navigation, a script and a clause table, so pages weigh about what the real ones do."""
+    nav = ''.join(f'<li><a href="/std/{i}">Standard {i}</a></li>' for i in range(300))
+    rows = ''.join(f'<tr><td>Clause {i}</td><td>Requirement {n}.{i} ' + 'lorem ipsum ' * 6 + '</td></tr>'
+                   for i in range(400))
+    return f'<nav><ul>{nav}</ul></nav><table>{rows}</table>'
+
+
+def _synthetic_page(group, n):
+    """(page HTML, catalogue fields it should verify against)."""
+    year = 2010 + n % 15
+    day = f'{year}-03-{1 + n % 28:02d}'
+    published = datetime.strptime(day, '%Y-%m-%d')
+    title = f'Fixture {n}'
+    if group == 'iec':
+        body = (f'<h1>IEC 6{n:04d}:{year}</h1><div>Edition 2.0</div><div>Publication date {day}</div>'
+                f'<div>Stability date {year + 5}</div><div class="price-container"><span class="price">CHF 345.-</span></div>')
+        fields = {'version': 'Edition 2.0', 'effectiveDate': day, 'cost': 'CHF 345.-', 'expiryDate': str(year + 5)}
+    elif group == 'ieee':
+        title = f'IEEE {1600 + n}-{year} - IEEE Standard'
+        body = f'<h1>IEEE {1600 + n}-{year}</h1><p>Edition 2.0</p><p>Published: {published:%d %B %Y}</p>'
+        fields = {'version': '2.0', 'effectiveDate': day}
+    elif group == 'accuristech':
+        body = (f'<h1 class="product-title">NEMA {n} {year} Enclosures</h1>'
+                '<div class="product-price"><span>$ 1,234.00</span></div>')
+        fields = {'version': str(year), 'cost': '$1,234.00'}
+    elif group == 'bsi':
+        body = (f'<h1>BS EN {55000 + n}:{year}</h1><p>Published {published:%d %b %Y}</p>'
+                '<p>Non-Member Total £ 298.00</p>')
+        fields = {'version': str(year), 'effectiveDate': day, 'cost': '£298.00'}
+    else:
+        body = f'<h1>Specification {n}</h1><p>Edition 3.1</p><p>Price: $ 150.00</p>'
+        fields = {'version': 'Ed. 3.1', 'cost': '$150.00'}
+    return f'<html><head><title>{title}</title></head><body>{body}{_filler(n)}</body></html>', fields
+
+
+def synthesize(store, per_group=5):
+    """Writes per_group synthetic pages (and catalogue entries) for every host group."""
+    standards = []
+    for group, template in SYNTHETIC_URLS.items():
+        for n in range(1, per_group + 1):
+            url = template.format(n=n)
+            html, fields = _synthetic_page(group, n)
+            kind = 'rendered' if group in vs.SELENIUM_GROUPS else 'raw'
+            store.put(url, html, kind)
+            store.index[url]['recorded_at'] = 'synthetic'
+            # Every fourth standard is out of date, so the MISMATCH path is exercised too
+            if n % 4 == 0 and 'version' in fields:
+                fields = dict(fields, version='1.0')
+            standards.append(dict({'id': f'fixture-{group}-{n}', 'name': f'Fixture {group} {n}',
+                                   'category': 'Fixture', 'sourceUrl': url}, **fields))
+    store.save()
+    urls = {std['sourceUrl'] for std in standards}
+    store.save_catalogue([std for std in store.catalogue() if std['sourceUrl'] not in urls] + standards)
+    return len(standards)
+
+
+# ── Replay Server ─────────────────────────────────────────────────
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms per page
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        url = server.pages.get(self.path.lstrip('/'))
+        if url is None:
+            self.send_error(404, 'No fixture for this URL')
+            return
+        if server.latency:
+            time.sleep(server.latency)
+        entry = server.store.index[url]
+        body = server.store.body(url)
+        self.send_response(entry['status'])
+        self.send_header('Content-Type', entry['content_type'])
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Serves a FixtureStore on 127.0.0.1. latency (seconds) is added to every
+    response to approximate a real network round trip.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, store, port=0, latency=0.0):
+        super().__init__(('127.0.0.1', port), _ReplayHandler)
+        self.store = store
+        self.latency = latency
+        self.pages = {site_key(url): url for url in store.index}
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def replay_url(self, url):
+        """The local URL serving url's fixture."""
+        return f'{self.base_url}/{site_key(url)}'
+
+    def replay_catalogue(self, standards):
+        """Copies of the catalogue entries pointed at the local server."""
+        return [dict(std, sourceUrl=self.replay_url(std['sourceUrl'])) for std in standards]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+@contextmanager
+def replaying(store, latency=0.0):
+    """
+    Runs a ReplayServer for store and lifts the scrapers' rate limits (and any
+    HTTP proxy for 127.0.0.1) until the block exits. Yields the server.
+    """
+    server = ReplayServer(store, latency=latency).start()
+    limiter = vs._rate_limiter
+    no_proxy = os.environ.get('NO_PROXY')
+    vs._rate_limiter = _UNLIMITED
+    os.environ['NO_PROXY'] = ','.join(filter(None, [no_proxy, '127.0.0.1']))
+    try:
+        yield server
+    finally:
+        vs._rate_limiter = limiter
+        if no_proxy is None:
+            os.environ.pop('NO_PROXY', None)
+        else:
+            os.environ['NO_PROXY'] = no_proxy
+        server.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Record, synthesize or serve scraper replay fixtures')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR_NAME,
+                        help=f'Fixture directory (default: {FIXTURE_DIR_NAME})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    rec = commands.add_parser('record', help='Record the live pages of the catalogue')
+    rec.add_argument('--base-path', default='.', help='Directory containing the catalogue')
+    rec.add_argument('--group', action='append', choices=sorted(vs.GROUP_SCRAPERS),
+                     help='Only record this host group (repeatable)')
+    rec.add_argument('--limit', type=int, help='Record at most N standards')
+    syn = commands.add_parser('synthesize', help='Write synthetic pages for every host group')
+    syn.add_argument('--per-group', type=int, default=5)
+    srv = commands.add_parser('serve', help='Serve the fixtures until Ctrl+C')
+    srv.add_argument('--port', type=int, default=8765)
+    srv.add_argument('--latency-ms', type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    store = FixtureStore(args.fixtures)
+    if args.command == 'record':
+        count = record(args.base_path, store, set(args.group or ()) or None, args.limit)
+        print(f"Recorded {count} pages into {args.fixtures} ({len(store)} in total)")
+    elif args.command == 'synthesize':
+        count = synthesize(store, args.per_group)
+        print(f"Wrote {count} synthetic pages into {args.fixtures}")
+    else:
+        server = ReplayServer(store, args.port, args.latency_ms / 1000)
+        for url in store.urls():
+            print(f"{server.replay_url(url)}  <-  {url}")
+        print(f"Serving {len(store)} fixtures on {server.base_url} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
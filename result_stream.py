@@ -0,0 +1,122 @@
+"""
+Streaming NDJSON log of the results of a verification run in progress.
+
+run_verification appends one JSON line per checked standard to
+verification_results.partial.ndjson as soon as the check finishes, and
+flushes it at least every FLUSH_EVERY records or FLUSH_INTERVAL seconds. If
+the run dies (crash, Ctrl+C, CI timeout), the finished checks survive:
+
+    verify_standards.py --finalize   builds verification_results.json from them
+    verify_standards.py --resume     re-runs, skipping standards with a fresh record
+
+When a run completes normally, the final report is written and the partial
+file is removed.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+PARTIAL_NAME = 'verification_results.partial.ndjson'
+FLUSH_EVERY = 10
+FLUSH_INTERVAL = 2.0
+
+# Records older than this are not reused by --resume
+RESUME_MAX_AGE_HOURS = 24
+
+
+def partial_path(base_path):
+    return os.path.join(base_path, PARTIAL_NAME)
+
+
+class ResultStreamWriter:
+    """Thread-safe NDJSON appender with a periodic flush."""
+
+    def __init__(self, path, append=False, flush_every=FLUSH_EVERY, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        torn = append and _ends_mid_line(path)
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+        if torn:
+            # End the record cut off by the crash, so the next one starts on its own line
+            self._file.write('\n')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._pending += 1
+            now = time.monotonic()
+            if self._pending >= self.flush_every or now - self._last_flush >= self.flush_interval:
+                self._flush(now)
+
+    def _flush(self, now):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = now
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._flush(time.monotonic())
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _ends_mid_line(path):
+    """True if path exists, is not empty and its last line has no newline."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+    except OSError:
+        return False
+
+
+def read_records(path):
+    """{standard id: record} from a partial file ({} if none); a torn last line is ignored."""
+    records = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get('id'):
+                    records[record['id']] = record
+    except OSError:
+        pass
+    return records
+
+
+def fresh_records(records, fingerprints, now=None, max_age_hours=RESUME_MAX_AGE_HOURS):
+    """
+    The records --resume can keep: checked within max_age_hours and made for
+    the standard as it is now (same fingerprint, i.e. not edited since).
+    fingerprints maps standard id -> current fingerprint.
+    """
+    cutoff = (now or datetime.now()) - timedelta(hours=max_age_hours)
+    fresh = {}
+    for std_id, record in records.items():
+        try:
+            checked_at = datetime.fromisoformat(record.get('checked_at', ''))
+        except ValueError:
+            continue
+        if checked_at >= cutoff and record.get('fingerprint') == fingerprints.get(std_id):
+            fresh[std_id] = record
+    return fresh
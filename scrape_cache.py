@@ -0,0 +1,160 @@
+"""
+On-disk caches for the scrapers.
+
+HttpCache keeps, per URL, the response validators (ETag / Last-Modified),
+the raw body and the scraper's last extraction result, so an unchanged page
+can be answered with a conditional request and a 304 instead of a full
+download and parse.
+
+ResultCache is content-addressed: scraper outputs are keyed by
+(scraper name, scraper version, SHA-256 of the normalized body), so a page
+that comes back byte-identical skips parsing even when the site ignores
+conditional requests. Bumping a scraper's version invalidates only that
+scraper's entries.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+from atomic_io import write_atomic
+
+CACHE_DIR_NAME = '.cache'
+RESULT_MAX_AGE_DAYS = 90
+
+_WHITESPACE_RE = re.compile(rb'\s+')
+
+
+def _write_atomic(path, data):
+    """Cache entries can be rebuilt, so they are renamed into place without fsync."""
+    write_atomic(path, data, fsync='none')
+
+
+class HttpCache:
+    """HTTP validator/body/extraction cache keyed by URL."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, url):
+        return os.path.join(self.cache_dir, self._key(url) + '.json')
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, self._key(url) + '.body')
+
+    def get(self, url):
+        """Returns the cached entry for url (without the body), or None."""
+        try:
+            with open(self._meta_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def get_body(self, url):
+        """Returns the cached raw body for url, or None."""
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response, scraper, extraction):
+        """Saves a 200 response's validators, body and extraction result."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        entry = {
+            'url': url,
+            'scraper': scraper,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'extraction': extraction,
+        }
+        _write_atomic(self._body_path(url), response.content)
+        _write_atomic(self._meta_path(url),
+                      json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def update_extraction(self, url, scraper, extraction):
+        """Replaces the stored extraction (e.g. after re-parsing a cached body)."""
+        entry = self.get(url)
+        if entry is None:
+            return
+        entry['scraper'] = scraper
+        entry['extraction'] = extraction
+        _write_atomic(self._meta_path(url),
+                      json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+
+def content_hash(body):
+    """SHA-256 of a page body with whitespace runs collapsed."""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha256(_WHITESPACE_RE.sub(b' ', body).strip()).hexdigest()
+
+
+class ResultCache:
+    """Scraper output cache keyed by (scraper, version, body hash)."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, scraper, version, body_hash):
+        return os.path.join(self.cache_dir, scraper, f"v{version}", body_hash + '.json')
+
+    def get(self, scraper, version, body_hash):
+        """Returns the cached extraction, or None."""
+        path = self._path(scraper, version, body_hash)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path)  # keep recently used entries out of the age-based prune
+            return data
+        except (OSError, ValueError):
+            return None
+
+    def put(self, scraper, version, body_hash, data):
+        """Stores an extraction result."""
+        path = self._path(scraper, version, body_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def prune(self, versions, max_age_days=RESULT_MAX_AGE_DAYS):
+        """
+        Removes entries written by outdated scraper versions
+        (versions: {scraper: current_version}) and entries older than max_age_days.
+        """
+        cutoff = time.time() - max_age_days * 86400
+        for scraper in os.listdir(self.cache_dir):
+            scraper_dir = os.path.join(self.cache_dir, scraper)
+            if not os.path.isdir(scraper_dir):
+                continue
+            for version_dir in os.listdir(scraper_dir):
+                path = os.path.join(scraper_dir, version_dir)
+                if scraper in versions and version_dir != f"v{versions[scraper]}":
+                    shutil.rmtree(path, ignore_errors=True)
+                    continue
+                for name in os.listdir(path):
+                    entry_path = os.path.join(path, name)
+                    try:
+                        if os.path.getmtime(entry_path) < cutoff:
+                            os.remove(entry_path)
+                    except OSError:
+                        pass
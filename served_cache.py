@@ -0,0 +1,198 @@
+"""
+In-memory cache and compression for the files the server hands to the dashboard.
+
+index.html, app.js, style.css, data.js and verification_results.json are
+requested on every page load. ServedFileCache keeps their bytes, compressed
+copies (brotli when the brotli package is installed, and gzip) and a strong
+ETag (SHA-256 of the content) in memory, so repeated requests are answered
+without touching the disk beyond a stat() and unchanged files can be
+answered with 304 Not Modified.
+
+Compressed copies are also kept next to the file (app.js.br, app.js.gz), so
+a restarted server does not recompress unchanged files. A sidecar is reused
+only if it is newer than the file; refresh() rewrites them after the server
+changes a file itself (e.g. data.js on sync).
+
+An entry is dropped when the file's mtime or size changes (e.g. it was
+edited by hand or rewritten by a verify_standards.py subprocess) or when the
+server invalidates it explicitly after writing the file itself.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+from atomic_io import write_atomic
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+# Smaller bodies are not worth a compression round trip
+COMPRESS_MIN_SIZE = 1024
+# Compression runs once per file change, so favour size over speed
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# File extensions served through the cache (text formats that compress well)
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.md')
+
+# Content-Encoding -> sidecar suffix, in server preference order
+ENCODINGS = (('br', '.br'), ('gzip', '.gz')) if brotli is not None else (('gzip', '.gz'),)
+
+
+def _compress(encoding, content):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, GZIP_LEVEL, mtime=0)
+
+
+class ServedFile:
+    """One cached file: raw bytes, compressed copies and their validators."""
+
+    __slots__ = ('path', 'content', 'encoded', 'etag', 'content_type', 'mtime_ns', 'size')
+
+    def __init__(self, path, content, stat):
+        self.path = path
+        self.content = content
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+        self.content_type = _content_type(path)
+        self.encoded = {}  # encoding -> bytes
+        if len(content) >= COMPRESS_MIN_SIZE:
+            for encoding, suffix in ENCODINGS:
+                body = _read_sidecar(path + suffix, self.mtime_ns)
+                if body is None:
+                    body = _compress(encoding, content)
+                    if len(body) >= len(content):
+                        continue
+                    _write_sidecar(path + suffix, body)
+                self.encoded[encoding] = body
+
+    def variant(self, accept_encoding):
+        """
+        Returns (body, content_encoding, etag) for a request's Accept-Encoding.
+        Each encoding gets its own ETag, since it is a different representation.
+        """
+        for encoding, suffix in ENCODINGS:
+            if encoding in self.encoded and _accepts(accept_encoding, encoding):
+                return self.encoded[encoding], encoding, self.etag[:-1] + '-' + suffix[1:] + '"'
+        return self.content, None, self.etag
+
+
+class ServedFileCache:
+    """Thread-safe path -> ServedFile cache validated against the file's stat()."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Returns the ServedFile for path (reading it if needed), or None if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+        try:
+            with open(path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                content = f.read()
+        except OSError:
+            self.invalidate(path)
+            return None
+        entry = ServedFile(path, content, stat)
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def invalidate(self, path=None):
+        """Drops the entry for path (all entries when path is None)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def refresh(self, path):
+        """Call after writing path: drops its entry and sidecars, then recompresses it."""
+        self.invalidate(path)
+        for _, suffix in ENCODINGS:
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+        return self.get(path)
+
+
+def is_compressible(path):
+    return path.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value matches etag (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _read_sidecar(sidecar_path, source_mtime_ns):
+    """Bytes of a precompressed sidecar that is newer than its source, else None."""
+    try:
+        with open(sidecar_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_mtime_ns <= source_mtime_ns:
+                return None
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_sidecar(sidecar_path, body):
+    """Best effort: a read-only directory (e.g. a bundled exe) just keeps the copy in memory."""
+    try:
+        write_atomic(sidecar_path, body, fsync='none')
+    except OSError:
+        pass
+
+
+def _accepts(accept_encoding, coding):
+    """True if the Accept-Encoding header allows coding (q=0 means refused)."""
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        if name.strip().lower() != coding:
+            continue
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _content_type(path):
+    if path.endswith('.js'):
+        return 'application/javascript'
+    if path.endswith('.json'):
+        return 'application/json'
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if content_type.startswith('text/'):
+        content_type += '; charset=utf-8'
+    return content_type
@@ -1,71 +1,44 @@
-import http.server
-import socketserver
 import webbrowser
 import os
 import subprocess
 import json
 
-PORT = 8001
-
-
-class DQAHandler(http.server.SimpleHTTPRequestHandler):
-    def do_POST(self):
-        if self.path == '/api/run-verify':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-
-            try:
-                print("Running verify_standards.py...")
-                print("-" * 50)
-                result = subprocess.run(
-                    ['python', '-u', 'verify_standards.py'],
-                    text=True
-                )
-                print("-" * 50)
-
-                if result.returncode == 0:
-                    response = {'status': 'success', 'message': 'Verification complete'}
-                else:
-                    response = {'status': 'error', 'message': 'Script failed'}
-            except Exception as e:
-                response = {'status': 'error', 'message': str(e)}
-
-            self.wfile.write(json.dumps(response).encode())
-
-        elif self.path == '/api/sync-data':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-
-            try:
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                standards = json.loads(post_data.decode('utf-8'))
+from dqa_server import DQAApp, make_server
 
-                # Write data.js for frontend
-                js_content = "console.log('Data.js loading...');\n"
-                js_content += "window.initialStandards = "
-                js_content += json.dumps(standards, indent=4, ensure_ascii=False)
-                js_content += ";\n"
-
-                with open('data.js', 'w', encoding='utf-8') as f:
-                    f.write(js_content)
-
-                # Also write standards.json for Python scraper (optimized data source)
-                with open('standards.json', 'w', encoding='utf-8') as f:
-                    json.dump(standards, f, indent=2, ensure_ascii=False)
-
-                print(f"[SYNC] Updated data.js + standards.json with {len(standards)} standards")
-                response = {'status': 'success', 'message': f'Synced {len(standards)} standards'}
-            except Exception as e:
-                print(f"[SYNC ERROR] {str(e)}")
-                response = {'status': 'error', 'message': str(e)}
-
-            self.wfile.write(json.dumps(response).encode())
+PORT = 8001
 
-        else:
-            self.send_error(404)
+# Must match verify_standards.PROGRESS_PREFIX (not imported: the scraper runs in a subprocess)
+PROGRESS_PREFIX = '[PROGRESS] '
+
+
+def run_verify_job(emit, workers=1, full=False):
+    """
+    Runs verify_standards.py in a subprocess (called by the job worker).
+    Console output is passed through; --progress lines are re-published as job events.
+    """
+    command = ['python', '-u', 'verify_standards.py', '--workers', str(workers), '--progress']
+    if full:
+        command.append('--full')
+
+    print(f"Running verify_standards.py (workers: {workers}, full: {full})...")
+    print("-" * 50)
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    with subprocess.Popen(command, stdout=subprocess.PIPE, text=True, encoding='utf-8',
+                          errors='replace', env=env) as process:
+        for line in process.stdout:
+            if line.startswith(PROGRESS_PREFIX):
+                try:
+                    message = json.loads(line[len(PROGRESS_PREFIX):])
+                    emit(message['event'], message['data'])
+                    continue
+                except (ValueError, KeyError):
+                    pass
+            print(line, end='')
+    print("-" * 50)
+
+    if process.returncode == 0:
+        return {'status': 'success', 'message': 'Verification complete'}
+    return {'status': 'error', 'message': 'Script failed'}
 
 
 print(f"Starting DQA Server at http://localhost:{PORT}")
@@ -78,91 +51,12 @@ print("Press Ctrl+C to stop.")
 # Auto-open browser
 webbrowser.open(f"http://localhost:{PORT}")
 
-with socketserver.TCPServer(("", PORT), DQAHandler) as httpd:
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\nServer stopped.")import http.server
-import socketserver
-import webbrowser
-import os
-import subprocess
-import json
-
-PORT = 8001
-
-class DQAHandler(http.server.SimpleHTTPRequestHandler):
-    def do_POST(self):
-        if self.path == '/api/run-verify':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            try:
-                # Run the verification script with real-time output to console
-                print("Running verify_standards.py...")
-                print("-" * 50)
-                # Don't capture output - let it flow to the console directly
-                result = subprocess.run(
-                    ['python', '-u', 'verify_standards.py'],  # -u for unbuffered output
-                    text=True
-                )
-                print("-" * 50)
-                
-                if result.returncode == 0:
-                    response = {'status': 'success', 'message': 'Verification complete'}
-                else:
-                    response = {'status': 'error', 'message': 'Script failed'}
-                    
-            except Exception as e:
-                response = {'status': 'error', 'message': str(e)}
-                
-            self.wfile.write(json.dumps(response).encode())
-            
-        elif self.path == '/api/sync-data':
-            # Sync updated standards from localStorage back to data.js
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            try:
-                # Read request body
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                standards = json.loads(post_data.decode('utf-8'))
-                
-                # Format as data.js file content
-                js_content = "console.log('Data.js loading...');\n"
-                js_content += "window.initialStandards = "
-                js_content += json.dumps(standards, indent=4, ensure_ascii=False)
-                js_content += ";\n"
-                
-                # Write to data.js
-                with open('data.js', 'w', encoding='utf-8') as f:
-                    f.write(js_content)
-                
-                print(f"[SYNC] Updated data.js with {len(standards)} standards")
-                response = {'status': 'success', 'message': f'Synced {len(standards)} standards to data.js'}
-                
-            except Exception as e:
-                print(f"[SYNC ERROR] {str(e)}")
-                response = {'status': 'error', 'message': str(e)}
-                
-            self.wfile.write(json.dumps(response).encode())
-        else:
-            self.send_error(404)
-
-print(f"Starting DQA Server at http://localhost:{PORT}")
-print("--------------------------------------------------")
-print("  Server is RUNNING. Please KEEP THIS WINDOW OPEN.")
-print("  You can minimize this window, but do not close it.")
-print("--------------------------------------------------")
-print("Press Ctrl+C to stop.")
-
-# Auto-open browser
-webbrowser.open(f'http://localhost:{PORT}')
+# Routes (/api/run-verify, /api/jobs, /api/sync-data, static files) live in dqa_server;
+# verification jobs run verify_standards.py in a subprocess
+app = DQAApp(static_dir=os.getcwd(), data_dir=os.getcwd(), verify_job=run_verify_job,
+             debug=os.environ.get('DQA_DEBUG') == '1')
 
-with socketserver.TCPServer(("", PORT), DQAHandler) as httpd:
+with make_server(PORT, app) as httpd:
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
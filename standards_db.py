@@ -0,0 +1,400 @@
+"""
+Embedded SQLite store for the standards catalogue and verification runs.
+
+standards.db (next to data.js) is the system of record for the server and
+the scraper:
+
+    standards  one row per standard, in catalogue order (position), with the
+               full record as JSON plus indexed columns for lookups: id
+               (primary key), category, source_host (sourceUrl host) and
+               expiry_year
+    runs       one row per verification run (timestamp, mode, summary)
+    results    one row per standard per run
+    meta       catalogue revision, the revision last exported and the mtimes
+               of the exported files
+
+data.js (loaded by the browser) and standards.json (read by the GitHub
+workflow and older tools) are exports of the standards table. When either
+file changes behind the database's back (hand edit, git pull, a fresh
+checkout with no database yet), sync_from_files() imports the newer one.
+Importing does not write the files: reads (the scraper, CI) leave the
+working tree alone, and the server re-exports when the revision it last
+exported is behind (needs_export).
+
+Edits are row-level: upsert/delete/reorder touch only the affected rows
+(plus a position shift), in one transaction. BEGIN IMMEDIATE makes
+concurrent writers in other threads or processes wait, which
+busy_timeout allows for.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+DB_NAME = 'standards.db'
+BUSY_TIMEOUT_MS = 10000
+
+_STANDARDS_RE = re.compile(r'window\.initialStandards\s*=\s*(\[.*\])\s*;', re.DOTALL)
+_REVISION_RE = re.compile(r'window\.standardsRevision\s*=\s*(\d+)\s*;')
+_YEAR_RE = re.compile(r'(?:19|20)\d{2}')
+
+# Schema migrations, applied in order; PRAGMA user_version records how many ran
+MIGRATIONS = [
+    """
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE standards (
+        id TEXT PRIMARY KEY,
+        position INTEGER NOT NULL,
+        name TEXT,
+        category TEXT,
+        source_host TEXT,
+        expiry_year INTEGER,
+        doc TEXT NOT NULL
+    );
+    CREATE INDEX standards_position ON standards(position);
+    CREATE INDEX standards_category ON standards(category);
+    CREATE INDEX standards_source_host ON standards(source_host);
+    CREATE INDEX standards_expiry_year ON standards(expiry_year);
+    CREATE TABLE runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        mode TEXT,
+        total INTEGER,
+        checked INTEGER,
+        summary TEXT
+    );
+    CREATE TABLE results (
+        run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+        standard_id TEXT NOT NULL,
+        status TEXT,
+        doc TEXT NOT NULL,
+        PRIMARY KEY (run_id, standard_id)
+    );
+    CREATE INDEX results_standard ON results(standard_id, run_id);
+    """,
+    # Verification history (verification_history): results become an append-only
+    # log of live checks with their timing, scraper and whether anything changed
+    """
+    ALTER TABLE results ADD COLUMN checked_at TEXT;
+    ALTER TABLE results ADD COLUMN scraper TEXT;
+    ALTER TABLE results ADD COLUMN elapsed REAL;
+    ALTER TABLE results ADD COLUMN changed INTEGER NOT NULL DEFAULT 0;
+    CREATE INDEX results_standard_checked ON results(standard_id, checked_at);
+    CREATE INDEX results_changed ON results(checked_at) WHERE changed = 1;
+    """,
+]
+
+
+class PatchError(ValueError):
+    """A catalogue edit is malformed or refers to an unknown standard."""
+
+
+def render_data_js(standards, revision):
+    """The data.js file loaded by index.html."""
+    js_content = "console.log('Data.js loading...');\n"
+    js_content += "window.initialStandards = "
+    js_content += json.dumps(standards, indent=4, ensure_ascii=False)
+    js_content += ";\n"
+    js_content += f"window.standardsRevision = {revision};\n"
+    return js_content
+
+
+def read_standards_file(path):
+    """
+    (standards, revision) from standards.json or data.js; revision is the
+    window.standardsRevision in data.js (0 if absent). Raises ValueError if the
+    file holds no standards list.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    revision = 0
+    if path.endswith('.js'):
+        match = _REVISION_RE.search(content)
+        revision = int(match.group(1)) if match else 0
+        match = _STANDARDS_RE.search(content)
+        if not match:
+            raise ValueError(f'No window.initialStandards array in {path}')
+        content = match.group(1)
+    standards = json.loads(content)
+    if not isinstance(standards, list):
+        raise ValueError(f'{path} does not hold a list of standards')
+    return standards, revision
+
+
+def _row_values(standard, position):
+    """Indexed column values for one standard record."""
+    url = standard.get('sourceUrl') or ''
+    year = _YEAR_RE.search(str(standard.get('expiryDate') or ''))
+    return (standard['id'], position, standard.get('name'), standard.get('category'),
+            urlsplit(url).netloc.lower() or None, int(year.group()) if year else None,
+            json.dumps(standard, ensure_ascii=False))
+
+
+class StandardsDB:
+    """One SQLite connection, shared by the threads of a process behind a lock."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000,
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._migrate()
+
+    @classmethod
+    def open_in(cls, data_dir):
+        return cls(os.path.join(data_dir, DB_NAME))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _migrate(self):
+        with self.transaction() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                for statement in script.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {number}')
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction (BEGIN IMMEDIATE): one writer at a time across processes."""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def query(self, sql, params=()):
+        """Rows of a read query (list of tuples)."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ── Meta ─────────────────────────────────────────────────────
+    def get_meta(self, key, default=None):
+        rows = self.query('SELECT value FROM meta WHERE key = ?', (key,))
+        return rows[0][0] if rows else default
+
+    @property
+    def revision(self):
+        return int(self.get_meta('revision', 0))
+
+    def bump_revision(self, at_least=0):
+        """Increments the catalogue revision (call inside a transaction) and returns it."""
+        revision = max(self.revision + 1, at_least)
+        self._set_meta('revision', revision)
+        return revision
+
+    @property
+    def needs_export(self):
+        """True when data.js / standards.json were last written at an older revision."""
+        revision = self.revision
+        return revision > 0 and self.get_meta('exported_revision') != str(revision)
+
+    def _set_meta(self, key, value):
+        self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    # ── Standards: reads ─────────────────────────────────────────
+    def all(self):
+        """Every standard, in catalogue order."""
+        return [json.loads(doc) for (doc,) in self.query('SELECT doc FROM standards ORDER BY position')]
+
+    def count(self):
+        return self.query('SELECT COUNT(*) FROM standards')[0][0]
+
+    def get(self, std_id):
+        rows = self.query('SELECT doc FROM standards WHERE id = ?', (std_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def by_category(self, category):
+        return self._select('category = ?', (category,))
+
+    def by_host(self, host):
+        """Standards whose sourceUrl is on host (e.g. 'webstore.iec.ch')."""
+        return self._select('source_host = ?', (host.lower(),))
+
+    def expiring_between(self, first_year, last_year):
+        """Standards whose expiryDate falls in [first_year, last_year]."""
+        return self._select('expiry_year BETWEEN ? AND ?', (first_year, last_year))
+
+    def _select(self, where, params):
+        rows = self.query(f'SELECT doc FROM standards WHERE {where} ORDER BY position', params)
+        return [json.loads(doc) for (doc,) in rows]
+
+    # ── Standards: writes (call inside transaction()) ────────────
+    def replace_all(self, standards):
+        """Replaces the whole catalogue."""
+        if not isinstance(standards, list):
+            raise PatchError('standards must be a list')
+        rows = []
+        for position, standard in enumerate(standards):
+            if not isinstance(standard, dict) or not standard.get('id'):
+                raise PatchError(f'Standard #{position} has no id')
+            rows.append(_row_values(standard, position))
+        self._conn.execute('DELETE FROM standards')
+        self._conn.executemany('INSERT OR REPLACE INTO standards VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def apply_ops(self, ops):
+        """
+        Applies a delta-sync operation list:
+            {"op": "upsert", "standard": {...}, "index": n}  replace by id, or insert at index
+            {"op": "delete", "id": ...}
+            {"op": "reorder", "ids": [...]}  the listed standards swap into each other's slots
+        """
+        if not isinstance(ops, list):
+            raise PatchError('ops must be a list')
+        for op in ops:
+            kind = op.get('op') if isinstance(op, dict) else None
+            if kind == 'upsert':
+                self._upsert(op.get('standard'), op.get('index'))
+            elif kind == 'delete':
+                self._delete(op.get('id'))
+            elif kind == 'reorder':
+                self._reorder(op.get('ids'))
+            else:
+                raise PatchError(f'Unknown op: {kind!r}')
+
+    def _position_of(self, std_id):
+        row = self._conn.execute('SELECT position FROM standards WHERE id = ?', (std_id,)).fetchone()
+        return row[0] if row else None
+
+    def _upsert(self, standard, index):
+        if not isinstance(standard, dict) or not standard.get('id'):
+            raise PatchError('upsert needs a standard with an id')
+        position = self._position_of(standard['id'])
+        if position is None:
+            count = self._conn.execute('SELECT COUNT(*) FROM standards').fetchone()[0]
+            if index is None:
+                index = count
+            if not isinstance(index, int):
+                raise PatchError('upsert index must be an integer')
+            position = max(0, min(index, count))
+            self._conn.execute('UPDATE standards SET position = position + 1 WHERE position >= ?', (position,))
+        self._conn.execute('INSERT OR REPLACE INTO standards VALUES (?, ?, ?, ?, ?, ?, ?)',
+                           _row_values(standard, position))
+
+    def _delete(self, std_id):
+        position = self._position_of(std_id)
+        if position is None:
+            raise PatchError(f'delete: unknown id {std_id!r}')
+        self._conn.execute('DELETE FROM standards WHERE id = ?', (std_id,))
+        self._conn.execute('UPDATE standards SET position = position - 1 WHERE position > ?', (position,))
+
+    def _reorder(self, ids):
+        if not isinstance(ids, list) or len(set(ids)) != len(ids):
+            raise PatchError('reorder needs a list of distinct ids')
+        positions = [self._position_of(std_id) for std_id in ids]
+        if None in positions:
+            raise PatchError('reorder: unknown id')
+        for slot, std_id in zip(sorted(positions), ids):
+            self._conn.execute('UPDATE standards SET position = ? WHERE id = ?', (slot, std_id))
+
+    # ── Import / export ──────────────────────────────────────────
+    def export_files(self, data_dir, write):
+        """
+        Writes data.js and standards.json from the table with write(path, text)
+        (call inside a transaction) and records their mtimes and the revision.
+        """
+        standards = self.all()
+        revision = self.revision
+        for name, text in (('data.js', render_data_js(standards, revision)),
+                           ('standards.json', json.dumps(standards, indent=2, ensure_ascii=False))):
+            path = os.path.join(data_dir, name)
+            write(path, text)
+            self._set_meta(f'mtime:{name}', os.stat(path).st_mtime_ns)
+        self._set_meta('exported_revision', revision)
+
+    def changed_files(self, data_dir):
+        """data.js / standards.json paths modified since the last import or export, newest first."""
+        changed = []
+        for name in ('standards.json', 'data.js'):
+            path = os.path.join(data_dir, name)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            if str(mtime) != self.get_meta(f'mtime:{name}'):
+                changed.append((mtime, path))
+        return [path for _, path in sorted(changed, key=lambda item: item[0], reverse=True)]
+
+    def sync_from_files(self, data_dir):
+        """
+        Imports the newest of data.js / standards.json if one changed outside the
+        database. Returns the imported path, or None when nothing (valid) changed.
+        A file that only got a new mtime (checkout, copy) but holds the current
+        catalogue is recorded without touching the revision. After an import,
+        data.js is stale until the next export_files (see needs_export).
+        """
+        if not self.changed_files(data_dir):
+            return None
+        with self.transaction():
+            # Re-check under the write lock; skip files that do not parse
+            for imported in self.changed_files(data_dir):
+                try:
+                    standards, file_revision = read_standards_file(imported)
+                    break
+                except (OSError, ValueError) as e:
+                    print(f"[DB] Cannot import {os.path.basename(imported)}: {e}")
+            else:
+                return None
+            self._set_meta(f'mtime:{os.path.basename(imported)}', os.stat(imported).st_mtime_ns)
+            if standards == self.all():
+                return None
+            self.replace_all(standards)
+            # A browser that loaded this data.js can keep patching against its revision
+            self.bump_revision(at_least=file_revision)
+        print(f"[DB] Imported {len(standards)} standards from {os.path.basename(imported)}")
+        return imported
+
+    # ── Verification runs ────────────────────────────────────────
+    def record_run(self, report, checked_ids=None):
+        """
+        Stores a run_verification report (the verification_results.json dict) and
+        returns the run id. Only entries live-checked in this run (checked_ids;
+        all when None) are appended to results: carried-over entries are already
+        there from the run that checked them. Each row is flagged changed when
+        its status, issues or extracted fields differ from the standard's
+        previous check.
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                'INSERT INTO runs (timestamp, mode, total, checked, summary) VALUES (?, ?, ?, ?, ?)',
+                (report.get('timestamp'), report.get('mode'), report.get('total'), report.get('checked'),
+                 json.dumps(report.get('summary', {}), ensure_ascii=False)))
+            run_id = cursor.lastrowid
+            rows = []
+            for entry in report.get('results', []):
+                std_id = entry.get('id')
+                if not std_id or (checked_ids is not None and std_id not in checked_ids):
+                    continue
+                previous = conn.execute(
+                    'SELECT doc FROM results WHERE standard_id = ? ORDER BY checked_at DESC, run_id DESC LIMIT 1',
+                    (std_id,)).fetchone()
+                changed = previous is not None and _observation(json.loads(previous[0])) != _observation(entry)
+                rows.append((run_id, std_id, entry.get('status'), json.dumps(entry, ensure_ascii=False),
+                             entry.get('checked_at') or report.get('timestamp'), entry.get('scraper'),
+                             entry.get('elapsed'), int(changed)))
+            conn.executemany(
+                'INSERT OR REPLACE INTO results (run_id, standard_id, status, doc, checked_at, scraper, elapsed, changed) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return run_id
+
+
+def _observation(entry):
+    """The parts of a result that count as a change when they differ between checks."""
+    return entry.get('status'), entry.get('issues') or [], entry.get('live') or {}
@@ -0,0 +1,112 @@
+"""
+Revisioned catalogue behind /api/sync-data.
+
+The frontend used to POST the whole catalogue after every add, edit, delete
+or reorder. StandardsStore tracks a revision number for the catalogue, so an
+edit can instead be sent as a short operation list against the revision the
+browser last saw:
+
+    {"base_revision": 12, "ops": [
+        {"op": "upsert", "standard": {...}, "index": 0},   # insert/replace by id
+        {"op": "delete", "id": "std-123"},
+        {"op": "reorder", "ids": ["std-2", "std-1"]}       # listed ids swap places
+    ]}
+
+A patch against any other revision is rejected with RevisionConflict (HTTP
+409) and the browser falls back to a full sync. Every accepted change bumps
+the revision, which is written into data.js as window.standardsRevision.
+
+The catalogue lives in standards.db (standards_db): a patch updates only the
+affected rows, then data.js (for the browser) and standards.json (for the
+GitHub workflow) are re-exported atomically (atomic_io). Hand edits of either
+file are imported before each change. Each change holds a file lock from
+reading the current revision to writing the exports, so concurrent syncs
+(other threads or another server process) never interleave.
+"""
+import os
+import threading
+
+from atomic_io import file_lock, write_atomic
+from standards_db import StandardsDB
+
+
+class RevisionConflict(Exception):
+    """A patch was based on a revision other than the current one."""
+
+    def __init__(self, base_revision, revision):
+        super().__init__(f'Stale base revision {base_revision} (current: {revision})')
+        self.base_revision = base_revision
+        self.revision = revision
+
+
+class StandardsStore:
+    """The catalogue and its revision, kept in standards.db with data.js + standards.json exports."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.lock_path = os.path.join(data_dir, '.standards.lock')
+        self._db = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        """The StandardsDB, opened on first use."""
+        if self._db is None:
+            self._db = StandardsDB.open_in(self.data_dir)
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def standards(self):
+        """
+        The catalogue, after importing hand edits of data.js / standards.json.
+        A read: the files are not rewritten.
+        """
+        with self._lock, file_lock(self.lock_path):
+            self._import_changed_files(export=False)
+            return self.db.all()
+
+    def refresh_exports(self):
+        """Imports hand edits and brings data.js / standards.json up to date. Returns the revision."""
+        with self._lock, file_lock(self.lock_path):
+            self._import_changed_files()
+            return self.db.revision
+
+    @property
+    def revision(self):
+        return self.refresh_exports()
+
+    def replace(self, standards):
+        """Full sync: stores standards as the new catalogue. Returns the new revision."""
+        with self._lock, file_lock(self.lock_path):
+            self._import_changed_files()
+            with self.db.transaction():
+                self.db.replace_all(standards)
+                revision = self.db.bump_revision()
+                self.db.export_files(self.data_dir, write_atomic)
+            return revision
+
+    def apply(self, ops, base_revision):
+        """Applies a patch made against base_revision. Returns (new revision, standard count)."""
+        with self._lock, file_lock(self.lock_path):
+            self._import_changed_files()
+            with self.db.transaction():
+                if base_revision != self.db.revision:
+                    raise RevisionConflict(base_revision, self.db.revision)
+                self.db.apply_ops(ops)
+                revision = self.db.bump_revision()
+                self.db.export_files(self.data_dir, write_atomic)
+            return revision, self.db.count()
+
+    def _import_changed_files(self, export=True):
+        """
+        Picks up hand edits of data.js / standards.json; with export, re-exports
+        both if they are behind the database (an edit imported by a read).
+        """
+        self.db.sync_from_files(self.data_dir)
+        if export and self.db.needs_export:
+            with self.db.transaction():
+                self.db.export_files(self.data_dir, write_atomic)
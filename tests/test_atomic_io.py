@@ -0,0 +1,29 @@
+import os
+import stat
+
+import pytest
+
+import atomic_io
+from atomic_io import write_atomic, write_json_atomic
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='POSIX file modes')
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_file_follows_umask(tmp_path):
+    path = tmp_path / 'data.js'
+    write_atomic(str(path), 'x')
+    assert path.read_text() == 'x'
+    assert mode(path) == 0o666 & ~atomic_io._UMASK
+
+
+def test_replacing_keeps_the_target_mode(tmp_path):
+    path = tmp_path / 'standards.json'
+    path.write_text('[]')
+    os.chmod(path, 0o640)
+    write_json_atomic(str(path), [{'id': 'a'}])
+    assert mode(path) == 0o640
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
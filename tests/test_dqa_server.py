@@ -0,0 +1,104 @@
+import http.client
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import dqa_server
+import metrics
+from dqa_server import DQAApp, make_server
+
+REPO = os.path.dirname(os.path.abspath(dqa_server.__file__))
+
+
+def start(tmp_path, verify_job):
+    app = DQAApp(static_dir=str(tmp_path), data_dir=str(tmp_path), verify_job=verify_job)
+    httpd = make_server(0, app)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, httpd.server_address[1]
+
+
+def post_verify(port):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.request('POST', '/api/run-verify', body=b'{}', headers={'Content-Type': 'application/json'})
+    job_id = json.loads(conn.getresponse().read())['job_id']
+    conn.close()
+    return job_id
+
+
+def test_server_close_ends_open_event_streams(tmp_path):
+    release = threading.Event()
+
+    def verify_job(emit, **options):
+        emit('result', {'id': 'a'})
+        release.wait(30)
+        return {'status': 'success'}
+
+    httpd, port = start(tmp_path, verify_job)
+    try:
+        job_id = post_verify(port)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        conn.request('GET', f'/api/jobs/{job_id}/events')
+        response = conn.getresponse()
+        assert response.status == 200
+        assert b'event: result' in response.readline() + response.readline()
+
+        started = time.monotonic()
+        httpd.shutdown()
+        httpd.server_close()
+        response.read()  # returns once the stream is closed
+        assert time.monotonic() - started < 5
+        assert all(worker.daemon for worker in httpd._workers)
+    finally:
+        release.set()
+
+
+def test_process_exits_with_a_stream_open(tmp_path):
+    script = textwrap.dedent(f"""
+        import http.client, json, sys, threading
+        sys.path.insert(0, {REPO!r})
+        from dqa_server import DQAApp, make_server
+
+        app = DQAApp({str(tmp_path)!r}, {str(tmp_path)!r}, lambda emit, **o: threading.Event().wait())
+        httpd = make_server(0, app)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        port = httpd.server_address[1]
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.request('POST', '/api/run-verify', body=b'{{}}')
+        job_id = json.loads(conn.getresponse().read())['job_id']
+        stream = http.client.HTTPConnection('127.0.0.1', port)
+        stream.request('GET', '/api/jobs/%s/events' % job_id)
+        stream.getresponse()
+        httpd.shutdown()
+        httpd.server_close()
+    """)
+    subprocess.run([sys.executable, '-c', script], timeout=20, check=True)
+
+
+def test_metrics_label_resolved_file_names(tmp_path):
+    (tmp_path / 'index.html').write_text('<html></html>')
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG')
+    httpd, port = start(tmp_path, lambda emit, **options: None)
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        for path in ('/index.html', '/x/../index.html', '/index.html?v=1', '/index.html?v=2', '/',
+                     '/logo.png?v=3', '/nope-1', '/nope-2?x', '/api/jobs/abc'):
+            conn.request('GET', path)
+            conn.getresponse().read()
+        conn.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    expected = {'/index.html', '/logo.png', 'other', '/api/jobs/{id}'}
+    # A request is counted just after its response went out
+    deadline = time.monotonic() + 5
+    while True:
+        labels = {key[1] for key in metrics.HTTP_REQUESTS.collect()}
+        if expected <= labels or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    assert expected <= labels
+    assert not [label for label in labels if '?' in label or '..' in label or 'nope' in label]
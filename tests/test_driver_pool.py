@@ -0,0 +1,93 @@
+import threading
+import time
+
+import driver_pool
+from driver_pool import MAX_START_FAILURES, DriverPool
+
+
+class FakeDriver:
+    window_handles = ['main']
+
+    def __init__(self):
+        self.quit = False
+
+
+class Factory:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.fail = False
+        self.started = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('no Chrome')
+        driver = FakeDriver()
+        with self.lock:
+            self.started.append(driver)
+        return driver
+
+
+def quit_driver(driver):
+    driver.quit = True
+
+
+def pool_for(factory, size=2):
+    return DriverPool(factory, quit_driver, size=size, max_memory_mb=0)
+
+
+def test_warm_starts_drivers_in_parallel_and_leases_reuse_them():
+    factory = Factory(delay=0.2)
+    pool = pool_for(factory, size=3)
+    started = time.monotonic()
+    assert pool.warm() == 3
+    assert time.monotonic() - started < 0.5
+    assert pool.warm() == 0
+    with pool.lease() as first, pool.lease() as second:
+        assert {first, second} <= set(factory.started)
+    assert len(factory.started) == 3
+    pool.close()
+    assert all(driver.quit for driver in factory.started)
+
+
+def test_warm_is_capped_by_size():
+    factory = Factory()
+    pool = pool_for(factory, size=1)
+    assert pool.warm(4) == 1
+    pool.resize(2)
+    assert pool.warm(2) == 1
+    pool.close()
+
+
+def test_drivers_started_after_close_are_quit():
+    factory = Factory(delay=0.2)
+    pool = pool_for(factory, size=1)
+    warming = threading.Thread(target=pool.warm)
+    warming.start()
+    time.sleep(0.05)
+    pool.close()
+    warming.join()
+    assert [driver.quit for driver in factory.started] == [True]
+
+
+def test_unavailable_pool_retries_after_cool_down(monkeypatch):
+    factory = Factory()
+    factory.fail = True
+    pool = pool_for(factory)
+    for _ in range(MAX_START_FAILURES):
+        with pool.lease() as driver:
+            assert driver is None
+    assert not pool.available
+    with pool.lease() as driver:
+        assert driver is None
+    assert pool.stats['start_failed'] == MAX_START_FAILURES
+
+    # Chrome got installed; once the cool-down passed the pool tries again
+    factory.fail = False
+    monkeypatch.setattr(pool, '_last_failure', time.monotonic() - driver_pool.START_RETRY_SECONDS)
+    assert pool.available
+    with pool.lease() as driver:
+        assert driver is not None
+    assert pool._start_failures == 0
+    pool.close()
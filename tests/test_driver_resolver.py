@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+import driver_resolver
+
+
+@pytest.fixture
+def resolver(tmp_path, monkeypatch):
+    """driver_resolver with a scratch cache, a stub download and a settable Chrome version."""
+    monkeypatch.setenv('DQA_DRIVER_CACHE', str(tmp_path / 'chromedriver.json'))
+    monkeypatch.delenv('DQA_CHROMEDRIVER', raising=False)
+    monkeypatch.delenv('DQA_DRIVER_CHECK_HOURS', raising=False)
+    monkeypatch.setattr(driver_resolver, '_resolved', None)
+    monkeypatch.setattr(driver_resolver, '_resolved_at', 0.0)
+    driver = tmp_path / 'chromedriver'
+    driver.write_text('')
+    state = {'chrome': '131.0.6778.85', 'downloads': 0, 'version_checks': 0}
+
+    def download():
+        state['downloads'] += 1
+        return str(driver)
+
+    def chrome_version():
+        state['version_checks'] += 1
+        return state['chrome']
+
+    monkeypatch.setattr(driver_resolver, 'RESOLVERS', (('webdriver_manager', download),))
+    monkeypatch.setattr(driver_resolver, 'chrome_version', chrome_version)
+    return state
+
+
+def expire_cache():
+    cached = driver_resolver.load_cache()
+    cached['checked_at'] -= driver_resolver.check_interval() + 1
+    driver_resolver.save_cache(driver_resolver.Resolution(
+        cached['driver_path'], cached['chrome_version'], cached['source']), cached['checked_at'])
+
+
+def test_warm_start_uses_the_cache_without_checks(resolver):
+    assert driver_resolver.resolve().source == 'webdriver_manager'
+    driver_resolver._resolved = None  # a new process
+    warm = driver_resolver.resolve()
+    assert warm.source == 'cache'
+    assert warm.chrome_version == '131.0.6778.85'
+    assert resolver['downloads'] == 1
+    assert resolver['version_checks'] == 1
+
+
+def test_expired_cache_keeps_a_driver_for_the_same_major_version(resolver):
+    driver_resolver.resolve()
+    expire_cache()
+    driver_resolver._resolved = None
+    resolver['chrome'] = '131.0.6778.200'
+    assert driver_resolver.resolve().source == 'cache'
+    assert resolver['downloads'] == 1
+    assert time.time() - driver_resolver.load_cache()['checked_at'] < 60
+
+
+def test_chrome_update_resolves_a_new_driver(resolver):
+    driver_resolver.resolve()
+    expire_cache()
+    driver_resolver._resolved = None
+    resolver['chrome'] = '132.0.6834.57'
+    resolution = driver_resolver.resolve()
+    assert resolution.source == 'webdriver_manager'
+    assert resolution.chrome_version == '132.0.6834.57'
+    assert resolver['downloads'] == 2
+
+
+def test_long_running_process_rechecks_after_the_interval(resolver):
+    first = driver_resolver.resolve()
+    assert driver_resolver.resolve() is first
+    assert resolver['version_checks'] == 1
+
+    # Chrome updates itself while the launcher keeps running
+    resolver['chrome'] = '132.0.6834.57'
+    expire_cache()
+    driver_resolver._resolved_at -= driver_resolver.check_interval() + 1
+    again = driver_resolver.resolve()
+    assert again is not first
+    assert again.chrome_version == '132.0.6834.57'
+    assert resolver['downloads'] == 2
+
+
+def test_pinned_driver_skips_resolution(resolver, tmp_path, monkeypatch):
+    pinned = tmp_path / 'pinned-chromedriver'
+    pinned.write_text('')
+    monkeypatch.setenv('DQA_CHROMEDRIVER', str(pinned))
+    resolution = driver_resolver.resolve()
+    assert (resolution.path, resolution.source) == (str(pinned), 'DQA_CHROMEDRIVER')
+    assert resolver['downloads'] == resolver['version_checks'] == 0
@@ -0,0 +1,91 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+import rate_limit
+from rate_limit import HostRateLimiter, TokenBucket, interleave, parse_retry_after
+
+
+class Response:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': retry_after} if retry_after is not None else {}
+
+
+def test_burst_then_rate():
+    bucket = TokenBucket(rate=2, burst=3)
+    now = bucket.updated
+    assert [bucket.reserve(now) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Bucket empty: each further request waits another 1/rate seconds
+    assert bucket.reserve(now) == pytest.approx(0.5)
+    assert bucket.reserve(now) == pytest.approx(1.0)
+
+
+def test_refill_is_capped_at_burst():
+    bucket = TokenBucket(rate=2, burst=3)
+    now = bucket.updated
+    for _ in range(3):
+        bucket.reserve(now)
+    assert bucket.reserve(now + 0.5) == 0.0
+    bucket._refill(now + 100)
+    assert bucket.tokens == 3.0
+
+
+def test_throttle_halves_rate_and_pauses():
+    bucket = TokenBucket(rate=4, burst=4)
+    now = bucket.updated
+    assert bucket.penalize(now) == rate_limit.INITIAL_BACKOFF
+    assert bucket.rate == 2.0
+    assert bucket.reserve(now) == pytest.approx(rate_limit.INITIAL_BACKOFF)
+    # Backoff doubles on repeated throttling; the rate bottoms out at 1/16
+    assert bucket.penalize(now) == 2 * rate_limit.INITIAL_BACKOFF
+    for _ in range(10):
+        bucket.penalize(now)
+    assert bucket.rate == 4 / 16
+    assert bucket.backoff == rate_limit.MAX_BACKOFF
+
+
+def test_success_recovers_rate_additively():
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.penalize(bucket.updated)
+    assert bucket.rate == 5.0
+    bucket.reward()
+    assert bucket.rate == 6.0
+    assert bucket.backoff == 0.0
+    for _ in range(10):
+        bucket.reward()
+    assert bucket.rate == 10.0
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_observe_penalizes_throttle_statuses(status):
+    limiter = HostRateLimiter({'default': (4, 4)})
+    assert limiter.observe('iec', Response(status)) == rate_limit.INITIAL_BACKOFF
+    assert limiter._bucket('iec').rate == 2.0
+    assert limiter._bucket('ieee').rate == 4.0
+    assert limiter.observe('iec', Response(200)) is None
+    assert limiter._bucket('iec').rate == 2.4
+
+
+def test_observe_honours_retry_after():
+    limiter = HostRateLimiter({'default': (1, 1), 'iec': (5, 5)})
+    assert limiter.observe('iec', Response(429, '30')) == 30.0
+    assert limiter._bucket('iec').configured_rate == 5.0
+    assert limiter.reserve('iec') > 29
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(' 5 ') == 5.0
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('soon') is None
+
+
+def test_interleave_round_robins_hosts_in_first_seen_order():
+    items = ['a1', 'a2', 'a3', 'b1', 'c1', 'b2']
+    assert interleave(items, key=lambda item: item[0]) == ['a1', 'b1', 'c1', 'a2', 'b2', 'a3']
+    assert interleave([], key=lambda item: item) == []
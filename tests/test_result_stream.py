@@ -0,0 +1,99 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import result_stream
+import verification_scheduler
+import verify_standards as vs
+from result_stream import ResultStreamWriter, fresh_records, read_records
+
+
+def std(std_id):
+    return {'id': std_id, 'name': std_id, 'sourceUrl': f'https://example.com/{std_id}', 'version': '1.0'}
+
+
+STANDARDS = [std('a'), std('b'), std('c'), std('d')]
+
+
+def streamed(standard, status='OK', now=None):
+    entry = dict(vs._new_result(standard, 1), status=status)
+    return verification_scheduler.annotate(entry, standard, None, now)
+
+
+@pytest.fixture
+def interrupted_run(tmp_path):
+    """A data directory whose run died while writing the record of 'c'."""
+    with open(tmp_path / 'standards.json', 'w', encoding='utf-8') as f:
+        json.dump(STANDARDS, f)
+    path = result_stream.partial_path(str(tmp_path))
+    with ResultStreamWriter(path) as stream:
+        stream.write(streamed(STANDARDS[0]))
+        stream.write(streamed(STANDARDS[1], 'MISMATCH'))
+    torn = json.dumps(streamed(STANDARDS[2]))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(torn[:len(torn) // 2])
+    return tmp_path
+
+
+def report(base_path):
+    with open(os.path.join(base_path, 'verification_results.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_torn_last_line_is_ignored(interrupted_run):
+    records = read_records(result_stream.partial_path(str(interrupted_run)))
+    assert sorted(records) == ['a', 'b']
+
+
+def test_appending_after_a_torn_line_keeps_the_new_records(interrupted_run):
+    path = result_stream.partial_path(str(interrupted_run))
+    with ResultStreamWriter(path, append=True) as stream:
+        stream.write(streamed(STANDARDS[3]))
+    assert sorted(read_records(path)) == ['a', 'b', 'd']
+    # A clean tail gets no blank line
+    with ResultStreamWriter(path, append=True) as stream:
+        stream.write(streamed(STANDARDS[2]))
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    assert '' not in lines[:-1]
+    assert sorted(read_records(path)) == ['a', 'b', 'c', 'd']
+
+
+def test_stale_or_edited_records_are_not_reused():
+    now = datetime.now()
+    records = {'a': streamed(std('a'), now=now - timedelta(hours=25)), 'b': streamed(std('b'), now=now)}
+    fingerprints = {s: verification_scheduler.fingerprint(std(s)) for s in 'ab'}
+    assert list(fresh_records(records, fingerprints, now)) == ['b']
+    fingerprints['b'] = 'edited'
+    assert fresh_records(records, fingerprints, now) == {}
+
+
+def test_resume_skips_finished_standards(interrupted_run, monkeypatch):
+    checked = []
+
+    def check(standard, idx, pool, ready_timeout):
+        checked.append(standard['id'])
+        return dict(vs._new_result(standard, idx), status='OK'), 'OK'
+
+    monkeypatch.setattr(vs, '_check_with_driver', check)
+    vs.run_verification(str(interrupted_run), use_cache=False, full=True, resume=True)
+
+    assert sorted(checked) == ['c', 'd']
+    results = report(interrupted_run)['results']
+    assert [(r['id'], r['status']) for r in results] == [('a', 'OK'), ('b', 'MISMATCH'), ('c', 'OK'), ('d', 'OK')]
+    assert not os.path.exists(result_stream.partial_path(str(interrupted_run)))
+
+
+def test_finalize_writes_a_complete_report(interrupted_run):
+    finalized = vs.finalize_partial_run(str(interrupted_run))
+
+    written = report(interrupted_run)
+    assert written == json.loads(json.dumps(finalized))
+    assert written['total'] == 4 and written['checked'] == 2
+    assert [(r['id'], r['status']) for r in written['results']] == [
+        ('a', 'OK'), ('b', 'MISMATCH'), ('c', 'SKIPPED'), ('d', 'SKIPPED')]
+    assert written['summary'] == {'ok': 1, 'mismatch': 1, 'error': 0, 'skipped': 2, 'warning': 0}
+    assert not os.path.exists(result_stream.partial_path(str(interrupted_run)))
+    assert vs.finalize_partial_run(str(interrupted_run)) is None
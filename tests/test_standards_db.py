@@ -0,0 +1,182 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from standards_db import DB_NAME, MIGRATIONS, PatchError, StandardsDB, read_standards_file
+from standards_store import RevisionConflict, StandardsStore
+from verify_standards import load_standards
+
+
+def std(std_id, name=None, **fields):
+    return dict({'id': std_id, 'name': name or std_id}, **fields)
+
+
+def touch_later(path):
+    """Moves path's mtime forward, as a hand edit a moment later would."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def edit_json(data_dir, standards):
+    path = os.path.join(data_dir, 'standards.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(standards, f)
+    touch_later(path)
+
+
+def test_read_imports_hand_edit_without_rewriting_files(tmp_path):
+    store = StandardsStore(str(tmp_path))
+    store.replace([std('a'), std('b')])
+    store.close()
+    data_js = (tmp_path / 'data.js').read_bytes()
+
+    edit_json(tmp_path, [std('a', 'edited'), std('b')])
+    standards = load_standards(str(tmp_path))
+
+    assert standards[0]['name'] == 'edited'
+    assert (tmp_path / 'data.js').read_bytes() == data_js
+    with StandardsDB.open_in(str(tmp_path)) as db:
+        assert db.revision == 2
+        assert db.needs_export
+        assert db.changed_files(str(tmp_path)) == []
+
+    # The server brings data.js up to date before serving it
+    store = StandardsStore(str(tmp_path))
+    assert store.refresh_exports() == 2
+    assert read_standards_file(os.path.join(tmp_path, 'data.js')) == (standards, 2)
+    assert not store.db.needs_export
+    store.close()
+
+
+def test_unchanged_files_with_new_mtimes_are_left_alone(tmp_path):
+    # A fresh checkout (or CI cache restore) touches the files without changing them
+    store = StandardsStore(str(tmp_path))
+    store.replace([std('a')])
+    store.close()
+    for name in ('data.js', 'standards.json'):
+        touch_later(os.path.join(tmp_path, name))
+    contents = {name: (tmp_path / name).read_bytes() for name in ('data.js', 'standards.json')}
+
+    load_standards(str(tmp_path))
+    store = StandardsStore(str(tmp_path))
+    assert store.refresh_exports() == 1
+    store.close()
+    assert {name: (tmp_path / name).read_bytes() for name in contents} == contents
+
+
+def test_read_of_a_new_checkout_does_not_write_files(tmp_path):
+    content = json.dumps([std('a')])
+    (tmp_path / 'standards.json').write_text(content, encoding='utf-8')
+    assert [s['id'] for s in load_standards(str(tmp_path))] == ['a']
+    assert (tmp_path / 'standards.json').read_text(encoding='utf-8') == content
+    assert not (tmp_path / 'data.js').exists()
+
+
+def test_patch_after_hand_edit_keeps_the_edit(tmp_path):
+    store = StandardsStore(str(tmp_path))
+    store.replace([std('a'), std('b')])
+    edit_json(tmp_path, [std('a', 'edited'), std('b')])
+    load_standards(str(tmp_path))
+
+    # The browser loads data.js (exported on the way) and patches against its revision
+    store.refresh_exports()
+    _, revision = read_standards_file(os.path.join(tmp_path, 'data.js'))
+    store.apply([{'op': 'upsert', 'standard': std('c')}], revision)
+
+    assert [s['name'] for s in store.standards()] == ['edited', 'b', 'c']
+    store.close()
+
+def ids(store):
+    return [s['id'] for s in store.standards()]
+
+
+def test_patch_against_stale_revision_is_rejected(tmp_path):
+    store = StandardsStore(str(tmp_path))
+    revision = store.replace([std('a')])
+    store.apply([{'op': 'upsert', 'standard': std('b')}], revision)
+    with pytest.raises(RevisionConflict) as conflict:
+        store.apply([{'op': 'delete', 'id': 'a'}], revision)
+    assert conflict.value.revision == revision + 1
+    assert ids(store) == ['a', 'b']
+    store.close()
+
+
+def test_upsert_delete_and_reorder(tmp_path):
+    store = StandardsStore(str(tmp_path))
+    revision = store.replace([std('a'), std('b'), std('c'), std('d')])
+    revision, count = store.apply([
+        {'op': 'upsert', 'standard': std('new'), 'index': 1},
+        {'op': 'upsert', 'standard': std('c', 'renamed')},
+        {'op': 'delete', 'id': 'b'},
+        {'op': 'reorder', 'ids': ['d', 'a']},
+    ], revision)
+    assert count == 4
+    assert ids(store) == ['d', 'new', 'c', 'a']
+    assert store.db.get('c')['name'] == 'renamed'
+    # The exports follow every patch
+    assert read_standards_file(os.path.join(tmp_path, 'data.js')) == (store.standards(), revision)
+    store.close()
+
+
+@pytest.mark.parametrize('ops', [
+    [{'op': 'delete', 'id': 'missing'}],
+    [{'op': 'reorder', 'ids': ['a', 'a']}],
+    [{'op': 'upsert', 'standard': {'name': 'no id'}}],
+    [{'op': 'rename'}],
+])
+def test_invalid_patch_changes_nothing(tmp_path, ops):
+    store = StandardsStore(str(tmp_path))
+    revision = store.replace([std('a'), std('b')])
+    with pytest.raises(PatchError):
+        store.apply([{'op': 'delete', 'id': 'b'}] + ops, revision)
+    assert ids(store) == ['a', 'b']
+    assert store.db.revision == revision
+    store.close()
+
+
+def test_migrates_an_existing_database(tmp_path):
+    path = os.path.join(tmp_path, DB_NAME)
+    conn = sqlite3.connect(path)
+    conn.executescript(MIGRATIONS[0])
+    conn.execute("INSERT INTO runs (timestamp) VALUES ('2025-01-01T00:00:00')")
+    conn.execute("INSERT INTO results VALUES (1, 'a', 'OK', '{\"status\": \"OK\"}')")
+    conn.execute('PRAGMA user_version = 1')
+    conn.commit()
+    conn.close()
+
+    with StandardsDB(path) as db:
+        assert db.query('PRAGMA user_version')[0][0] == len(MIGRATIONS)
+        assert db.query('SELECT standard_id, status, changed, checked_at FROM results') == [('a', 'OK', 0, None)]
+    # Opening a current database again runs nothing
+    with StandardsDB(path) as db:
+        assert db.query('PRAGMA user_version')[0][0] == len(MIGRATIONS)
+
+
+def report(timestamp, *entries):
+    return {'timestamp': timestamp, 'mode': 'incremental', 'total': len(entries),
+            'checked': len(entries), 'summary': {}, 'results': list(entries)}
+
+
+def result(std_id, status='OK', issues=(), **live):
+    return {'id': std_id, 'status': status, 'issues': list(issues), 'live': live}
+
+
+def test_record_run_flags_changed_results(tmp_path):
+    with StandardsDB.open_in(str(tmp_path)) as db:
+        db.record_run(report('2026-01-01T00:00:00', result('a', version='1'), result('b', version='1')))
+        run_id = db.record_run(report('2026-01-02T00:00:00',
+                                      result('a', version='1'),
+                                      result('b', 'MISMATCH', ['Version mismatch'], version='2')))
+        rows = db.query('SELECT standard_id, changed FROM results WHERE run_id = ? ORDER BY standard_id',
+                        (run_id,))
+        assert rows == [('a', 0), ('b', 1)]
+        first = db.query('SELECT changed FROM results WHERE run_id = 1')
+        assert first == [(0,), (0,)]
+
+
+def test_record_run_skips_carried_over_entries(tmp_path):
+    with StandardsDB.open_in(str(tmp_path)) as db:
+        run_id = db.record_run(report('2026-01-01T00:00:00', result('a'), result('b')), checked_ids={'b'})
+        assert db.query('SELECT standard_id FROM results WHERE run_id = ?', (run_id,)) == [('b',)]
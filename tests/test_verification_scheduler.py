@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta
+
+from verification_scheduler import annotate, is_due, next_interval_days, plan
+
+NOW = datetime(2026, 3, 2, 9, 0)
+TODAY = NOW.date()
+
+
+def std(std_id='a', **fields):
+    return dict({'id': std_id, 'name': std_id, 'sourceUrl': f'https://example.com/{std_id}',
+                 'version': '2.0'}, **fields)
+
+
+def check(standard, status, previous=None, now=NOW, issues=()):
+    return annotate({'id': standard['id'], 'status': status, 'issues': list(issues)},
+                    standard, previous, now)
+
+
+def days_until(entry, now=NOW):
+    return (date.fromisoformat(entry['next_check']) - now.date()).days
+
+
+def test_ok_results_back_off_from_seven_days():
+    standard = std()
+    entry, intervals = None, []
+    for run in range(5):
+        now = NOW + timedelta(days=60 * run)
+        entry = check(standard, 'OK', entry, now)
+        intervals.append(days_until(entry, now))
+    assert intervals == [7, 14, 28, 56, 56]
+
+
+def test_due_and_not_due():
+    standard = std()
+    entry = check(standard, 'OK')
+    assert is_due(standard, None, TODAY) == (True, 'never checked')
+    assert is_due(standard, entry, TODAY)[0] is False
+    assert is_due(standard, entry, TODAY + timedelta(days=6))[0] is False
+    assert is_due(standard, entry, TODAY + timedelta(days=7)) == (True, 'interval elapsed')
+    assert is_due(dict(standard, version='3.0'), entry, TODAY) == (True, 'local data changed')
+
+
+def test_plan_carries_over_results_that_are_not_due():
+    checked, fresh = std('a'), std('b')
+    previous = {'a': check(checked, 'OK')}
+    due, carried = plan([checked, fresh], previous, today=TODAY)
+    assert due == [(1, fresh)]
+    assert carried[0]['status'] == 'OK'
+
+
+def test_full_checks_everything():
+    standards = [std('a'), std('b')]
+    previous = {s['id']: check(s, 'OK') for s in standards}
+    due, carried = plan(standards, previous, full=True, today=TODAY)
+    assert due == list(enumerate(standards))
+    assert carried == {}
+
+
+def test_mismatch_is_rechecked_and_restarts_the_backoff():
+    standard = std()
+    entry = check(standard, 'OK')
+    entry = check(standard, 'OK', entry)
+    mismatch = check(standard, 'MISMATCH', entry, issues=['Version mismatch'])
+    assert mismatch['stable_runs'] == 0
+    assert mismatch['change_count'] == 1
+    assert days_until(mismatch) == 0
+    assert is_due(standard, mismatch, TODAY) == (True, 'last status MISMATCH')
+
+    cleared = check(standard, 'OK', mismatch)
+    assert cleared['stable_runs'] == 1
+    assert days_until(cleared) == 7
+
+
+def test_changing_standards_and_stability_year_shorten_the_interval():
+    assert next_interval_days(std(), 'OK', 4, 0, TODAY) == 56
+    assert next_interval_days(std(), 'OK', 4, 1, TODAY) == 28
+    assert next_interval_days(std(expiryDate='2027 (Stability)'), 'OK', 4, 0, TODAY) == 14
+    assert next_interval_days(std(expiryDate='2026 (Stability)'), 'OK', 4, 0, TODAY) == 7
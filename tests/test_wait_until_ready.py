@@ -0,0 +1,33 @@
+import pytest
+
+import verify_standards as vs
+
+
+class Element:
+    def __init__(self, text):
+        self.text = text
+
+
+class Driver:
+    """Stands in for a WebDriver whose page never / immediately shows the element."""
+
+    def __init__(self, text=None):
+        self.elements = [Element(text)] if text else []
+
+    def find_elements(self, by, selector):
+        return self.elements
+
+
+def test_ready_page_returns_at_once():
+    ready, waited = vs.wait_until_ready(Driver('US$ 120.00'), 'accuristech')
+    assert ready
+    assert waited < 1
+
+
+def test_timeout_defaults_to_the_site_cap_and_is_logged(monkeypatch, capsys):
+    monkeypatch.setitem(vs.READY_TIMEOUTS, 'accuristech', 0.3)
+    ready, waited = vs.wait_until_ready(Driver(), 'accuristech')
+    assert not ready
+    assert waited == pytest.approx(0.3, abs=0.2)
+    assert '[READY] accuristech: page not ready after 0.3 s' in capsys.readouterr().out
+
@@ -62,22 +62,24 @@ def verify_file_structure():
 # 2. 後端 API 端點驗證
 # ============================================
 def verify_api_endpoint():
-    """驗證 server.py 中的 API 端點設定"""
+    """驗證 server.py（及共用伺服器核心 dqa_server.py）中的 API 端點設定"""
     print_header("2. 後端 API 端點驗證")
     
     all_passed = True
     
     try:
-        with open('server.py', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = ''
+        for path in ('server.py', 'dqa_server.py'):
+            with open(path, 'r', encoding='utf-8') as f:
+                content += f.read()
         
         # 檢查 /api/run-verify 端點
         has_api = "/api/run-verify" in content
         all_passed &= print_result(has_api, "API 端點 /api/run-verify 已定義")
         
         # 檢查使用 subprocess 執行 Python
-        has_subprocess = "subprocess.run" in content
-        all_passed &= print_result(has_subprocess, "使用 subprocess.run 執行爬蟲")
+        has_subprocess = "subprocess.run" in content or "subprocess.Popen" in content
+        all_passed &= print_result(has_subprocess, "使用 subprocess 執行爬蟲")
         
         # 檢查 JSON 回應
         has_json_response = "application/json" in content
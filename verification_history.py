@@ -0,0 +1,112 @@
+"""
+Verification history queries.
+
+verification_results.json only holds the latest state of every standard.
+Every live check is also appended to the results table of standards.db
+(see StandardsDB.record_run) with its status, extracted fields ('live'),
+HTTP timing ('elapsed'), the scraper and version that ran, and a changed
+flag. These helpers read that log through indexes, so answering "what
+happened to X" or "what changed this month" never means loading old
+reports:
+
+    last_results(db, 'std-123', 5)     newest checks of one standard
+    changes_since(db, '2026-01-01')    checks whose outcome changed
+    run_trend(db, 20)                  per-run summaries, newest first
+
+Command line:
+    python verification_history.py --standard std-123 [--last 5]
+    python verification_history.py --since 2026-01-01
+    python verification_history.py --runs 20
+"""
+import argparse
+import json
+import sys
+
+from standards_db import StandardsDB
+
+DEFAULT_LAST = 10
+
+
+def _check(row):
+    run_id, checked_at, status, scraper, elapsed, changed, doc = row
+    entry = json.loads(doc)
+    return {
+        'run_id': run_id,
+        'standard_id': entry.get('id'),
+        'name': entry.get('name'),
+        'checked_at': checked_at,
+        'status': status,
+        'scraper': scraper,
+        'elapsed': elapsed,
+        'changed': bool(changed),
+        'issues': entry.get('issues', []),
+        'live': entry.get('live', {}),
+    }
+
+
+_CHECK_COLUMNS = 'run_id, checked_at, status, scraper, elapsed, changed, doc'
+
+
+def last_results(db, standard_id, n=DEFAULT_LAST):
+    """The standard's n most recent live checks, newest first."""
+    rows = db.query(f'SELECT {_CHECK_COLUMNS} FROM results WHERE standard_id = ? '
+                    'ORDER BY checked_at DESC, run_id DESC LIMIT ?', (standard_id, n))
+    return [_check(row) for row in rows]
+
+
+def changes_since(db, since):
+    """Checks at or after since (ISO date or timestamp) whose outcome changed, oldest first."""
+    rows = db.query(f'SELECT {_CHECK_COLUMNS} FROM results WHERE changed = 1 AND checked_at >= ? '
+                    'ORDER BY checked_at, run_id', (since,))
+    return [_check(row) for row in rows]
+
+
+def run_trend(db, limit=DEFAULT_LAST):
+    """Summaries of the last limit runs, newest first (status counts plus mean check time)."""
+    rows = db.query(
+        'SELECT runs.id, runs.timestamp, runs.mode, runs.total, runs.checked, runs.summary, '
+        '       AVG(results.elapsed), SUM(results.changed) '
+        'FROM runs LEFT JOIN results ON results.run_id = runs.id '
+        'GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?', (limit,))
+    return [{
+        'run_id': run_id,
+        'timestamp': timestamp,
+        'mode': mode,
+        'total': total,
+        'checked': checked,
+        'summary': json.loads(summary or '{}'),
+        'mean_elapsed': round(mean_elapsed, 2) if mean_elapsed is not None else None,
+        'changes': changes or 0,
+    } for run_id, timestamp, mode, total, checked, summary, mean_elapsed, changes in rows]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Query the verification history in standards.db')
+    parser.add_argument('--base-path', default='.',
+                        help='Directory containing standards.db (default: current directory)')
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument('--standard', metavar='ID', help='Show the last checks of one standard')
+    query.add_argument('--since', metavar='DATE', help='Show every change since DATE (YYYY-MM-DD)')
+    query.add_argument('--runs', type=int, metavar='N', help='Show the last N run summaries')
+    parser.add_argument('--last', type=int, default=DEFAULT_LAST,
+                        help=f'Number of checks shown with --standard (default: {DEFAULT_LAST})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    with StandardsDB.open_in(args.base_path) as db:
+        if args.standard:
+            records = last_results(db, args.standard, args.last)
+        elif args.since:
+            records = changes_since(db, args.since)
+        else:
+            records = run_trend(db, args.runs)
+    json.dump(records, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+if __name__ == '__main__':
+    main()
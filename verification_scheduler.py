@@ -0,0 +1,133 @@
+"""
+Incremental verification scheduling.
+
+Decides which standards are due for a live check, based on the schedule
+fields that run_verification stores on each result in
+verification_results.json:
+
+    checked_at    - ISO timestamp of the last live check
+    next_check    - ISO date the standard is due again
+    stable_runs   - consecutive checks that came back OK (including the last one)
+    change_count  - checks that found a new mismatch (how often it changes)
+    fingerprint   - hash of the local fields that affect verification
+
+A standard is due when it was never checked, its local data was edited since
+the last check, its last check errored/mismatched, or next_check has passed.
+"""
+import hashlib
+import json
+import re
+from datetime import date, datetime, timedelta
+
+BASE_INTERVAL_DAYS = 7
+MAX_INTERVAL_DAYS = 56
+
+# Local fields whose edits invalidate the previous result
+FINGERPRINT_FIELDS = ('sourceUrl', 'version', 'effectiveDate', 'expiryDate', 'cost')
+
+# Statuses that are re-checked on every run until they clear
+RECHECK_STATUSES = {'ERROR', 'WARNING', 'MISMATCH'}
+
+
+def load_previous_results(report_path):
+    """Returns {standard id: result entry} from an existing report ({} if none)."""
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        return {r['id']: r for r in report.get('results', []) if 'id' in r}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def fingerprint(std):
+    """Short hash of the local fields that verification compares against."""
+    raw = '\x1f'.join(str(std.get(field) or '') for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def stability_year(std):
+    """Stability year from expiryDate (e.g. '2027 (Stability)'), or None."""
+    match = re.search(r'(\d{4})', str(std.get('expiryDate') or ''))
+    return int(match.group(1)) if match else None
+
+
+def is_due(std, previous, today=None):
+    """Returns (due, reason) for one standard given its previous result entry."""
+    today = today or date.today()
+    if not previous or 'next_check' not in previous:
+        return True, 'never checked'
+    if previous.get('fingerprint') != fingerprint(std):
+        return True, 'local data changed'
+    if previous.get('status') in RECHECK_STATUSES:
+        return True, f"last status {previous['status']}"
+    try:
+        next_check = date.fromisoformat(previous['next_check'])
+    except (TypeError, ValueError):
+        return True, 'invalid schedule'
+    if next_check <= today:
+        return True, 'interval elapsed'
+    return False, f"next check {previous['next_check']}"
+
+
+def next_interval_days(std, status, stable_runs, change_count, today=None):
+    """
+    Days until the next check. OK results back off exponentially
+    (7, 14, 28, 56 days for stable_runs 1, 2, 3, 4+); standards that change
+    often, or whose stability year is close, are checked more frequently.
+    """
+    today = today or date.today()
+    if status in RECHECK_STATUSES:
+        return 0
+
+    interval = BASE_INTERVAL_DAYS * (2 ** min(max(stable_runs - 1, 0), 3))
+    if change_count:
+        interval = interval // (1 + change_count)
+
+    year = stability_year(std)
+    if year is not None:
+        years_left = year - today.year
+        if years_left <= 0:
+            interval = BASE_INTERVAL_DAYS
+        elif years_left == 1:
+            interval = min(interval, 2 * BASE_INTERVAL_DAYS)
+
+    return max(BASE_INTERVAL_DAYS, min(interval, MAX_INTERVAL_DAYS))
+
+
+def annotate(entry, std, previous, now=None):
+    """Adds the schedule fields to a freshly checked result entry."""
+    now = now or datetime.now()
+    previous = previous or {}
+
+    stable_runs = previous.get('stable_runs', 0) + 1 if entry['status'] == 'OK' else 0
+    change_count = previous.get('change_count', 0)
+    if entry['status'] == 'MISMATCH' and entry['issues'] != previous.get('issues'):
+        change_count += 1
+
+    days = next_interval_days(std, entry['status'], stable_runs, change_count, now.date())
+    entry['checked_at'] = now.isoformat(timespec='seconds')
+    entry['next_check'] = (now.date() + timedelta(days=days)).isoformat()
+    entry['stable_runs'] = stable_runs
+    entry['change_count'] = change_count
+    entry['fingerprint'] = fingerprint(std)
+    return entry
+
+
+def plan(standards, previous_results, full=False, today=None):
+    """
+    Splits standards into those to check now and those whose previous result
+    is carried over. Returns (due, carried): due is a list of (position, std),
+    carried maps position -> previous result entry.
+    """
+    due, carried = [], {}
+    for pos, std in enumerate(standards):
+        previous = previous_results.get(std.get('id'))
+        if full:
+            due.append((pos, std))
+            continue
+        needed, _reason = is_due(std, previous, today)
+        if needed:
+            due.append((pos, std))
+        else:
+            carried[pos] = dict(previous, name=std.get('name'), url=std.get('sourceUrl') or '')
+    return due, carried
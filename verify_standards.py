@@ -1,76 +1,266 @@
 import re
 import json
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-import sys
 import os
 import time
+import argparse
+import functools
+import sqlite3
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
-# ── HTTP Request Helper with Retry ──────────────────────────────────
-DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+from async_fetch import AsyncFetcher, get_session, host_of
+from rate_limit import HostRateLimiter, interleave
+from html_parsing import Selector, parse
+from extraction import Field, PatternSet
+from scrape_cache import HttpCache, ResultCache, CACHE_DIR_NAME, content_hash
+from atomic_io import write_json_atomic
+from standards_db import DB_NAME, StandardsDB
+from standards_store import StandardsStore
+from driver_pool import DriverPool, DEFAULT_MAX_PAGES, DEFAULT_MAX_MEMORY_MB, is_alive
+import driver_resolver
+import profiling
+from profiling import stage
+import result_stream
+import verification_scheduler
 
-def requests_with_retry(url, max_retries=2, timeout=15):
-    """HTTP GET with retry logic for transient failures."""
+# ── HTTP Request Helper with Retry ──────────────────────────────────
+def requests_with_retry(url, max_retries=2, timeout=15, headers=None):
+    """
+    HTTP GET (over the shared keep-alive session) with retry logic for transient
+    failures. Each attempt waits for the host's rate limiter; 429/503 responses
+    back the host off (honouring Retry-After) and are retried.
+    """
+    session = get_session()
+    key = rate_key(url)
     for attempt in range(max_retries + 1):
         try:
-            response = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
-            return response
+            with stage('rate_wait'):
+                _rate_limiter.acquire(key)
+            with stage('http'):
+                response = session.get(url, headers=headers, timeout=timeout)
+            profiling.add('ttfb', response.elapsed.total_seconds())
         except (requests.ConnectionError, requests.Timeout) as e:
             if attempt < max_retries:
                 wait_time = 2 ** attempt  # exponential backoff: 1s, 2s
                 print(f"  [Retry {attempt+1}/{max_retries}] {e.__class__.__name__}, waiting {wait_time}s...")
                 time.sleep(wait_time)
-            else:
-                raise
+                continue
+            raise
+        pause = _rate_limiter.observe(key, response)
+        if pause is not None and attempt < max_retries:
+            print(f"  [Throttled {attempt+1}/{max_retries}] HTTP {response.status_code}, backing off {pause:.0f}s...")
+            continue
+        return response
+
+
+# ── Scrape Caches ─────────────────────────────────────────────────
+# Set by run_verification(); None disables caching (e.g. ad-hoc scraper tests)
+_http_cache = None
+_result_cache = None
+
+# Set by run_verification(): record per-stage 'timings' on each checked result (see profiling)
+_profile_stages = False
+
+# Keys added to scraper data to report cache hits; never stored in a cache
+_CACHE_MARKERS = ('http_cache', 'content_cache')
+
 
+def _without_markers(data):
+    return {k: v for k, v in data.items() if k not in _CACHE_MARKERS}
 
-# Selenium imports
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+
+def set_caches(http_cache=None, result_cache=None):
+    """Installs the HttpCache / ResultCache used by the scrapers (None to disable)."""
+    global _http_cache, _result_cache
+    _http_cache = http_cache
+    _result_cache = result_cache
+
+
+def cached_extract(scraper, body, extract):
+    """
+    Runs extract(body) unless the same normalized body was already extracted
+    by the current version of this scraper.
+    """
+    cache = _result_cache
+    if cache is None:
+        with stage('extract'):
+            return extract(body)
+    version = SCRAPER_VERSIONS[scraper]
+    body_hash = content_hash(body)
+    data = cache.get(scraper, version, body_hash)
+    if data is not None:
+        return dict(data, content_cache='hit')
+    with stage('extract'):
+        data = extract(body)
+    try:
+        cache.put(scraper, version, body_hash, data)
+    except OSError as e:
+        print(f"  [CACHE] Could not store {scraper} result: {e}")
+    return data
+
+
+def _cache_entry(url):
+    """Cached HTTP entry for url (None when uncached or caching is off)."""
+    return _http_cache.get(url) if _http_cache else None
+
+
+def _process_response(url, entry, response, scraper, extract):
+    """
+    Turns a (possibly conditional) response into (data, status_code), updating
+    the HTTP cache. On a 304 the previous extraction is reused without parsing.
+    Returns None if the server answered 304 but no cached body is left, in
+    which case the caller must refetch unconditionally.
+    """
+    cache = _http_cache
+    tag = f"{scraper}@v{SCRAPER_VERSIONS[scraper]}"
+
+    if response.status_code == 304 and entry is not None:
+        data = entry.get('extraction')
+        if data is None or entry.get('scraper') != tag:
+            body = cache.get_body(url)
+            if body is None:
+                return None
+            data = cached_extract(scraper, body, extract)
+            cache.update_extraction(url, tag, _without_markers(data))
+        return dict(data, http_cache='not_modified'), 304
+
+    if response.status_code != 200:
+        return None, response.status_code
+    data = cached_extract(scraper, response.content, extract)
+    if cache:
+        try:
+            cache.store(url, response, tag, _without_markers(data))
+        except OSError as e:
+            print(f"  [CACHE] Could not store {url}: {e}")
+    return data, 200
+
+
+def fetch_and_extract(url, scraper, extract):
+    """
+    Fetches url and runs extract(content) -> data dict, using the HTTP cache.
+    Sends If-None-Match / If-Modified-Since when validators are cached and, on
+    a 304, returns the previous extraction without downloading or parsing.
+    Returns (data, status_code); data is None for non-200/304 responses.
+    """
+    entry = _cache_entry(url)
+    response = requests_with_retry(url, headers=HttpCache.conditional_headers(entry))
+    result = _process_response(url, entry, response, scraper, extract)
+    if result is None:
+        # Validators without a body - refetch unconditionally
+        result = _process_response(url, None, requests_with_retry(url), scraper, extract)
+    return result
+
+
+async def fetch_and_extract_async(url, scraper, extract, fetcher):
+    """Coroutine version of fetch_and_extract using an AsyncFetcher."""
+    entry = _cache_entry(url)
+    response = await fetcher.get(url, headers=HttpCache.conditional_headers(entry))
+    result = await fetcher.run(_process_response, url, entry, response, scraper, extract)
+    if result is None:
+        response = await fetcher.get(url)
+        result = await fetcher.run(_process_response, url, None, response, scraper, extract)
+    return result
+
+
+# Selenium is imported where a driver is started or waited on (driver_resolver
+# finds the chromedriver), so static-only runs, --finalize and the launcher's
+# startup do not load it. Locator strategies are the values of selenium's By
+# constants.
+class By:
+    XPATH = 'xpath'
+    CSS_SELECTOR = 'css selector'
+    TAG_NAME = 'tag name'
 
 
 # ââ Selenium Context Manager ââââââââââââââââââââââââââââââââââââââââââ
+def _create_driver():
+    """Starts a headless Chrome instance configured for scraping."""
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    chrome_options.add_argument('--log-level=3')
+
+    resolution = driver_resolver.resolve()
+    if resolution.path is None:
+        raise RuntimeError(f"No chromedriver available: {resolution.error}")
+    try:
+        return webdriver.Chrome(service=Service(resolution.path), options=chrome_options)
+    except SessionNotCreatedException:
+        if resolution.source == 'DQA_CHROMEDRIVER':
+            raise
+        # Chrome was updated since the driver was cached: resolve a matching one
+        driver_resolver.invalidate()
+        resolution = driver_resolver.resolve(refresh=True)
+        if resolution.path is None:
+            raise
+        return webdriver.Chrome(service=Service(resolution.path), options=chrome_options)
+
+
+def _quit_driver(driver):
+    """Closes a driver, ignoring errors from an already-dead session."""
+    if driver is not None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
 @contextmanager
 def selenium_driver():
     """
     Context manager for Selenium WebDriver.
     Ensures the driver is always properly closed, even on exceptions.
+    Yields None if the driver could not be started.
     """
     driver = None
     try:
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        chrome_options.add_argument('--log-level=3')
-
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        yield driver
+        driver = _create_driver()
     except Exception as e:
         print(f"Selenium driver error: {e}")
-        yield None
+    try:
+        yield driver
     finally:
-        if driver is not None:
-            try:
-                driver.quit()
-            except Exception:
-                pass
+        _quit_driver(driver)
+
+
+def create_driver_pool(size=1, max_pages=DEFAULT_MAX_PAGES, max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+    """Creates a DriverPool of headless Chrome instances (started lazily)."""
+    return DriverPool(_create_driver, _quit_driver, size=size,
+                      max_pages=max_pages, max_memory_mb=max_memory_mb)
 
 
 # ââ Data Loading âââââââââââââââââââââââââââââââââââââââââââââ
 def load_standards(base_path):
     """
-    Loads standards from standards.json (preferred) or falls back to data.js parsing.
+    Loads standards from standards.db (importing data.js / standards.json first
+    if they were edited outside it, and re-exporting both); falls back to
+    reading standards.json or parsing data.js directly if the database cannot
+    be used.
     """
+    store = StandardsStore(base_path)
+    try:
+        standards = store.standards()
+        if standards:
+            print(f"[LOAD] Loaded {len(standards)} standards from {DB_NAME}")
+            return standards
+    except (sqlite3.Error, OSError) as e:
+        print(f"[LOAD] Failed to read {DB_NAME}: {e}")
+    finally:
+        store.close()
+
     json_path = os.path.join(base_path, 'standards.json')
     if os.path.exists(json_path):
         try:
@@ -124,199 +314,340 @@ def _parse_data_js(file_path):
     return standards
 
 
+# ── Page Readiness ────────────────────────────────────────────────
+# Upper bound (seconds) each Selenium site waits for its page to become ready:
+# the fixed sleeps the scrapers used before, so a page whose condition never
+# holds costs no more than it used to
+READY_TIMEOUTS = {
+    'iec': 3,
+    'accuristech': 5,
+    'bsi': 5,
+}
+READY_POLL_INTERVAL = 0.1
+
+_LOWER = "translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+
+def _text_present(by, selector):
+    """Wait condition: an element matching the locator exists and has visible text."""
+    def condition(driver):
+        for element in driver.find_elements(by, selector):
+            try:
+                if element.text.strip():
+                    return element
+            except Exception:
+                continue
+        return False
+    return condition
+
+
+# DOM condition each Selenium site needs before its data can be extracted
+READY_CONDITIONS = {
+    'iec': _text_present(By.XPATH, f"//*[text()[contains({_LOWER}, 'publication date')]]"),
+    'accuristech': _text_present(By.CSS_SELECTOR, '.price, .product-price, [class*="price"]'),
+    'bsi': _text_present(By.CSS_SELECTOR, 'h1'),
+}
+
+
+def wait_until_ready(driver, site, timeout=None):
+    """
+    Blocks until the site's READY_CONDITIONS entry holds or the timeout
+    (default READY_TIMEOUTS[site]) expires. Returns (ready, elapsed_seconds).
+    A timeout is logged but is not an error: the scraper goes on with whatever
+    has loaded, as it did after the old fixed sleep.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = READY_TIMEOUTS[site] if timeout is None else timeout
+    start = time.perf_counter()
+    try:
+        with stage('ready_wait'):
+            WebDriverWait(driver, timeout, poll_frequency=READY_POLL_INTERVAL).until(READY_CONDITIONS[site])
+        ready = True
+    except TimeoutException:
+        ready = False
+        print(f"[READY] {site}: page not ready after {timeout:g} s, extracting what has loaded")
+    return ready, round(time.perf_counter() - start, 2)
+
+
+def _record_wait(data, ready, waited):
+    """Stores the readiness wait in the scraper result."""
+    data['ready_wait'] = waited
+    if not ready:
+        data['ready_timeout'] = True
+    return data
+
+
 # ââ Scrapers âââââââââââââââââââââââââââââââââââââââââââââââââ
-def scrape_iec_page(url, driver):
+# Bump a scraper's version whenever its extraction logic changes; this
+# invalidates that scraper's cached results and no others
+SCRAPER_VERSIONS = {
+    'iec': 1,
+    'ieee': 2,
+    'nema': 2,
+    'bsi': 2,
+    'generic': 2,
+}
+# Scraper used for each host group (recorded on results as 'scraper@vN')
+GROUP_SCRAPERS = {'iec': 'iec', 'ieee': 'ieee', 'accuristech': 'nema', 'bsi': 'bsi', 'generic': 'generic'}
+# Scraper output keys that are bookkeeping rather than extracted fields
+_NON_FIELD_KEYS = _CACHE_MARKERS + ('ready_wait', 'ready_timeout', 'error')
+
+# Nodes the static extractors read, compiled once (see html_parsing)
+TITLE = Selector('//title', 'title')
+H1 = Selector('//h1', 'h1')
+NEMA_TITLE = Selector(
+    "//h1 | //*[contains(concat(' ', normalize-space(@class), ' '), ' product-title ')] | //title",
+    'h1, .product-title, title')
+NEMA_PRICE = Selector("//*[contains(@class, 'price')]", '[class*="price"]')
+
+# Text fields per site, compiled once (see extraction). IEC fields keep the
+# last matching body line, as the original line-by-line scan did.
+IEC_FIELDS = PatternSet([
+    Field('publication_date', r'(\d{4}-\d{2}-\d{2})', 'publication date', fold=True, line=True, keep='last'),
+    Field('stability_date', r'(\d{4})', 'stability date', fold=True, line=True, keep='last'),
+    Field('edition', r'^\s*edition(?!.*amended).*?(\d+\.?\d*)', 'edition', fold=True, line=True, keep='last'),
+    Field('price_chf', r"CHF\s*([\d,\']+\.?\-?)", 'CHF'),
+])
+IEEE_FIELDS = PatternSet([
+    Field('edition', r'edition\s+(\d+\.?\d*)', 'edition', fold=True),
+    Field('published', r'Published:\s*(\d{1,2}\s+\w+\s+\d{4})', 'Published:'),
+])
+BSI_FIELDS = PatternSet([
+    Field('published', r'Published[:\s]*(\d{1,2}\s+\w+\s+\d{4})', 'Published'),
+    Field('price', r'Non-Member\s*(?:Total)?\s*[£$€]\s*([\d,\.]+)', 'Non-Member'),
+    Field('withdrawn', r'Withdrawn', 'Withdrawn'),
+])
+GENERIC_FIELDS = PatternSet([
+    Field('issue', r'issue\s+(\d+)', 'issue', fold=True),
+    Field('edition', r'edition\s+(\d+\.?\d*)', 'edition', fold=True),
+    Field('version', r'version\s+(\d+\.?\d*)', 'version', fold=True),
+    Field('rev', r'rev\.?\s*(\d+)', 'rev', fold=True),
+    Field('year', r':\s*(20\d{2})\b', ':'),
+    Field('price_symbol', r'[\$€£¥]\s*([\d,]+\.?\d*)', ('$', '€', '£', '¥')),
+    Field('price_code', r'([\d,]+\.?\d*)\s*(?:USD|EUR|GBP)', ('USD', 'EUR', 'GBP')),
+])
+# Version fields in priority order, with the label used in the reported version
+GENERIC_VERSION_LABELS = {'issue': 'Issue', 'edition': 'Ed.', 'version': 'Ver.', 'rev': 'Rev.', 'year': ''}
+GENERIC_PRICE_FIELDS = ('price_symbol', 'price_code')
+
+
+def scrape_iec_page(url, driver, ready_timeout=None):
     """Scrapes IEC webstore using Selenium."""
     if not driver:
         return {'error': 'Selenium driver not available'}
     try:
-        driver.get(url)
-        time.sleep(3)
-        page_text = driver.find_element(By.TAG_NAME, "body").text
-        data = {}
-        lines = page_text.split('\n')
-
-        for line in lines:
-            line_lower = line.lower().strip()
-            if 'publication date' in line_lower:
-                match = re.search(r'(\d{4}-\d{2}-\d{2})', line)
-                if match:
-                    data['publication_date'] = match.group(1)
-            if 'stability date' in line_lower:
-                match = re.search(r'(\d{4})', line)
-                if match:
-                    data['stability_date'] = match.group(1)
-            if line_lower.startswith('edition') and 'amended' not in line_lower:
-                match = re.search(r'(\d+\.?\d*)', line)
-                if match:
-                    data['edition'] = match.group(1)
-
-        # Price scraping (3-layer fallback)
-        price_found = None
+        with stage('driver_get'):
+            driver.get(url)
+        ready, waited = wait_until_ready(driver, 'iec', ready_timeout)
+        with stage('page_source'):
+            page_source = driver.page_source
+        data = cached_extract('iec', page_source, lambda body: _extract_iec(driver))
+        return _record_wait(data, ready, waited)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _extract_iec(driver):
+    """Extracts edition/dates/price from the rendered IEC page."""
+    page_text = driver.find_element(By.TAG_NAME, "body").text
+    data = {}
+    fields = IEC_FIELDS.scan(page_text)
+    for name in ('publication_date', 'stability_date', 'edition'):
+        if name in fields:
+            data[name] = fields[name].value
+
+    # Price scraping (3-layer fallback)
+    price_found = None
+    try:
+        price_el = driver.find_element(By.CSS_SELECTOR, ".price-container .price, .product-price, span[itemprop='price']")
+        if price_el:
+            price_found = price_el.text.strip()
+    except Exception:
+        pass
+
+    if not price_found:
         try:
-            price_el = driver.find_element(By.CSS_SELECTOR, ".price-container .price, .product-price, span[itemprop='price']")
+            price_el = driver.find_element(By.XPATH, "//*[contains(text(), 'CHF') and string-length(text()) < 20]")
             if price_el:
                 price_found = price_el.text.strip()
         except Exception:
             pass
 
-        if not price_found:
-            try:
-                price_el = driver.find_element(By.XPATH, "//*[contains(text(), 'CHF') and string-length(text()) < 20]")
-                if price_el:
-                    price_found = price_el.text.strip()
-            except Exception:
-                pass
+    if not price_found and 'price_chf' in fields:
+        price_found = f"CHF {fields['price_chf'].value}"
 
-        if not price_found:
-            price_match = re.search(r"CHF\s*([\d,\']+\.?\-?)", page_text)
-            if price_match:
-                price_found = f"CHF {price_match.group(1)}"
+    if price_found:
+        price_found = re.sub(r'\s+', ' ', price_found)
+        data['price'] = price_found
 
-        if price_found:
-            price_found = re.sub(r'\s+', ' ', price_found)
-            data['price'] = price_found
+    return data
 
-        return data
-    except Exception as e:
-        return {'error': str(e)}
+
+def _extract_ieee(content):
+    """Extracts version/edition/date from an IEEE standard page body."""
+    page = parse(content)
+    data = {'source': 'IEEE', 'accessible': True}
+    page_text = page.text()
+
+    title_text = page.select_text(TITLE)
+    if title_text:
+        match = re.search(r'IEEE\s+\d+[A-Za-z]*-(\d{4})', title_text)
+        if match:
+            data['version'] = match.group(1)
+
+    fields = IEEE_FIELDS.scan(page_text)
+    if 'edition' in fields:
+        data['edition'] = fields['edition'].value
+
+    if 'published' in fields:
+        try:
+            dt = datetime.strptime(fields['published'].value, '%d %B %Y')
+            data['publication_date'] = dt.strftime('%Y-%m-%d')
+        except Exception:
+            pass
+
+    return data
 
 
 def scrape_ieee_page(url):
     """Scrapes IEEE page (static) with version comparison."""
     try:
-        response = requests_with_retry(url)
-        if response.status_code != 200:
-            return {'error': f"HTTP {response.status_code}"}
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data = {'source': 'IEEE', 'accessible': True}
-        page_text = soup.get_text()
-
-        title = soup.select_one('title')
-        if title:
-            title_text = title.get_text()
-            match = re.search(r'IEEE\s+\d+[A-Za-z]*-(\d{4})', title_text)
-            if match:
-                data['version'] = match.group(1)
-
-        edition_match = re.search(r'Edition\s+(\d+\.?\d*)', page_text, re.IGNORECASE)
-        if edition_match:
-            data['edition'] = edition_match.group(1)
-
-        date_match = re.search(r'Published:\s*(\d{1,2}\s+\w+\s+\d{4})', page_text)
-        if date_match:
-            try:
-                dt = datetime.strptime(date_match.group(1), '%d %B %Y')
-                data['publication_date'] = dt.strftime('%Y-%m-%d')
-            except Exception:
-                pass
+        data, status_code = fetch_and_extract(url, 'ieee', _extract_ieee)
+        if data is None:
+            return {'error': f"HTTP {status_code}"}
+        return data
+    except Exception as e:
+        return {'error': str(e)}
+
 
+async def scrape_ieee_page_async(url, fetcher):
+    """Coroutine version of scrape_ieee_page."""
+    try:
+        data, status_code = await fetch_and_extract_async(url, 'ieee', _extract_ieee, fetcher)
+        if data is None:
+            return {'error': f"HTTP {status_code}"}
         return data
     except Exception as e:
         return {'error': str(e)}
 
 
-def scrape_nema_store(url, driver):
+def scrape_nema_store(url, driver, ready_timeout=None):
     """Scrapes NEMA store using Selenium (bypass 403)."""
     if not driver:
         return {'error': 'Selenium driver not available'}
     try:
-        driver.get(url)
-        time.sleep(5)
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        data = {'source': 'NEMA Store', 'accessible': True}
-
-        title = soup.select_one('h1, .product-title, title')
-        if title:
-            match = re.search(r'(20\d{2})', title.get_text())
-            if match:
-                data['version'] = match.group(1)
-
-        price_el = soup.select_one('.price, .product-price, [class*="price"]')
-        if price_el:
-            price_match = re.search(r'[\$\u20ac\u00a3]\s*[\d,]+\.?\d*', price_el.get_text(strip=True))
-            if price_match:
-                data['price'] = price_match.group(0)
-
-        return data
+        with stage('driver_get'):
+            driver.get(url)
+        ready, waited = wait_until_ready(driver, 'accuristech', ready_timeout)
+        with stage('page_source'):
+            page_source = driver.page_source
+        data = cached_extract('nema', page_source, _extract_nema)
+        return _record_wait(data, ready, waited)
     except Exception as e:
         return {'error': str(e)}
 
 
-def scrape_bsi_knowledge(url, driver):
+def _extract_nema(page_source):
+    """Extracts version/price from a rendered NEMA store page."""
+    page = parse(page_source)
+    data = {'source': 'NEMA Store', 'accessible': True}
+
+    title_text = page.select_text(NEMA_TITLE)
+    if title_text:
+        match = re.search(r'(20\d{2})', title_text)
+        if match:
+            data['version'] = match.group(1)
+
+    price_text = page.select_text(NEMA_PRICE, strip=True)
+    if price_text:
+        price_match = re.search(r'[\$\u20ac\u00a3]\s*[\d,]+\.?\d*', price_text)
+        if price_match:
+            data['price'] = price_match.group(0)
+
+    return data
+
+
+def scrape_bsi_knowledge(url, driver, ready_timeout=None):
     """Scrapes BSI Knowledge using Selenium."""
     if not driver:
         return {'error': 'Selenium driver not available'}
     try:
-        driver.get(url)
-        time.sleep(5)
-        page_text = driver.find_element(By.TAG_NAME, "body").text
-        data = {'source': 'BSI Knowledge', 'accessible': True}
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        h1 = soup.select_one('h1')
-        if h1:
-            match = re.search(r':(\d{4})', h1.get_text(strip=True))
-            if match:
-                data['version'] = match.group(1)
-
-        date_match = re.search(r'Published[:\s]*(\d{1,2}\s+\w+\s+\d{4})', page_text)
-        if date_match:
-            try:
-                dt = datetime.strptime(date_match.group(1), '%d %b %Y')
-                data['publication_date'] = dt.strftime('%Y-%m-%d')
-            except Exception:
-                pass
+        with stage('driver_get'):
+            driver.get(url)
+        ready, waited = wait_until_ready(driver, 'bsi', ready_timeout)
+        with stage('page_source'):
+            page_source = driver.page_source
+        data = cached_extract('bsi', page_source, lambda body: _extract_bsi(driver, body))
+        return _record_wait(data, ready, waited)
+    except Exception as e:
+        return {'error': str(e)}
 
-        price_match = re.search(r'Non-Member\s*(?:Total)?\s*[\u00a3$\u20ac]\s*([\d,\.]+)', page_text)
-        if price_match:
-            data['price'] = f"\u00a3{price_match.group(1)}"
 
-        if 'Withdrawn' in page_text:
-            data['status'] = 'Withdrawn'
+def _extract_bsi(driver, page_source):
+    """Extracts version/date/price/status from a rendered BSI Knowledge page."""
+    page_text = driver.find_element(By.TAG_NAME, "body").text
+    data = {'source': 'BSI Knowledge', 'accessible': True}
 
-        return data
-    except Exception as e:
-        return {'error': str(e)}
+    h1_text = parse(page_source).select_text(H1, strip=True)
+    if h1_text:
+        match = re.search(r':(\d{4})', h1_text)
+        if match:
+            data['version'] = match.group(1)
+
+    fields = BSI_FIELDS.scan(page_text)
+    if 'published' in fields:
+        try:
+            dt = datetime.strptime(fields['published'].value, '%d %b %Y')
+            data['publication_date'] = dt.strftime('%Y-%m-%d')
+        except Exception:
+            pass
+
+    if 'price' in fields:
+        data['price'] = f"\u00a3{fields['price'].value}"
+
+    if 'withdrawn' in fields:
+        data['status'] = 'Withdrawn'
+
+    return data
+
+
+def _extract_generic(content):
+    """Auto-detects version/price info in an arbitrary page body."""
+    page_text = parse(content).text()
+    data = {'accessible': True, 'source': 'Smart Generic'}
+
+    name, match = GENERIC_FIELDS.first(page_text, GENERIC_VERSION_LABELS)
+    if match:
+        prefix = GENERIC_VERSION_LABELS[name]
+        data['version'] = f"{prefix} {match.value}".strip() if prefix else match.value
+        data['edition'] = match.value
+
+    _name, match = GENERIC_FIELDS.first(page_text, GENERIC_PRICE_FIELDS)
+    if match:
+        data['price'] = match.text
+
+    return data
 
 
 def scrape_smart_generic(url, standard_name):
     """Smart generic scraper - auto-detect version/price info."""
     try:
-        response = requests_with_retry(url)
-        if response.status_code != 200:
-            return {'error': f"HTTP {response.status_code}", 'accessible': False}
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        page_text = soup.get_text()
-        data = {'accessible': True, 'source': 'Smart Generic'}
-
-        version_patterns = [
-            (r'Issue\s+(\d+)', 'Issue'),
-            (r'Edition\s+(\d+\.?\d*)', 'Ed.'),
-            (r'Version\s+(\d+\.?\d*)', 'Ver.'),
-            (r'Rev\.?\s*(\d+)', 'Rev.'),
-            (r':\s*(20\d{2})\b', ''),
-        ]
-        for pattern, prefix in version_patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                ver = match.group(1)
-                data['version'] = f"{prefix} {ver}".strip() if prefix else ver
-                data['edition'] = ver
-                break
-
-        price_patterns = [
-            r'[\$\u20ac\u00a3\u00a5]\s*([\d,]+\.?\d*)',
-            r'([\d,]+\.?\d*)\s*(?:USD|EUR|GBP)',
-        ]
-        for pattern in price_patterns:
-            match = re.search(pattern, page_text)
-            if match:
-                data['price'] = match.group(0)
-                break
+        data, status_code = fetch_and_extract(url, 'generic', _extract_generic)
+        if data is None:
+            return {'error': f"HTTP {status_code}", 'accessible': False}
+        return data
+    except Exception as e:
+        return {'error': str(e), 'accessible': False}
+
 
+async def scrape_smart_generic_async(url, standard_name, fetcher):
+    """Coroutine version of scrape_smart_generic."""
+    try:
+        data, status_code = await fetch_and_extract_async(url, 'generic', _extract_generic, fetcher)
+        if data is None:
+            return {'error': f"HTTP {status_code}", 'accessible': False}
         return data
     except Exception as e:
         return {'error': str(e), 'accessible': False}
@@ -375,88 +706,450 @@ def verify_standard_logic(std, live_data):
     return issues
 
 
-# ââ Main Verification ââââââââââââââââââââââââââââââââââââââââ
-def run_verification(base_path):
-    """Main entry point for verification."""
+# ── Host Routing ──────────────────────────────────────────────────
+# (group name, URL fragment) - first match wins, anything else is 'generic'
+HOST_GROUPS = [
+    ('iec', 'webstore.iec.ch'),
+    ('ieee', 'ieee.org'),
+    ('accuristech', 'store.accuristech.com'),
+    ('bsi', 'bsigroup.com'),
+]
+
+# Groups whose scrapers need a Selenium driver
+SELENIUM_GROUPS = {'iec', 'accuristech', 'bsi'}
+
+# Upper bound of parallel workers per host group in concurrent mode,
+# so that no single standards body receives more than this many requests at once
+HOST_WORKER_LIMITS = {
+    'iec': 2,
+    'ieee': 4,
+    'accuristech': 2,
+    'bsi': 2,
+    'generic': 4,
+}
+
+
+# Requests per second and burst size allowed per standards body.
+# Generic sites get the 'default' limit per host name.
+HOST_RATE_LIMITS = {
+    'iec': (0.5, 2),
+    'ieee': (1.0, 3),
+    'accuristech': (0.5, 2),
+    'bsi': (0.5, 2),
+    'default': (1.0, 2),
+}
+
+# Shared by all scrapers and kept across runs, so a long-lived launcher
+# remembers which hosts asked us to back off
+_rate_limiter = HostRateLimiter(HOST_RATE_LIMITS)
+
+
+def host_group(url):
+    """Returns the host group name used to route a URL to its scraper and worker pool."""
+    for group, fragment in HOST_GROUPS:
+        if fragment in url:
+            return group
+    return 'generic'
+
+
+def rate_key(url):
+    """Rate-limiter key: the host group for known sites, the host name otherwise."""
+    group = host_group(url)
+    return group if group != 'generic' else host_of(url)
+
+
+def scrape_standard(url, name, driver=None, ready_timeout=None):
+    """Routes a URL to the appropriate scraper and returns its live data."""
+    group = host_group(url)
+    if group in SELENIUM_GROUPS and driver:
+        with stage('rate_wait'):
+            _rate_limiter.acquire(group)
+    if group == 'iec':
+        return scrape_iec_page(url, driver, ready_timeout)
+    if group == 'ieee':
+        return scrape_ieee_page(url)
+    if group == 'accuristech':
+        return scrape_nema_store(url, driver, ready_timeout)
+    if group == 'bsi':
+        return scrape_bsi_knowledge(url, driver, ready_timeout)
+    return scrape_smart_generic(url, name)
+
+
+async def scrape_standard_async(url, name, fetcher):
+    """Routes a static (non-Selenium) URL to its coroutine scraper."""
+    if host_group(url) == 'ieee':
+        return await scrape_ieee_page_async(url, fetcher)
+    return await scrape_smart_generic_async(url, name, fetcher)
+
+
+def _needs_check(std):
+    """True if the standard has a source URL that can be scraped."""
+    url = std.get('sourceUrl')
+    return bool(url) and '/search/' not in url
+
+
+def _new_result(std, idx):
+    """Result entry skeleton for a standard."""
+    url = std.get('sourceUrl')
+    return {
+        'id': std.get('id', f'std-{idx}'),
+        'name': std.get('name'),
+        'url': url or '',
+        'status': 'OK',
+        'issues': []
+    }
+
+
+def check_standard(std, idx, driver=None, ready_timeout=None):
+    """
+    Scrapes and verifies a single standard.
+    Returns (result_entry, console_message).
+    """
+    result_entry = _new_result(std, idx)
+    if not _needs_check(std):
+        result_entry['status'] = 'SKIPPED'
+        return result_entry, 'Skipped (no URL)'
+
+    with profiling.standard(_profile_stages) as times:
+        started = time.perf_counter()
+        live_data = scrape_standard(std['sourceUrl'], std.get('name'), driver, ready_timeout)
+        result_entry['elapsed'] = round(time.perf_counter() - started, 2)
+        message = _apply_live_data(result_entry, std, live_data)
+    if times is not None:
+        result_entry['timings'] = times.as_ms()
+    return result_entry, message
+
+
+async def check_standard_async(std, idx, fetcher):
+    """Coroutine version of check_standard for static (non-Selenium) standards."""
+    result_entry = _new_result(std, idx)
+    with profiling.standard(_profile_stages) as times:
+        started = time.perf_counter()
+        live_data = await scrape_standard_async(std['sourceUrl'], std.get('name'), fetcher)
+        result_entry['elapsed'] = round(time.perf_counter() - started, 2)
+        message = _apply_live_data(result_entry, std, live_data)
+    if times is not None:
+        result_entry['timings'] = times.as_ms()
+    return result_entry, message
+
+
+def _apply_live_data(result_entry, std, live_data):
+    """
+    Fills status/issues from scraped live data, and records the scraper and
+    extracted fields for the verification history; returns the console message.
+    """
+    scraper = GROUP_SCRAPERS[host_group(std['sourceUrl'])]
+    result_entry['scraper'] = f"{scraper}@v{SCRAPER_VERSIONS[scraper]}"
+    live = {k: v for k, v in live_data.items() if k not in _NON_FIELD_KEYS}
+    if live:
+        result_entry['live'] = live
+    if 'ready_wait' in live_data:
+        result_entry['ready_wait'] = live_data['ready_wait']
+
+    # Handle errors
+    if 'error' in live_data:
+        result_entry['status'] = 'ERROR'
+        result_entry['issues'] = [live_data['error']]
+        return f"ERROR: {live_data['error']}"
+    if live_data.get('accessible') is False:
+        result_entry['status'] = 'WARNING'
+        return "WARNING (not accessible)"
+
+    # Unified verification for all scrapers
+    with stage('compare'):
+        issues = verify_standard_logic(std, live_data)
+    if issues:
+        result_entry['status'] = 'MISMATCH'
+        result_entry['issues'] = issues
+        return f"MISMATCH: {'; '.join(issues)}"
+    return "OK"
+
+
+def _check_with_driver(std, idx, pool, ready_timeout=None):
+    """
+    Checks a standard, leasing a Selenium driver from the pool when its scraper needs one.
+    If the driver session died during the scrape, it is replaced and the check retried once.
+    """
+    if host_group(std['sourceUrl']) not in SELENIUM_GROUPS:
+        return check_standard(std, idx)
+
+    for attempt in range(2):
+        with pool.lease() as driver:
+            result_entry, message = check_standard(std, idx, driver, ready_timeout)
+            if driver is None or result_entry['status'] != 'ERROR' or is_alive(driver):
+                return result_entry, message
+            pool.mark_broken(driver)
+        print(f"  [POOL] Driver session lost on {std.get('name')}, retrying with a fresh driver")
+    return result_entry, message
+
+
+def _selenium_slots(standards, workers):
+    """Number of drivers needed so every Selenium worker thread can hold one at once."""
+    if workers <= 1:
+        return 1
+    counts = {}
+    for std in standards:
+        if _needs_check(std):
+            group = host_group(std['sourceUrl'])
+            if group in SELENIUM_GROUPS:
+                counts[group] = counts.get(group, 0) + 1
+    slots = sum(min(workers, HOST_WORKER_LIMITS.get(g, 1), n) for g, n in counts.items())
+    return max(1, min(workers, slots))
+
+
+def _run_sequential(standards, pool, ready_timeout=None, on_result=None):
+    """
+    Checks standards one by one, reusing one pooled Selenium driver.
+    Standards are visited round-robin across hosts so that per-host rate
+    limits rarely make the run wait.
+    on_result(idx, result_entry, message) is called as each check finishes.
+    """
+    json_results = [None] * len(standards)
+    total = len(standards)
+
+    items = interleave(enumerate(standards, start=1),
+                       key=lambda item: rate_key(item[1]['sourceUrl']) if _needs_check(item[1]) else '')
+    for idx, std in items:
+        name = std.get('name')
+        if not _needs_check(std):
+            result_entry, message = check_standard(std, idx)
+            json_results[idx - 1] = result_entry
+            print(f"[{idx}/{total}] {name} - {message}")
+        else:
+            print(f"[{idx}/{total}] Checking {name}...", end=" ", flush=True)
+            result_entry, message = _check_with_driver(std, idx, pool, ready_timeout)
+            json_results[idx - 1] = result_entry
+            print(message)
+        if on_result:
+            on_result(idx, result_entry, message)
+
+    return json_results
+
+
+def _run_static_async(items, workers, report):
+    """
+    Runs the static (requests-based) checks as coroutines over the shared
+    keep-alive session, with at most `workers` requests in flight overall.
+    """
+    per_host = min(workers, max(HOST_WORKER_LIMITS[g] for g in HOST_WORKER_LIMITS
+                                if g not in SELENIUM_GROUPS))
+    fetcher = AsyncFetcher(concurrency=workers, per_host=per_host,
+                           limiter=_rate_limiter, limiter_key=rate_key)
+
+    async def one(idx, std):
+        result_entry, message = await check_standard_async(std, idx, fetcher)
+        report(idx, std, result_entry, message)
+
+    async def main():
+        await asyncio.gather(*(one(idx, std) for idx, std in items))
+
+    try:
+        asyncio.run(main())
+    finally:
+        fetcher.close()
+
+
+def _run_concurrent(standards, workers, pool, ready_timeout=None, on_result=None):
+    """
+    Checks standards in parallel. Static pages (IEEE, generic) run as asyncio
+    coroutines over pooled keep-alive connections on one thread, while each
+    Selenium host group gets its own thread pool (capped by HOST_WORKER_LIMITS)
+    leasing drivers from the shared pool. Each side keeps at most `workers`
+    checks in flight. Results keep the input order; on_result(idx, result_entry,
+    message) is called (serialized) as each check finishes.
+    """
+    total = len(standards)
+    json_results = [None] * total
+    print_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(workers)
+
+    def report(idx, std, result_entry, message):
+        json_results[idx - 1] = result_entry
+        with print_lock:
+            print(f"[{idx}/{total}] {std.get('name')} - {message}")
+            if on_result:
+                on_result(idx, result_entry, message)
+
+    def task(idx, std):
+        with slots:
+            result_entry, message = _check_with_driver(std, idx, pool, ready_timeout)
+        report(idx, std, result_entry, message)
+
+    groups = {}
+    for idx, std in enumerate(standards, start=1):
+        if not _needs_check(std):
+            report(idx, std, *check_standard(std, idx))
+            continue
+        groups.setdefault(host_group(std['sourceUrl']), []).append((idx, std))
+
+    static_items = interleave([item for group, items in groups.items() if group not in SELENIUM_GROUPS
+                               for item in items],
+                              key=lambda item: rate_key(item[1]['sourceUrl']))
+    executors = []
+    futures = []
+    try:
+        if static_items:
+            print(f"[POOL] static (async): {len(static_items)} standards, {workers} concurrent requests")
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='verify-async')
+            executors.append(executor)
+            futures.append(executor.submit(_run_static_async, static_items, workers, report))
+        for group, items in groups.items():
+            if group not in SELENIUM_GROUPS:
+                continue
+            pool_size = min(workers, HOST_WORKER_LIMITS.get(group, 1), len(items))
+            print(f"[POOL] {group}: {len(items)} standards, {pool_size} workers")
+            executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f'verify-{group}')
+            executors.append(executor)
+            futures.extend(executor.submit(task, idx, std) for idx, std in items)
+        for future in futures:
+            future.result()
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+    return json_results
+
+
+# ── Main Verification ─────────────────────────────────────────────
+# Prefix of the progress lines printed with --progress
+PROGRESS_PREFIX = '[PROGRESS] '
+
+def run_verification(base_path, workers=1, driver_pool=None, ready_timeout=None, use_cache=True,
+                     full=False, on_event=None, resume=False, profile=False):
+    """
+    Main entry point for verification.
+    workers=1 keeps the original sequential behaviour; workers>1 enables
+    the concurrent per-host worker pools.
+    driver_pool: optional long-lived DriverPool (e.g. kept warm by the launcher);
+    if omitted, a pool is created for this run and closed afterwards.
+    ready_timeout: upper bound in seconds for Selenium page readiness (default READY_TIMEOUTS per site).
+    use_cache: keep HTTP validators/bodies and content-addressed scraper results
+    under <base_path>/.cache so unchanged pages skip download and/or parsing.
+    full: check every standard; by default only standards that are due according
+    to verification_scheduler are checked and the rest keep their previous result.
+    on_event(event, data): optional progress callback. Receives one 'plan' event
+    (counts) before checking starts and one 'result' event per checked standard
+    as soon as it finishes (status, issues, elapsed, catalogue index).
+    resume: reuse the fresh records of an interrupted run (see result_stream)
+    instead of checking those standards again.
+    profile: time each check in stages (see profiling) and add the run's
+    'profile' block to the report.
+    """
+    global _profile_stages
     print("--- DQA Standard Verification Agent (Optimized) ---")
 
     standards = load_standards(base_path)
     print(f"Loaded {len(standards)} standards\n")
 
-    json_results = []
     total = len(standards)
+    workers = max(1, int(workers or 1))
+    if use_cache:
+        cache_dir = os.path.join(base_path, CACHE_DIR_NAME)
+        result_cache = ResultCache(os.path.join(cache_dir, 'results'))
+        result_cache.prune(SCRAPER_VERSIONS)
+        set_caches(HttpCache(os.path.join(cache_dir, 'http')), result_cache)
+    else:
+        set_caches(None, None)
 
-    with selenium_driver() as driver:
-        if driver is None:
-            print("[WARN] Selenium driver failed to initialize.")
-
-        for idx, std in enumerate(standards, start=1):
-            url = std.get('sourceUrl')
-            name = std.get('name')
-            std_id = std.get('id', f'std-{idx}')
-
-            result_entry = {
-                'id': std_id,
-                'name': name,
-                'url': url or '',
-                'status': 'OK',
-                'issues': []
-            }
-
-            if not url or '/search/' in url:
-                result_entry['status'] = 'SKIPPED'
-                json_results.append(result_entry)
-                print(f"[{idx}/{total}] {name} - Skipped (no URL)")
-                continue
+    report_path = os.path.join(base_path, 'verification_results.json')
+    previous_results = verification_scheduler.load_previous_results(report_path)
+    due, carried = verification_scheduler.plan(standards, previous_results, full=full)
+
+    # Results already streamed by an interrupted run
+    stream_path = result_stream.partial_path(base_path)
+    fresh = {}
+    if resume:
+        fingerprints = {std.get('id'): verification_scheduler.fingerprint(std) for std in standards}
+        fresh = result_stream.fresh_records(result_stream.read_records(stream_path), fingerprints)
+        due = [(pos, std) for pos, std in due if std.get('id') not in fresh]
+        print(f"[RESUME] Reusing {len(fresh)} results from the interrupted run\n")
+    due_standards = [std for _, std in due]
+    if not full:
+        print(f"[SCHEDULE] {len(due)} of {total} standards due, "
+              f"{len(carried)} carried over from previous runs\n")
+
+    if on_event:
+        on_event('plan', {'total': total, 'due': len(due), 'carried': len(carried),
+                          'mode': 'full' if full else 'incremental'})
+    progress_lock = threading.Lock()
+    finished = [0]
+
+    def on_result(idx, result_entry, message):
+        # Annotate and stream each result as it finishes, so a crash loses nothing
+        pos, std = due[idx - 1]
+        verification_scheduler.annotate(result_entry, std, previous_results.get(std.get('id')))
+        stream.write(result_entry)
+        with progress_lock:
+            finished[0] += 1
+            done = finished[0]
+        if on_event:
+            on_event('result', dict(result_entry, index=pos + 1, done=done, due=len(due),
+                                    message=message))
+
+    needed_drivers = _selenium_slots(due_standards, workers)
+    owns_pool = driver_pool is None
+    if owns_pool:
+        driver_pool = create_driver_pool(size=needed_drivers)
+    elif driver_pool.size < needed_drivers:
+        driver_pool.resize(needed_drivers)
+    if any(_needs_check(std) and host_group(std['sourceUrl']) in SELENIUM_GROUPS for std in due_standards):
+        # Start the browsers together before the workers fan out, not one per first lease
+        driver_pool.warm(needed_drivers)
+
+    _profile_stages = profile
+    started = time.perf_counter()
+    try:
+        with result_stream.ResultStreamWriter(stream_path, append=resume) as stream:
+            if workers > 1:
+                print(f"[MODE] Concurrent verification with {workers} workers\n")
+                checked = _run_concurrent(due_standards, workers, driver_pool, ready_timeout, on_result)
+            else:
+                checked = _run_sequential(due_standards, driver_pool, ready_timeout, on_result)
+    finally:
+        _profile_stages = False
+        if owns_pool:
+            driver_pool.close()
+    run_profile = profiling.build_profile(checked, time.perf_counter() - started) if profile else None
+    if not driver_pool.available:
+        print("[WARN] Selenium driver failed to initialize.")
+
+    for (_pos, std), entry in zip(due, checked):
+        fresh[std.get('id')] = entry
+    finalize_report(base_path, standards, previous_results, fresh, full, run_profile)
+    if run_profile:
+        print(profiling.format_profile(run_profile))
+    return {'status': 'success', 'message': 'Verification complete'}
 
-            print(f"[{idx}/{total}] Checking {name}...", end=" ", flush=True)
 
-            live_data = {}
-            scraper_error = False
-
-            # Route to appropriate scraper
-            if 'webstore.iec.ch' in url:
-                live_data = scrape_iec_page(url, driver)
-            elif 'ieee.org' in url:
-                live_data = scrape_ieee_page(url)
-            elif 'store.accuristech.com' in url:
-                live_data = scrape_nema_store(url, driver)
-            elif 'bsigroup.com' in url:
-                live_data = scrape_bsi_knowledge(url, driver)
-            else:
-                live_data = scrape_smart_generic(url, name)
-
-            # Handle errors
-            if 'error' in live_data:
-                result_entry['status'] = 'ERROR'
-                result_entry['issues'] = [live_data['error']]
-                print(f"ERROR: {live_data['error']}")
-                scraper_error = True
-            elif live_data.get('accessible') is False:
-                result_entry['status'] = 'WARNING'
-                print("WARNING (not accessible)")
-                scraper_error = True
-
-            # Unified verification for all scrapers
-            if not scraper_error:
-                issues = verify_standard_logic(std, live_data)
-                if issues:
-                    result_entry['status'] = 'MISMATCH'
-                    result_entry['issues'] = issues
-                    print(f"MISMATCH: {'; '.join(issues)}")
-                else:
-                    print("OK")
-
-            json_results.append(result_entry)
-
-        # Rate limiting: brief delay between requests
-        if idx < total:
-            time.sleep(0.5)
+def finalize_report(base_path, standards, previous_results, fresh, full=False, profile=None):
+    """
+    Writes verification_results.json: fresh results ({id: annotated entry}
+    checked in this run) merged with previous ones, in catalogue order, plus
+    the summary (and the run profile, if one was taken). Records the run in
+    standards.db and removes the partial stream.
+    """
+    now = datetime.now()
+    json_results = []
+    for pos, std in enumerate(standards):
+        std_id = std.get('id')
+        if std_id in fresh:
+            json_results.append(fresh[std_id])
+        elif std_id in previous_results:
+            json_results.append(dict(previous_results[std_id], name=std.get('name'),
+                                     url=std.get('sourceUrl') or ''))
+        else:
+            # Only reachable when finalizing an interrupted run
+            entry = _new_result(std, pos + 1)
+            entry['status'] = 'SKIPPED'
+            entry['issues'] = ['Not checked (interrupted run)']
+            json_results.append(entry)
 
     # Save report with summary
     json_report = {
-        'timestamp': datetime.now().isoformat(),
-        'total': total,
+        'timestamp': now.isoformat(),
+        'mode': 'full' if full else 'incremental',
+        'total': len(standards),
+        'checked': len(fresh),
         'summary': {
             'ok': sum(1 for r in json_results if r['status'] == 'OK'),
             'mismatch': sum(1 for r in json_results if r['status'] == 'MISMATCH'),
@@ -464,19 +1157,86 @@ def run_verification(base_path):
             'skipped': sum(1 for r in json_results if r['status'] == 'SKIPPED'),
             'warning': sum(1 for r in json_results if r['status'] == 'WARNING'),
         },
-        'results': json_results
     }
+    if profile:
+        json_report['profile'] = profile
+    json_report['results'] = json_results
 
     report_path = os.path.join(base_path, 'verification_results.json')
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(json_report, f, indent=2, ensure_ascii=False)
+    write_json_atomic(report_path, json_report)
+    try:
+        with StandardsDB.open_in(base_path) as db:
+            db.record_run(json_report, checked_ids=set(fresh))
+    except sqlite3.Error as e:
+        print(f"[DB] Failed to record run in {DB_NAME}: {e}")
+    try:
+        os.remove(result_stream.partial_path(base_path))
+    except OSError:
+        pass
 
     s = json_report['summary']
     print(f"\n--- Verification Complete ---")
     print(f"OK: {s['ok']} | MISMATCH: {s['mismatch']} | ERROR: {s['error']} | SKIPPED: {s['skipped']}")
+    return json_report
 
-    return {'status': 'success', 'message': 'Verification complete'}
+
+def finalize_partial_run(base_path):
+    """Builds verification_results.json from the streamed results of an interrupted run."""
+    stream_path = result_stream.partial_path(base_path)
+    if not os.path.exists(stream_path):
+        print(f"[FINALIZE] No interrupted run to finalize ({result_stream.PARTIAL_NAME} not found)")
+        return None
+    standards = load_standards(base_path)
+    known = {std.get('id') for std in standards}
+    fresh = {std_id: r for std_id, r in result_stream.read_records(stream_path).items() if std_id in known}
+    previous_results = verification_scheduler.load_previous_results(
+        os.path.join(base_path, 'verification_results.json'))
+    print(f"[FINALIZE] Merging {len(fresh)} streamed results from the interrupted run")
+    return finalize_report(base_path, standards, previous_results, fresh)
+
+
+def parse_args(argv=None):
+    """Command-line options for running verification as a script."""
+    parser = argparse.ArgumentParser(description='DQA Standard Verification Agent')
+    parser.add_argument('--base-path', default='.',
+                        help='Directory containing standards.json / data.js (default: current directory)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of concurrent verification workers (default: 1 = sequential)')
+    parser.add_argument('--full', action='store_true',
+                        help='Check every standard instead of only those due for re-verification')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the on-disk HTTP and result caches (always download and parse every page)')
+    parser.add_argument('--ready-timeout', type=float, default=None,
+                        help='Max seconds to wait for a Selenium page to become ready '
+                             '(default: per site, ' + ', '.join(f'{site} {seconds:g} s' for site, seconds in READY_TIMEOUTS.items()) + ')')
+    parser.add_argument('--resume', action='store_true',
+                        help=f'Skip standards with a fresh result from an interrupted run ({result_stream.PARTIAL_NAME})')
+    parser.add_argument('--finalize', action='store_true',
+                        help='Only build verification_results.json from an interrupted run\'s streamed results')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time every check in stages and add a run profile to verification_results.json')
+    parser.add_argument('--cprofile', metavar='FILE',
+                        help='Dump a cProfile of the run to FILE (main thread only; use with --workers 1)')
+    parser.add_argument('--progress', action='store_true',
+                        help=f'Also print each progress event as a "{PROGRESS_PREFIX}{{json}}" line (used by server.py)')
+    return parser.parse_args(argv)
+
+
+def print_progress_event(event, data):
+    """on_event callback that writes machine-readable progress lines to stdout."""
+    print(PROGRESS_PREFIX + json.dumps({'event': event, 'data': data}, ensure_ascii=False), flush=True)
 
 
 if __name__ == "__main__":
-    run_verification(".")
+    args = parse_args()
+    if args.finalize:
+        finalize_partial_run(args.base_path)
+    else:
+        run = functools.partial(run_verification, args.base_path, workers=args.workers,
+                                ready_timeout=args.ready_timeout, use_cache=not args.no_cache,
+                                full=args.full, resume=args.resume, profile=args.profile,
+                                on_event=print_progress_event if args.progress else None)
+        if args.cprofile:
+            profiling.run_cprofile(args.cprofile, run)
+        else:
+            run()